@@ -0,0 +1,99 @@
+"""Synthetic data sets shaped like real tracker data"""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+from time_tracker.models.issue import Issue, IssueList
+from time_tracker.models.time_entry import TimeEntry, TimeEntryLog
+
+PROJECTS = ("PRODSUP", "CORE", "WEB", "OPS", "DATA", "MOBILE")
+WORDS = (
+    "fix",
+    "review",
+    "deploy",
+    "investigate",
+    "refactor",
+    "meeting",
+    "customer",
+    "report",
+    "pipeline",
+    "migration",
+    "timeout",
+    "login",
+    "billing",
+    "search",
+)
+COMMENTS = (None, None, None, "", "pairing", "code review", "follow up with QA")
+
+
+def make_issue(index: int, rng: random.Random, created: datetime) -> Issue:
+    project = PROJECTS[index % len(PROJECTS)]
+    description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 8)))
+    return Issue(f"{project}-{index + 1:05}", description.capitalize(), created)
+
+
+def make_issues(count: int, seed: int = 0) -> list[Issue]:
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    return [
+        make_issue(index, rng, start + timedelta(minutes=rng.randint(0, 60 * 24 * 365)))
+        for index in range(count)
+    ]
+
+
+def make_issue_list(count: int, filepath: Path, seed: int = 0) -> IssueList:
+    return IssueList(filepath, make_issues(count, seed))
+
+
+def iter_time_entries(
+    count: int,
+    issues: list[Issue],
+    start: Optional[datetime] = None,
+    interval: timedelta = timedelta(hours=1),
+    seed: int = 0,
+) -> Iterator[TimeEntry]:
+    """Yields entries for consecutive working slots of 08:00-17:00 on weekdays
+
+    Issues are picked with a skew towards a small working set, as in real usage.
+    """
+    rng = random.Random(seed)
+    current = start or datetime(2022, 1, 3, 8)
+    working_set = max(1, len(issues) // 20)
+    for _ in range(count):
+        while current.weekday() > 4 or not 8 <= current.hour < 17:
+            current = datetime.combine(
+                current.date() + timedelta(days=1), datetime.min.time()
+            ).replace(hour=8)
+        if rng.random() < 0.8:
+            issue = issues[rng.randrange(working_set)]
+        else:
+            issue = rng.choice(issues)
+        yield TimeEntry(issue, current, current + interval, rng.choice(COMMENTS))
+        current += interval
+
+
+def make_time_entries(
+    count: int, issues: list[Issue], seed: int = 0
+) -> list[TimeEntry]:
+    return list(iter_time_entries(count, issues, seed=seed))
+
+
+def make_time_entry_log(count: int, issues: list[Issue], seed: int = 0) -> TimeEntryLog:
+    entries = make_time_entries(count, issues, seed)
+    return TimeEntryLog(entries[0].from_time if entries else datetime.now(), entries)
+
+
+def make_time_entry_logs(
+    count: int, issues: list[Issue], seed: int = 0
+) -> list[TimeEntryLog]:
+    """Groups generated entries into one log per day, as stored by TimeEntryFileService"""
+    logs: list[TimeEntryLog] = []
+    for entry in iter_time_entries(count, issues, seed=seed):
+        if not logs or logs[-1].date.date() != entry.from_time.date():
+            logs.append(
+                TimeEntryLog(datetime.combine(entry.from_time, datetime.min.time()))
+            )
+        logs[-1].entries.append(entry)
+    return logs
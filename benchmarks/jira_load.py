@@ -0,0 +1,138 @@
+"""Drives JiraService against the local Jira emulator at several concurrency levels
+
+Usage:
+    python -m benchmarks.jira_load [--entries 500] [--concurrency 1,4,16] [--latency 0.02]
+        [--error-rate 0.0] [--throttle-rate 0.0] [--output FILE]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from dataclasses_json import DataClassJsonMixin
+
+from benchmarks.generators import make_issues, make_time_entries
+from benchmarks.run import BenchmarkLoggingProvider
+from time_tracker.integrations.services.jira import JiraService
+from time_tracker.integrations.stubs.jira import JiraEmulator, JiraEmulatorConfig
+from time_tracker.models.settings import Settings
+from time_tracker.providers.settings import SettingsProvider
+
+
+@dataclass(slots=True)
+class LoadResult(DataClassJsonMixin):
+    concurrency: int
+    entries: int
+    seconds: float
+    entries_per_second: float
+    succeeded: int
+    failed: int
+    requests: int
+    retried: int
+    p50_seconds: float
+    p95_seconds: float
+
+
+def run_level(
+    emulator: JiraEmulator, work_dir: Path, concurrency: int, entries: list
+) -> LoadResult:
+    settings_provider = SettingsProvider(work_dir / f"settings-{concurrency}.json")
+    settings_provider.save_settings(
+        Settings(
+            base_url=emulator.base_url,
+            enable_jira=True,
+            jira_concurrency=concurrency,
+            jira_requests_per_second=0,
+            jira_backoff_seconds=0.05,
+        )
+    )
+    service = JiraService(BenchmarkLoggingProvider(), settings_provider)
+    service.auth_provider.set_auth("load", "load")
+    latencies: list[float] = []
+    log_work = service.log_work
+
+    def timed_log_work(entry):
+        started = perf_counter()
+        try:
+            return log_work(entry)
+        finally:
+            latencies.append(perf_counter() - started)
+
+    service.log_work = timed_log_work
+    with emulator.lock:
+        emulator.requests.clear()
+    started = perf_counter()
+    responses = service.log_work_batch(entries)
+    seconds = perf_counter() - started
+    with emulator.lock:
+        requests = sum(emulator.requests.values())
+        retried = sum(
+            count for (_, status), count in emulator.requests.items() if status >= 429
+        )
+    latencies.sort()
+    succeeded = sum(1 for response in responses if response.success)
+    return LoadResult(
+        concurrency,
+        len(entries),
+        seconds,
+        len(entries) / seconds,
+        succeeded,
+        len(entries) - succeeded,
+        requests,
+        retried,
+        statistics.median(latencies),
+        latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog="python -m benchmarks.jira_load")
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 2, 4, 8, 16],
+    )
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    issues = make_issues(50)
+    config = JiraEmulatorConfig(
+        latency_seconds=args.latency,
+        latency_jitter_seconds=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=0,
+        seed=0,
+    )
+    results = []
+    with JiraEmulator(config) as emulator, tempfile.TemporaryDirectory() as tmp:
+        for concurrency in args.concurrency:
+            # fresh entries per level so earlier worklogs don't short-circuit the posts
+            entries = make_time_entries(args.entries, issues, seed=concurrency)
+            result = run_level(emulator, Path(tmp), concurrency, entries)
+            results.append(result)
+            print(
+                f"concurrency {result.concurrency:>3}  {result.entries_per_second:9.1f} entries/s  "
+                + f"p50 {result.p50_seconds * 1000:7.1f}ms  p95 {result.p95_seconds * 1000:7.1f}ms  "
+                + f"failed {result.failed}  retried {result.retried}/{result.requests} requests"
+            )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps([result.to_dict() for result in results], indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,447 @@
+"""Runs the benchmark suite and writes machine readable results
+
+    python -m benchmarks.run [--profile quick|default|full] [--output FILE] [--compare FILE]
+
+Results are written as json keyed by benchmark name and size, so two runs (e.g. from two
+commits) can be compared with --compare.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from logging import Logger
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, Optional
+
+from benchmarks.generators import (
+    iter_time_entries,
+    make_issue_list,
+    make_issues,
+    make_time_entries,
+    make_time_entry_log,
+    make_time_entry_logs,
+)
+from time_tracker.integrations.services.jira import JiraService
+from time_tracker.integrations.stubs.jira import JiraEmulator
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.importing import ImportMapping
+from time_tracker.models.issue import IssueList
+from time_tracker.models.logging import LogLevel
+from time_tracker.models.settings import Settings
+from time_tracker.models.time_entry import TimeEntryLog, time_entry_log_name
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.importing import TimeEntryImportService
+from time_tracker.services.issue import IssueService
+from time_tracker.services.time_entry import TimeEntryFileService
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+PROFILES: dict[str, dict[str, tuple[int, ...]]] = {
+    "quick": {"entries": (10, 1_000), "issues": (10, 1_000), "jira": (10,)},
+    "default": {
+        "entries": (10, 1_000, 100_000),
+        "issues": (10, 1_000, 10_000),
+        "jira": (10, 100),
+    },
+    "full": {
+        "entries": (10, 1_000, 100_000, 1_000_000),
+        "issues": (10, 1_000, 10_000, 100_000),
+        "jira": (10, 100, 1_000),
+    },
+}
+
+
+class BenchmarkLoggingProvider(ILoggingProvider):
+    log_level = LogLevel.WARNING
+
+    def update_level(self, log_Level: LogLevel) -> None:
+        self.log_level = log_Level
+
+    def get_logger(self, name: str) -> Logger:
+        log = logging.getLogger(name)
+        log.setLevel(self.log_level)
+        return log
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    size: int
+    repeat: int
+    best: float
+    median: float
+    per_item: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+def measure(
+    name: str,
+    size: int,
+    func: Callable[[Any], Any],
+    setup: Callable[[], Any] = lambda: None,
+    repeat: int = 5,
+    items: Optional[int] = None,
+) -> BenchmarkResult:
+    """Times func(setup()) repeat times, excluding the setup
+
+    Args:
+        name (str): The benchmark name
+        size (int): The size of the data set
+        func (Callable[[Any], Any]): The code under test, given the result of setup
+        setup (Callable[[], Any], optional): Builds fresh input for each repetition.
+        repeat (int, optional): Number of repetitions. Defaults to 5.
+        items (Optional[int], optional): Number of operations per repetition, used for per_item.
+            Defaults to size.
+
+    Returns:
+        BenchmarkResult: The timings in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        argument = setup()
+        started = perf_counter()
+        func(argument)
+        timings.append(perf_counter() - started)
+    best = min(timings)
+    return BenchmarkResult(
+        name,
+        size,
+        repeat,
+        best,
+        statistics.median(timings),
+        best / max(items if items is not None else size, 1),
+    )
+
+
+def _repeat_for(size: int) -> int:
+    return 5 if size <= 10_000 else 3 if size <= 100_000 else 1
+
+
+def bench_serialization(sizes: dict, issues_pool: list) -> Iterable[BenchmarkResult]:
+    for size in sizes["entries"]:
+        entry_log = make_time_entry_log(size, issues_pool)
+        text = entry_log.to_json()
+        repeat = _repeat_for(size)
+        yield measure(
+            "serialize.time_entry_log.to_json",
+            size,
+            lambda _: entry_log.to_json(),
+            repeat=repeat,
+        )
+        yield measure(
+            "serialize.time_entry_log.from_json",
+            size,
+            lambda _: TimeEntryLog.from_json(text),
+            repeat=repeat,
+        )
+    for size in sizes["issues"]:
+        issue_list = make_issue_list(size, Path("issues.json"))
+        text = issue_list.to_json()
+        repeat = _repeat_for(size)
+        yield measure(
+            "serialize.issue_list.to_json",
+            size,
+            lambda _: issue_list.to_json(),
+            repeat=repeat,
+        )
+        yield measure(
+            "serialize.issue_list.from_json",
+            size,
+            lambda _: IssueList.from_json(text),
+            repeat=repeat,
+        )
+
+
+def bench_issue_service(sizes: dict, work_dir: Path) -> Iterable[BenchmarkResult]:
+    service = IssueService(BenchmarkLoggingProvider(), prompt=False)
+    for size in sizes["issues"]:
+        path = work_dir / f"issues-{size}.json"
+        issue_list = make_issue_list(size, path)
+        repeat = _repeat_for(size)
+
+        def dirty_list() -> IssueList:
+            # an unchanged list isn't written, so every repetition saves a change
+            issue_list.touch(issue_list.issues[0])
+            return issue_list
+
+        yield measure(
+            "issue_service.save_list",
+            size,
+            service.save_list,
+            setup=dirty_list,
+            repeat=repeat,
+        )
+        yield measure(
+            "issue_service.load_list",
+            size,
+            lambda _: service.load_list(path),
+            repeat=repeat,
+        )
+
+
+def bench_issue_list(sizes: dict) -> Iterable[BenchmarkResult]:
+    lookups = 100
+    for size in sizes["issues"]:
+        issues = make_issues(size)
+        probes = issues[:: max(1, size // lookups)][:lookups]
+        repeat = _repeat_for(size)
+
+        def append_all(issue_list: IssueList):
+            for issue in issues:
+                issue_list.append(issue)
+
+        def remove_probes(issue_list: IssueList):
+            for issue in probes:
+                issue_list.remove(issue)
+
+        yield measure(
+            "issue_list.append",
+            size,
+            append_all,
+            setup=lambda: IssueList(Path("issues.json")),
+            repeat=repeat,
+        )
+        full_list = IssueList(Path("issues.json"), list(issues))
+        yield measure(
+            "issue_list.index",
+            size,
+            lambda _: [full_list.index(issue) for issue in probes],
+            repeat=repeat,
+            items=len(probes),
+        )
+        yield measure(
+            "issue_list.count",
+            size,
+            lambda _: [full_list.count(issue) for issue in probes],
+            repeat=repeat,
+            items=len(probes),
+        )
+        yield measure(
+            "issue_list.remove",
+            size,
+            remove_probes,
+            setup=lambda: full_list.copy(),
+            repeat=repeat,
+            items=len(probes),
+        )
+        yield measure(
+            "issue_list.sort",
+            size,
+            lambda issue_list: issue_list.sort(),
+            setup=lambda: IssueList(Path("issues.json"), list(reversed(issues))),
+            repeat=repeat,
+        )
+
+
+def bench_file_sink(
+    sizes: dict, issues_pool: list, work_dir: Path
+) -> Iterable[BenchmarkResult]:
+    appends = 10
+    day = date(2030, 1, 1)
+    for size in sizes["entries"]:
+        sink_dir = work_dir / f"sink-{size}"
+        sink_dir.mkdir()
+        service = TimeEntryFileService(BenchmarkLoggingProvider(), Settings(), sink_dir)
+        existing = make_time_entry_log(size, issues_pool).to_json()
+        new_entries = make_time_entries(appends, issues_pool, seed=1)
+        start = datetime.combine(day, datetime.min.time()).replace(hour=8)
+        for offset, entry in enumerate(new_entries):
+            entry.from_time = start + timedelta(hours=offset)
+            entry.to_time = entry.from_time + timedelta(hours=1)
+
+        def reset():
+            (sink_dir / time_entry_log_name(day)).write_text(existing)
+
+        def append_all(_):
+            for entry in new_entries:
+                service.log_work(entry)
+
+        yield measure(
+            "file_sink.log_work",
+            size,
+            append_all,
+            setup=reset,
+            repeat=_repeat_for(size),
+            items=appends,
+        )
+
+        logs_dir = work_dir / f"logs-{size}"
+        logs_dir.mkdir()
+        logs = make_time_entry_logs(size, issues_pool)
+        for entry_log in logs:
+            (logs_dir / time_entry_log_name(entry_log.date.date())).write_text(
+                entry_log.to_json()
+            )
+        reader = TimeEntryFileService(BenchmarkLoggingProvider(), Settings(), logs_dir)
+        yield measure(
+            "file_sink.iter_entries",
+            size,
+            lambda _: sum(1 for _ in reader.iter_entries(datetime.min, datetime.max)),
+            repeat=_repeat_for(size),
+        )
+
+
+def bench_import(
+    sizes: dict, issues_pool: list, work_dir: Path
+) -> Iterable[BenchmarkResult]:
+    for size in sizes["entries"]:
+        export = work_dir / f"import-{size}.csv"
+        with open(export, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["issue", "description", "start", "end", "comment"])
+            for entry in iter_time_entries(size, issues_pool):
+                writer.writerow(
+                    [
+                        entry.issue.issue_number,
+                        entry.issue.description,
+                        entry.from_time.isoformat(sep=" "),
+                        entry.to_time.isoformat(sep=" "),
+                        entry.comment or "",
+                    ]
+                )
+        import_dir = work_dir / f"import-{size}"
+
+        def reset():
+            shutil.rmtree(import_dir, ignore_errors=True)
+            import_dir.mkdir()
+            return TimeEntryImportService(
+                BenchmarkLoggingProvider(),
+                IssueService(BenchmarkLoggingProvider(), prompt=False),
+                import_dir,
+            )
+
+        yield measure(
+            "import.csv",
+            size,
+            lambda service: service.import_file(export, ImportMapping()),
+            setup=reset,
+            repeat=_repeat_for(size),
+        )
+
+
+def bench_jira(
+    sizes: dict, issues_pool: list, work_dir: Path
+) -> Iterable[BenchmarkResult]:
+    with JiraEmulator() as server:
+        settings_provider = SettingsProvider(work_dir / "settings.json")
+        settings_provider.save_settings(
+            # unthrottled, the client's rate limit would dominate the timings
+            Settings(
+                base_url=server.base_url, enable_jira=True, jira_requests_per_second=0
+            )
+        )
+        service = JiraService(BenchmarkLoggingProvider(), settings_provider)
+        service.auth_provider.set_auth("benchmark", "benchmark")
+        for size in sizes["jira"]:
+            entries = make_time_entries(size, issues_pool)
+
+            def log_all(_):
+                for entry in entries:
+                    service.log_work(entry)
+
+            # forget posted worklogs so the duplicate guard doesn't skip the repeats
+            yield measure(
+                "jira.log_work", size, log_all, service.worklog_ids.clear, repeat=3
+            )
+            yield measure(
+                "jira.log_work_batch",
+                size,
+                lambda _: service.log_work_batch(entries),
+                service.worklog_ids.clear,
+                repeat=3,
+            )
+
+
+def run(profile: str) -> list[BenchmarkResult]:
+    sizes = PROFILES[profile]
+    issues_pool = make_issues(500)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="time-tracker-bench-") as temp_dir:
+        work_dir = Path(temp_dir)
+        suites = (
+            bench_serialization(sizes, issues_pool),
+            bench_issue_service(sizes, work_dir),
+            bench_issue_list(sizes),
+            bench_file_sink(sizes, issues_pool, work_dir),
+            bench_import(sizes, issues_pool, work_dir),
+            bench_jira(sizes, issues_pool, work_dir),
+        )
+        for suite in suites:
+            for result in suite:
+                print(
+                    f"{result.key:50} best {result.best:10.6f}s  "
+                    + f"median {result.median:10.6f}s  per item {result.per_item:.3e}s",
+                    file=sys.stderr,
+                )
+                results.append(result)
+    return results
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Prints the ratio of each benchmark's best time to the baseline's"""
+    previous = {item["key"]: item for item in baseline["results"]}
+    for item in results["results"]:
+        before = previous.get(item["key"])
+        if before is None or not before["best"]:
+            continue
+        ratio = item["best"] / before["best"]
+        flag = "  REGRESSION" if ratio > 1.1 else ""
+        print(f"{item['key']:50} {ratio:6.2f}x{flag}")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    results = {
+        "meta": {
+            "commit": commit,
+            "profile": args.profile,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [
+            {"key": result.key, **asdict(result)} for result in run(args.profile)
+        ],
+    }
+    output = args.output or RESULTS_DIR / f"{commit or 'unknown'}-{args.profile}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Uploads entries from many simulated clients to a local team server at once
+
+Usage:
+    python -m benchmarks.team_load [--clients 200] [--entries 500] [--batch-size 100] [--output FILE]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import threading
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+import requests
+from dataclasses_json import DataClassJsonMixin
+
+from benchmarks.generators import make_issues, make_time_entries
+from benchmarks.run import BenchmarkLoggingProvider
+from time_tracker.models.settings import Settings
+from time_tracker.models.team import TEAM_REPORT_PATH
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.team import TeamTimeEntryService
+from time_tracker.services.team_server import TeamServer
+from time_tracker.services.team_store import TeamStore
+
+
+@dataclass(slots=True)
+class TeamLoadResult(DataClassJsonMixin):
+    clients: int
+    entries: int
+    seconds: float
+    entries_per_second: float
+    failed_batches: int
+    p50_batch_seconds: float
+    p95_batch_seconds: float
+    stored: int
+    report_seconds: float
+
+
+def run_client(
+    server: TeamServer,
+    work_dir: Path,
+    client: int,
+    entries: list,
+    batch_size: int,
+    start: threading.Barrier,
+    latencies: list[float],
+    failures: list[int],
+) -> None:
+    settings_provider = SettingsProvider(work_dir / f"settings-{client}.json")
+    settings_provider.save_settings(
+        Settings(
+            enable_team=True,
+            team_url=server.base_url,
+            team_user=f"user{client:03}",
+            team_batch_size=batch_size,
+            team_timeout_seconds=60,
+        )
+    )
+    service = TeamTimeEntryService(BenchmarkLoggingProvider(), settings_provider)
+    start.wait()
+    for offset in range(0, len(entries), batch_size):
+        started = perf_counter()
+        response = service.upload(entries[offset : offset + batch_size])
+        latencies.append(perf_counter() - started)
+        if not response.success:
+            failures.append(client)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(prog="python -m benchmarks.team_load")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=500, help="Entries per client")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    issues = make_issues(200)
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        store = TeamStore(work_dir / "team.sqlite3")
+        server = TeamServer(BenchmarkLoggingProvider(), store)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        start = threading.Barrier(args.clients + 1)
+        latencies: list[float] = []
+        failures: list[int] = []
+        clients = [
+            threading.Thread(
+                target=run_client,
+                args=(
+                    server,
+                    work_dir,
+                    client,
+                    make_time_entries(args.entries, issues, seed=client),
+                    args.batch_size,
+                    start,
+                    latencies,
+                    failures,
+                ),
+            )
+            for client in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        start.wait()
+        started = perf_counter()
+        for client in clients:
+            client.join()
+        seconds = perf_counter() - started
+
+        report_started = perf_counter()
+        requests.get(
+            server.base_url + TEAM_REPORT_PATH,
+            params={"group": "issue", "start": "2000-01-01", "end": "2100-01-01"},
+        ).raise_for_status()
+        report_seconds = perf_counter() - report_started
+        stored = store.count()
+        server.shutdown()
+        server.server_close()
+        store.close()
+
+    latencies.sort()
+    total = args.clients * args.entries
+    result = TeamLoadResult(
+        args.clients,
+        total,
+        seconds,
+        total / seconds,
+        len(failures),
+        statistics.median(latencies),
+        latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        stored,
+        report_seconds,
+    )
+    print(
+        f"{result.clients} clients  {result.entries_per_second:9.1f} entries/s  "
+        + f"batch p50 {result.p50_batch_seconds * 1000:7.1f}ms  "
+        + f"p95 {result.p95_batch_seconds * 1000:7.1f}ms  failed {result.failed_batches}  "
+        + f"stored {result.stored}  report {result.report_seconds * 1000:.1f}ms"
+    )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,50 @@
+"""Arguments and setup shared by the Jira commands"""
+
+import os
+from argparse import ArgumentParser, Namespace
+from datetime import date, datetime, time, timedelta
+from getpass import getpass
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.integrations.services.jira import JiraService
+from time_tracker.models.settings import SETTINGS_FILE, WORKING_DIR
+
+PASSWORD_ENVIRONMENT_VARIABLE = "JIRA_PASSWORD"
+
+
+def add_range_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--start", type=date.fromisoformat, required=True, help="First day, YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        required=True,
+        help="Last day (inclusive), YYYY-MM-DD",
+    )
+    parser.add_argument("--issue", help="Only include entries for this issue")
+    parser.add_argument("--user", help="Jira user name, prompted for if omitted")
+    parser.add_argument("--settings", type=Path, default=SETTINGS_FILE)
+    parser.add_argument(
+        "--working-dir",
+        type=Path,
+        default=WORKING_DIR,
+        help="Directory holding the TimeEntryLog files",
+    )
+
+
+def date_range(args: Namespace) -> tuple[datetime, datetime]:
+    """The start of the first day and the end of the last day given on the command line"""
+    return datetime.combine(args.start, time()), datetime.combine(
+        args.end + timedelta(days=1), time()
+    )
+
+
+def authenticate(jira: JiraService, user: Optional[str]) -> None:
+    """Sets the Jira credentials, reading the password from JIRA_PASSWORD or a prompt"""
+    user = user or input("Jira user name: ")
+    password = os.environ.get(PASSWORD_ENVIRONMENT_VARIABLE) or getpass(
+        "Jira password: "
+    )
+    jira.auth_provider.set_auth(user, password)
@@ -0,0 +1,107 @@
+"""Imports time entries from a csv or json export into the time entry logs
+
+Usage:
+    python -m time_tracker.commands.import_entries FILE [--preset toggl] [--column issue=Key]
+        [--format csv|json|jsonl] [--workers N] [--add-issues] [--dry-run]
+
+Columns are mapped with a preset (default, tracker, toggl or clockify) and individual
+--column PART=NAME overrides, where PART is one of the fields of ImportMapping. Entries already
+in the logs are skipped, so an import can be run again after fixing rejected rows.
+"""
+
+import sys
+from argparse import ArgumentParser
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.models.importing import (
+    IMPORT_PRESETS,
+    ImportFormat,
+    ImportProgress,
+    ImportStage,
+)
+from time_tracker.models.settings import SETTINGS_FILE, WORKING_DIR
+from time_tracker.providers.logging import LoggingProvider
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.importing import TimeEntryImportService
+from time_tracker.services.issue import IssueService
+
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.commands.import_entries",
+        description="Import time entries exported from a spreadsheet or another tracker",
+    )
+    parser.add_argument("file", type=Path)
+    parser.add_argument(
+        "--format",
+        type=ImportFormat,
+        choices=list(ImportFormat),
+        help="Defaults to the format matching the file's extension",
+    )
+    parser.add_argument("--preset", choices=sorted(IMPORT_PRESETS), default="default")
+    parser.add_argument(
+        "--column",
+        action="append",
+        default=[],
+        metavar="PART=NAME",
+        help="Map a part of the entry to a column, e.g. issue=Key or time_format=%%d.%%m.%%Y",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes, defaults to the cpu count"
+    )
+    parser.add_argument(
+        "--add-issues",
+        action="store_true",
+        help="Add issues that aren't in the active issue list to it",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only count the entries")
+    parser.add_argument("--working-dir", type=Path, default=WORKING_DIR)
+    parser.add_argument("--settings", type=Path, default=SETTINGS_FILE)
+    return parser
+
+
+def print_progress(progress: ImportProgress) -> None:
+    if progress.stage == ImportStage.PARSING:
+        message = f"Parsed {progress.done} rows"
+    else:
+        message = f"Wrote {progress.done} of {progress.total} days"
+    print(f"\r{message:40}", end="", file=sys.stderr, flush=True)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    mapping = IMPORT_PRESETS[args.preset]
+    parts = {part.name for part in fields(mapping)}
+    for column in args.column:
+        part, _, name = column.partition("=")
+        if part not in parts:
+            parser.error(f"Unknown part {part!r}, expected one of {sorted(parts)}")
+        mapping = replace(mapping, **{part: name or None})
+
+    log_provider = LoggingProvider(SettingsProvider(args.settings).get_settings())
+    service = TimeEntryImportService(
+        log_provider,
+        IssueService(log_provider, prompt=False),
+        args.working_dir,
+        args.workers,
+    )
+    result = service.import_file(
+        args.file,
+        mapping,
+        args.format,
+        args.add_issues,
+        args.dry_run,
+        print_progress,
+    )
+    print(file=sys.stderr)
+    print(("Would import " if args.dry_run else "") + str(result))
+    for error in result.errors:
+        print(f"  {error}")
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Checks the recorded time entry logs against the worklogs in Jira
+
+Usage:
+    python -m time_tracker.commands.reconcile --start 2022-01-03 --end 2022-01-28 [--repair]
+
+Reports entries missing from Jira, duplicate worklogs, worklogs whose duration differs from the
+entry and worklogs with no local entry. With --repair the first three are fixed in Jira.
+"""
+
+import json
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.commands.common import (
+    add_range_arguments,
+    authenticate,
+    date_range,
+)
+from time_tracker.integrations.models.jira import ReconcileKind
+from time_tracker.integrations.services.jira import JiraService
+from time_tracker.integrations.services.jira_reconcile import JiraReconcileService
+from time_tracker.providers.logging import LoggingProvider
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.time_entry import TimeEntryFileService
+
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.commands.reconcile",
+        description="Compare recorded time entries with the worklogs in Jira",
+    )
+    add_range_arguments(parser)
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Post missing entries, correct mismatched worklogs and delete duplicates",
+    )
+    parser.add_argument("--output", type=Path, help="Also write the report as json")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    settings_provider = SettingsProvider(args.settings)
+    settings = settings_provider.get_settings()
+    if not settings.base_url:
+        print("No Jira base_url is configured", file=sys.stderr)
+        return 2
+    log_provider = LoggingProvider(settings)
+    jira = JiraService(log_provider, settings_provider)
+    authenticate(jira, args.user)
+
+    reconcile_service = JiraReconcileService(
+        log_provider,
+        TimeEntryFileService(log_provider, settings, args.working_dir),
+        jira,
+    )
+    start, end = date_range(args)
+    report = reconcile_service.reconcile(start, end, args.issue, args.repair)
+    for finding in report.findings:
+        print(finding)
+    for error in report.errors:
+        print(f"error      {error}", file=sys.stderr)
+    counts = ", ".join(f"{report.count(kind)} {kind}" for kind in ReconcileKind)
+    print(f"{report.matched} matched, {counts}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report.to_dict(encode_json=True), indent=2))
+    unresolved = [
+        finding
+        for finding in report.findings
+        if finding.kind != ReconcileKind.UNTRACKED and not finding.repaired
+    ]
+    return 1 if unresolved or report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Replays recorded time entry logs to Jira
+
+Usage:
+    python -m time_tracker.commands.replay --start 2022-01-03 --end 2022-01-28 --user me
+
+Entries already delivered are kept in a ledger file, so an interrupted replay can simply be run
+again with the same arguments.
+"""
+
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.commands.common import (
+    add_range_arguments,
+    authenticate,
+    date_range,
+)
+from time_tracker.integrations.services.jira import JiraService
+from time_tracker.models.replay import REPLAY_LEDGER_FILE
+from time_tracker.providers.logging import LoggingProvider
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.replay import CheckpointLedger, ReplayService
+from time_tracker.services.time_entry import TimeEntryFileService
+
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.commands.replay",
+        description="Submit recorded time entries to Jira, skipping ones already submitted",
+    )
+    add_range_arguments(parser)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Requests in flight at once, defaults to the jira_concurrency setting",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Maximum entries per second, on top of the jira_requests_per_second setting",
+    )
+    parser.add_argument(
+        "--ledger",
+        type=Path,
+        default=REPLAY_LEDGER_FILE,
+        help="Checkpoint file of entries already submitted",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the entries that would be submitted",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    settings_provider = SettingsProvider(args.settings)
+    settings = settings_provider.get_settings()
+    if not settings.base_url:
+        print("No Jira base_url is configured", file=sys.stderr)
+        return 2
+    log_provider = LoggingProvider(settings)
+    jira = JiraService(log_provider, settings_provider)
+    if not args.dry_run:
+        authenticate(jira, args.user)
+
+    replay_service = ReplayService(
+        log_provider,
+        TimeEntryFileService(log_provider, settings, args.working_dir),
+        jira,
+        CheckpointLedger(args.ledger),
+        concurrency=args.concurrency or settings.jira_concurrency,
+        rate_per_second=args.rate,
+    )
+    start, end = date_range(args)
+    result = replay_service.replay(start, end, args.issue, args.dry_run)
+    verb = "Would submit" if args.dry_run else "Submitted"
+    print(
+        f"{verb} {result.submitted}, skipped {result.skipped} already submitted, "
+        + f"{result.failed} failed"
+    )
+    for failure in result.failures:
+        print(f"  {failure}")
+    if result.aborted:
+        print("Stopped early, Jira rejected the credentials", file=sys.stderr)
+    return 1 if result.failed or result.aborted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Syncs the issue lists and time entry logs with another working directory
+
+Usage:
+    python -m time_tracker.commands.sync PEER_DIR [--working-dir DIR] [--dry-run]
+
+PEER_DIR is a folder shared between machines, or another machine's working directory mounted
+locally. Run it on each machine against the same folder; only files that changed since the last
+sync are read, and only records that differ are written.
+"""
+
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.models.settings import SETTINGS_FILE, WORKING_DIR
+from time_tracker.models.sync import SYNC_STATE_DIR
+from time_tracker.providers.logging import LoggingProvider
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.sync import WorkingDirSyncService
+
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.commands.sync",
+        description="Exchange changed issues and time entries with another working directory",
+    )
+    parser.add_argument("peer_dir", type=Path)
+    parser.add_argument("--working-dir", type=Path, default=WORKING_DIR)
+    parser.add_argument("--state-dir", type=Path, default=SYNC_STATE_DIR)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report what would change"
+    )
+    parser.add_argument("--settings", type=Path, default=SETTINGS_FILE)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    log_provider = LoggingProvider(SettingsProvider(args.settings).get_settings())
+    service = WorkingDirSyncService(
+        log_provider, args.peer_dir, args.working_dir, args.state_dir
+    )
+    result = service.sync(args.dry_run)
+    print(result)
+    for error in result.errors:
+        print(f"error: {error}", file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Runs the team server that collects everyone's time entries
+
+Usage:
+    python -m time_tracker.commands.team_server [--host 0.0.0.0] [--port 8765] [--database FILE]
+
+Clients upload to it when enable_team and team_url are set. The token, if any, is read from
+TEAM_TOKEN or --token and must match each client's team_token setting.
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.models.settings import SETTINGS_FILE
+from time_tracker.models.team import TEAM_DATABASE_FILE
+from time_tracker.providers.logging import LoggingProvider
+from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.team_server import TeamServer
+from time_tracker.services.team_store import TeamStore
+
+TOKEN_ENVIRONMENT_VARIABLE = "TEAM_TOKEN"
+
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.commands.team_server",
+        description="Collect time entries from a team and serve reports",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", type=Path, default=TEAM_DATABASE_FILE)
+    parser.add_argument(
+        "--token",
+        help=f"Bearer token clients must send, or set {TOKEN_ENVIRONMENT_VARIABLE}",
+    )
+    parser.add_argument("--settings", type=Path, default=SETTINGS_FILE)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    log_provider = LoggingProvider(SettingsProvider(args.settings).get_settings())
+    store = TeamStore(args.database)
+    server = TeamServer(
+        log_provider,
+        store,
+        args.host,
+        args.port,
+        args.token or os.environ.get(TOKEN_ENVIRONMENT_VARIABLE),
+    )
+    print(f"Team server listening on {server.base_url}, storing to {args.database}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
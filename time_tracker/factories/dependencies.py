@@ -3,8 +3,13 @@ from time_tracker.factories.time_entry import TimeEntryServiceFactory
 from time_tracker.factories.views import ViewFactory
 from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.interfaces.views import IViewFactory
+from time_tracker.providers.calendar import WorkCalendarProvider
+from time_tracker.providers.event_loop import EventLoopProvider
 from time_tracker.providers.logging import LoggingProvider
+from time_tracker.providers.metrics import METRICS
 from time_tracker.providers.settings import SettingsProvider
+from time_tracker.services.issue_metadata import IssueMetadataCache
+from time_tracker.services.retention import IssueRetentionService
 
 
 class DependencyFactory:
@@ -13,8 +18,56 @@ class DependencyFactory:
         settings_provider = SettingsProvider()
         settings = settings_provider.get_settings()
         log_provider = LoggingProvider(settings)
+        settings_provider.subscribe(
+            lambda new_settings: log_provider.update_level(new_settings.log_level)
+        )
+        METRICS.configure(settings)
+        settings_provider.subscribe(METRICS.configure)
         issue_service_factory = IssueServiceFactory(log_provider)
-        time_entry_service_factory = TimeEntryServiceFactory(log_provider)
-        return ViewFactory(
-            log_provider, issue_service_factory, time_entry_service_factory
+        time_entry_service_factory = TimeEntryServiceFactory(
+            log_provider, settings_provider
+        )
+        IssueRetentionService(
+            log_provider,
+            issue_service_factory.make_issue_service(prompt=False),
+            settings_provider,
+        ).start()
+        issue_sync_service = None
+        issue_metadata = None
+        if settings.enable_jira:
+            # imported here so requests is only loaded when Jira is enabled
+            from time_tracker.integrations.services.jira_issue_metadata import (
+                JiraIssueMetadataService,
+            )
+            from time_tracker.integrations.services.jira_issue_sync import (
+                JiraIssueSyncService,
+            )
+
+            jira_service = time_entry_service_factory.make_time_entry_jira_service()
+            issue_metadata = IssueMetadataCache(
+                log_provider, capacity=settings.jira_metadata_cache_size
+            )
+            issue_sync_service = JiraIssueSyncService(
+                log_provider,
+                jira_service,
+                issue_service_factory.make_issue_service(prompt=False),
+                metadata_cache=issue_metadata,
+            )
+            if settings.jira_metadata_refresh_minutes > 0:
+                JiraIssueMetadataService(
+                    log_provider,
+                    jira_service,
+                    issue_service_factory.make_issue_service(prompt=False),
+                    issue_metadata,
+                ).start(settings.jira_metadata_refresh_minutes * 60)
+        view_factory = ViewFactory(
+            log_provider,
+            issue_service_factory,
+            time_entry_service_factory,
+            settings_provider,
+            WorkCalendarProvider(settings_provider),
+            EventLoopProvider(log_provider),
+            issue_sync_service,
+            issue_metadata,
         )
+        return view_factory, log_provider
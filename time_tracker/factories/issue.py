@@ -7,5 +7,11 @@ class IssueServiceFactory:
     def __init__(self, log_provider: ILoggingProvider):
         self.log_provider = log_provider
 
-    def make_issue_service(self) -> IIssueService:
-        return IssueService(self.log_provider)
+    def make_issue_service(self, prompt: bool = True) -> IIssueService:
+        """Makes an issue service
+
+        Args:
+            prompt (bool, optional): Offer a retry prompt on I/O errors, only for the GUI thread.
+                Defaults to True.
+        """
+        return IssueService(self.log_provider, prompt)
@@ -1,25 +1,90 @@
-from time_tracker.integrations.services.jira import JiraService
+from typing import Optional
+
 from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.interfaces.time_entry import (
     ITimeEntryServiceFactory,
     ITimeEntryService,
 )
+from time_tracker.interfaces.settings import ISettingsProvider
 from time_tracker.models.settings import Settings
-from time_tracker.services.time_entry import TimeEntryFileService
+from time_tracker.models.sink import SinkNames, SinkSettings
+from time_tracker.providers.sink import SinkRegistry
+from time_tracker.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerTimeEntryService,
+)
+from time_tracker.services.coalescing import CoalescingTimeEntryService
+from time_tracker.services.sink import BatchingTimeEntryService
 
 
 class TimeEntryServiceFactory(ITimeEntryServiceFactory):
-    def __init__(self, log_provider: ILoggingProvider):
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        settings_provider: ISettingsProvider,
+        registry: Optional[SinkRegistry] = None,
+    ):
+        self.log = log_provider.get_logger("TimeEntryServiceFactory")
         self.log_provider = log_provider
+        self.settings_provider = settings_provider
+        self.registry = registry or SinkRegistry(log_provider, settings_provider)
+        self.sinks: dict[str, ITimeEntryService] = {}
+
+    def make_sink(self, name: str) -> ITimeEntryService:
+        # shared, so e.g. every Jira caller draws on one connection pool, rate limit and login
+        if name not in self.sinks:
+            self.sinks[name] = self.registry.create(name)
+        return self.sinks[name]
 
     def make_time_entry_file_service(self) -> ITimeEntryService:
-        return TimeEntryFileService(self.log_provider)
+        return self.make_sink(SinkNames.FILE)
 
     def make_time_entry_jira_service(self) -> ITimeEntryService:
-        return JiraService(self.log_provider, Settings.load())
+        return self.make_sink(SinkNames.JIRA)
+
+    def make_time_entry_team_service(self) -> ITimeEntryService:
+        return self.make_sink(SinkNames.TEAM)
+
+    def make_circuit_breaker(self) -> CircuitBreaker:
+        settings = self.settings_provider.get_settings()
+        breaker = CircuitBreaker(
+            settings.jira_breaker_failures, settings.jira_breaker_reset_seconds
+        )
+
+        def configure(settings: Settings) -> None:
+            breaker.configure(
+                settings.jira_breaker_failures, settings.jira_breaker_reset_seconds
+            )
+
+        self.settings_provider.subscribe(configure)
+        return breaker
 
     def make_time_entry_services(self) -> list[ITimeEntryService]:
-        return [
-            self.make_time_entry_file_service(),
-            self.make_time_entry_jira_service(),
-        ]
+        settings = self.settings_provider.get_settings()
+        services = []
+        for spec in self.registry.enabled_specs(settings):
+            try:
+                sink = self.make_sink(spec.name)
+            except Exception as e:
+                self.log.error("Unable to load the %s sink: %s", spec.name, e)
+                continue
+            service = sink
+            sink_settings = settings.sinks.get(spec.name) or SinkSettings()
+            if sink_settings.batch_size or sink_settings.concurrency > 1:
+                service = BatchingTimeEntryService(
+                    service, sink_settings.batch_size, sink_settings.concurrency
+                )
+            if settings.coalesce_entries:
+                service = CoalescingTimeEntryService(self.log_provider, service)
+            if spec.queue_file is not None:
+                # outermost, so an unreachable sink fails fast before coalescing or lookups
+                service = CircuitBreakerTimeEntryService(
+                    self.log_provider,
+                    service,
+                    self.make_circuit_breaker(),
+                    getattr(sink, "is_available", lambda: True),
+                    spec.title or spec.name,
+                    spec.queue_file,
+                )
+            services.append(service)
+        return services
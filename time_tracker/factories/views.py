@@ -1,8 +1,19 @@
-from time_tracker.interfaces.issue import IIssueServiceFactory
+from typing import Optional
+
+import PySimpleGUI as sg
+
+from time_tracker.interfaces.calendar import IWorkCalendarProvider
+from time_tracker.interfaces.event_loop import IEventLoopProvider
+from time_tracker.interfaces.issue import (
+    IIssueMetadataCache,
+    IIssueServiceFactory,
+    IIssueSyncService,
+)
 from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.interfaces.settings import ISettingsProvider
 from time_tracker.interfaces.time_entry import ITimeEntryServiceFactory
 from time_tracker.interfaces.views import (
+    ICatchUpView,
     IPromptView,
     IPromptViewFactory,
     ITimeEntryView,
@@ -11,6 +22,7 @@ from time_tracker.interfaces.views import (
     IViewFactory,
 )
 from time_tracker.models.settings import Settings
+from time_tracker.services.asynchronous import as_async_time_entry_service
 from time_tracker.views.issue import IssueManagementView, NewIssueView
 from time_tracker.views.menu import MenuView
 from time_tracker.views.prompt import (
@@ -20,7 +32,7 @@ from time_tracker.views.prompt import (
     WarningPromptView,
 )
 from time_tracker.views.settings import SettingsView
-from time_tracker.views.time_entry import TimeEntryView
+from time_tracker.views.time_entry import CatchUpTimeEntryView, TimeEntryView
 
 
 class ViewFactory(IViewFactory):
@@ -30,31 +42,64 @@ class ViewFactory(IViewFactory):
         issue_service_factory: IIssueServiceFactory,
         time_entry_service_factory: ITimeEntryServiceFactory,
         settings_provider: ISettingsProvider,
+        calendar_provider: IWorkCalendarProvider,
+        event_loop: IEventLoopProvider,
+        issue_sync_service: Optional[IIssueSyncService] = None,
+        issue_metadata: Optional[IIssueMetadataCache] = None,
     ):
         self.log_provider = log_provider
+        self.event_loop = event_loop
+        self.issue_sync_service = issue_sync_service
+        self.issue_metadata = issue_metadata
         self.issue_service = issue_service_factory.make_issue_service()
         self.time_entry_services = time_entry_service_factory.make_time_entry_services()
+        # adapted once, so every menu shares the per service ordering of the adapters
+        self.async_time_entry_services = [
+            as_async_time_entry_service(service) for service in self.time_entry_services
+        ]
         self.settings_provider = settings_provider
+        self.calendar_provider = calendar_provider
+        settings_provider.subscribe(self.apply_settings)
+
+    def apply_settings(self, settings: Settings) -> None:
+        sg.theme(settings.theme)
 
     def make_issue_management_view(self) -> IView:
-        return IssueManagementView(self.issue_service, self)
+        return IssueManagementView(
+            self.issue_service,
+            self,
+            self.log_provider,
+            self.event_loop,
+            self.issue_sync_service,
+            self.issue_metadata,
+        )
 
     def make_menu_view(self) -> IView:
         return MenuView(
             self.log_provider,
             self.time_entry_services,
-            self.settings_provider.get_settings(),
+            self.async_time_entry_services,
+            self.settings_provider,
+            self.calendar_provider,
             self,
+            self.event_loop,
         )
 
     def make_new_issue_view(self) -> IView:
         return NewIssueView(self.issue_service)
 
     def make_time_entry_view(self) -> ITimeEntryView:
-        return TimeEntryView(self.log_provider, self.issue_service)
+        return TimeEntryView(
+            self.log_provider, self.issue_service, self, self.issue_metadata
+        )
+
+    def make_catch_up_view(self) -> ICatchUpView:
+        return CatchUpTimeEntryView(
+            self.log_provider, self.issue_service, self.issue_metadata
+        )
 
     def make_settings_view(self) -> IView:
-        return SettingsView(self.log_provider, Settings.load())
+        return SettingsView(self.log_provider, self.settings_provider)
 
 
 class PromptViewFactory(IPromptViewFactory):
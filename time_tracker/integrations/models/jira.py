@@ -1,17 +1,94 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 from enum import IntEnum
+from pathlib import Path
 from typing import Optional
 
 from dataclasses_json import DataClassJsonMixin
 
+from time_tracker.models.enums import StringEnum
+from time_tracker.models.settings import WORKING_DIR
+from time_tracker.models.time_entry import TimeEntry, local_datetime
+
+JIRA_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.000%z"
+# JQL only compares dates to the minute
+JQL_DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+JIRA_ISSUE_SYNC_FILE: Path = WORKING_DIR.joinpath("jiraIssueSync.json")
+JIRA_ISSUE_FIELDS = ["summary", "updated", "status", "assignee"]
+
 
 class JiraStatusCodes(IntEnum):
     NEEDS_AUTH = 901
+    UNAUTHORIZED = 401
     FAILED_AUTH = 403
     SUCCESS = 201
+    UPDATED = 200
+    DELETED = 204
+    NOT_FOUND = 404
+    TOO_MANY_REQUESTS = 429
+    UNREACHABLE = 902
 
 
 @dataclass(slots=True)
 class JiraResponse(DataClassJsonMixin):
     status_code: JiraStatusCodes
     message: Optional[str] = None
+
+
+@dataclass(slots=True)
+class JiraIssueSyncState(DataClassJsonMixin):
+    jql: Optional[str] = None
+    watermark: Optional[datetime] = None
+
+
+class ReconcileKind(StringEnum):
+    MISSING = "missing"
+    DUPLICATE = "duplicate"
+    MISMATCHED = "mismatched"
+    UNTRACKED = "untracked"
+
+
+@dataclass(slots=True)
+class JiraWorklog(DataClassJsonMixin):
+    id: str
+    issue: str
+    started: datetime
+    seconds: int
+    comment: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ReconcileFinding(DataClassJsonMixin):
+    kind: ReconcileKind
+    issue: str
+    entry: Optional[TimeEntry] = None
+    worklog: Optional[JiraWorklog] = None
+    repaired: bool = False
+    message: Optional[str] = None
+
+    def __str__(self):
+        local = (
+            f"local {local_datetime(self.entry.from_time):%Y-%m-%d %H:%M}-"
+            + f"{local_datetime(self.entry.to_time):%H:%M}"
+            if self.entry
+            else None
+        )
+        remote = (
+            f"worklog {self.worklog.id} at {local_datetime(self.worklog.started):%Y-%m-%d %H:%M} "
+            + f"for {self.worklog.seconds // 60} min"
+            if self.worklog
+            else None
+        )
+        details = ", ".join(part for part in (local, remote, self.message) if part)
+        repaired = " (repaired)" if self.repaired else ""
+        return f"{self.kind:<10} {self.issue:<16} {details}{repaired}"
+
+
+@dataclass(slots=True)
+class ReconcileReport(DataClassJsonMixin):
+    matched: int = 0
+    findings: list[ReconcileFinding] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    def count(self, kind: ReconcileKind) -> int:
+        return sum(1 for finding in self.findings if finding.kind == kind)
@@ -1,31 +1,70 @@
-from datetime import timedelta
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
 
 import requests
-from time_tracker.integrations.models.jira import JiraResponse, JiraStatusCodes
+from time_tracker.integrations.models.jira import (
+    JIRA_DATETIME_FORMAT,
+    JiraResponse,
+    JiraStatusCodes,
+)
+from time_tracker.integrations.services.jira_client import JiraClient
 from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.settings import ISettingsProvider
 from time_tracker.models.settings import Settings
 from time_tracker.interfaces.time_entry import (
-    ITimeEntryService,
+    IExtendableTimeEntryService,
 )
+from time_tracker.models.issue import Issue
 from time_tracker.models.time_entry import (
     TimeEntry,
     TimeEntryResponse,
     TimeEntryResponseDisposition,
+    local_datetime,
 )
+from time_tracker.providers.metrics import METRICS
 from time_tracker.providers.time_entry import BasicAuthenticationProvider
 
 
-class JiraService(ITimeEntryService):
+def issue_key(issue: Issue | str) -> str:
+    if isinstance(issue, Issue):
+        return issue.issue_number
+    return issue
+
+
+def jira_timestamp(moment: datetime) -> str:
+    return local_datetime(moment).astimezone().strftime(JIRA_DATETIME_FORMAT)
+
+
+# worklog ids are only needed for the most recent entries, which coalescing may extend
+MAX_TRACKED_WORKLOGS = 1000
+WORKLOG_PAGE_SIZE = 1000
+
+
+class JiraRequestError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Jira returned {status_code}: {message}")
+        self.status_code = status_code
+
+
+class JiraService(IExtendableTimeEntryService):
     def __init__(
         self,
         log_provider: ILoggingProvider,
-        settings: Settings,
+        settings_provider: ISettingsProvider,
     ):
         self.auth_provider = BasicAuthenticationProvider()
         self.last_status = 0
         self.log = log_provider.get_logger("JiraService")
-        self.settings = settings
+        self.settings_provider = settings_provider
+        self.worklog_ids: dict[str, str] = {}
+        self._worklog_lock = threading.Lock()
+        self.client = JiraClient(log_provider, settings_provider)
+
+    @property
+    def settings(self) -> Settings:
+        return self.settings_provider.get_settings()
 
     @property
     def base_url(self) -> str:
@@ -47,8 +86,8 @@ class JiraService(ITimeEntryService):
             "Accept": "application/json",
         }
 
+    @METRICS.timed("jira.log_work")
     def log_work(self, entry: TimeEntry) -> TimeEntryResponse:
-        time_interval = entry.to_time - entry.from_time
         if not self.auth_provider.get_auth():
             self.log.debug("Credentials not found")
             return self.create_response(
@@ -57,23 +96,52 @@ class JiraService(ITimeEntryService):
                 )
             )
 
+        if entry.key in self.worklog_ids:
+            # already posted, e.g. resubmitted after a response was lost
+            self.log.debug("Worklog for %s already exists", entry.key)
+            return self.create_response(JiraResponse(JiraStatusCodes.SUCCESS))
+
         url = self.worklog_url(entry.issue)
+        try:
+            result = self._post_worklog(url, entry)
+        except requests.RequestException as e:
+            if entry.key in self.worklog_ids:
+                result = JiraResponse(JiraStatusCodes.SUCCESS)
+            else:
+                self.log.warning("Unable to reach Jira: %s", e)
+                result = JiraResponse(
+                    JiraStatusCodes.UNREACHABLE, f"Unable to reach Jira: {e}"
+                )
+        self.log.debug("%s", result)
+        METRICS.increment("jira.log_work_responses", status=result.status_code)
+        return self.create_response(result)
 
+    def _post_worklog(self, url: str, entry: TimeEntry) -> JiraResponse:
         exists, status_code = self.issue_exists(entry.issue)
         if exists:
-            data = {"timeSpentSeconds": {time_interval.seconds}}
-            if entry.comment:
-                data["comment"] = entry.comment
+            data = self.worklog_data(entry)
             self.log.debug(
                 "POST(%s, headers=%s, data=%s)",
                 url,
                 str(self.clean_headers),
                 str(data),
             )
-            response = requests.post(url, headers=self.headers, data=data)
+            response = self.client.post(
+                url,
+                headers=self.headers,
+                json=data,
+                retry_guard=lambda: self.worklog_missing(entry),
+            )
             if response.status_code == JiraStatusCodes.SUCCESS:
                 result = JiraResponse(response.status_code)
-            elif response.status_code == JiraStatusCodes.FAILED_AUTH:
+                self.remember_worklog(entry, response)
+            elif entry.key in self.worklog_ids:
+                # an earlier attempt landed even though its response was lost
+                result = JiraResponse(JiraStatusCodes.SUCCESS)
+            elif response.status_code in (
+                JiraStatusCodes.UNAUTHORIZED,
+                JiraStatusCodes.FAILED_AUTH,
+            ):
                 self.auth_provider.clear_auth()
                 result = JiraResponse(
                     response.status_code, "Authentication with Jira failed!"
@@ -98,9 +166,199 @@ class JiraService(ITimeEntryService):
                 status_code,
                 message,
             )
-        self.log.debug("%s", result)
+        return result
+
+    @METRICS.timed("jira.extend_work")
+    def extend_work(self, previous: TimeEntry, entry: TimeEntry) -> TimeEntryResponse:
+        worklog_id = self.worklog_ids.get(previous.key)
+        if worklog_id is None or not self.auth_provider.get_auth():
+            return self.create_response(
+                JiraResponse(
+                    (
+                        JiraStatusCodes.NEEDS_AUTH
+                        if worklog_id is not None
+                        else JiraStatusCodes.NOT_FOUND
+                    ),
+                    f"No open worklog to extend for {previous.key}",
+                )
+            )
+        result = self.update_worklog(worklog_id, entry)
+        if result.status_code == JiraStatusCodes.SUCCESS:
+            with self._worklog_lock:
+                self.worklog_ids.pop(previous.key, None)
+            self._remember_worklog_id(entry, worklog_id)
         return self.create_response(result)
 
+    @METRICS.timed("jira.update_worklog")
+    def update_worklog(self, worklog_id: str, entry: TimeEntry) -> JiraResponse:
+        """Overwrites an existing worklog with the entry's start, duration and comment
+
+        Args:
+            worklog_id (str): The id of the worklog on the entry's issue
+            entry (TimeEntry): The entry holding the new values
+
+        Returns:
+            JiraResponse: SUCCESS if the worklog was updated
+        """
+        url = f"{self.worklog_url(entry.issue)}/{worklog_id}"
+        data = self.worklog_data(entry)
+        self.log.debug(
+            "PUT(%s, headers=%s, data=%s)", url, str(self.clean_headers), str(data)
+        )
+        return self._send_worklog_change("PUT", url, JiraStatusCodes.UPDATED, json=data)
+
+    @METRICS.timed("jira.delete_worklog")
+    def delete_worklog(self, issue: Issue | str, worklog_id: str) -> JiraResponse:
+        url = f"{self.worklog_url(issue)}/{worklog_id}"
+        self.log.debug("DELETE(%s, headers=%s)", url, str(self.clean_headers))
+        return self._send_worklog_change("DELETE", url, JiraStatusCodes.DELETED)
+
+    def _send_worklog_change(
+        self, method: str, url: str, expected: JiraStatusCodes, **kwargs
+    ) -> JiraResponse:
+        try:
+            response = self.client.request(method, url, headers=self.headers, **kwargs)
+        except requests.RequestException as e:
+            self.log.warning("Unable to reach Jira: %s", e)
+            return JiraResponse(
+                JiraStatusCodes.UNREACHABLE, f"Unable to reach Jira: {e}"
+            )
+        if response.status_code == expected:
+            result = JiraResponse(JiraStatusCodes.SUCCESS)
+        elif response.status_code in (
+            JiraStatusCodes.UNAUTHORIZED,
+            JiraStatusCodes.FAILED_AUTH,
+        ):
+            self.auth_provider.clear_auth()
+            result = JiraResponse(
+                response.status_code, "Authentication with Jira failed!"
+            )
+        else:
+            result = JiraResponse(
+                response.status_code,
+                f"Expected status code of {expected}, got {response.status_code}",
+            )
+        self.log.debug("%s", result)
+        return result
+
+    def iter_worklogs(
+        self, issue: Issue | str, started_after: Optional[datetime] = None
+    ) -> Iterator[dict]:
+        """Lazily yields the worklogs of an issue, one page at a time
+
+        Args:
+            issue (Issue | str): The issue to read
+            started_after (Optional[datetime], optional): Ask Jira to skip older worklogs, servers
+                that ignore it return them all. Defaults to None.
+
+        Raises:
+            JiraRequestError: Jira answered with anything but 200
+            requests.RequestException: Jira could not be reached
+
+        Yields:
+            dict: The worklogs as returned by Jira
+        """
+        start_at = 0
+        while True:
+            params = {"startAt": start_at, "maxResults": WORKLOG_PAGE_SIZE}
+            if started_after is not None:
+                params["startedAfter"] = int(started_after.timestamp() * 1000)
+            response = self.client.get(
+                self.worklog_url(issue), headers=self.headers, params=params
+            )
+            if response.status_code != JiraStatusCodes.UPDATED:
+                if response.status_code in (
+                    JiraStatusCodes.UNAUTHORIZED,
+                    JiraStatusCodes.FAILED_AUTH,
+                ):
+                    self.auth_provider.clear_auth()
+                raise JiraRequestError(response.status_code, response.text[:200])
+            page = response.json()
+            worklogs = page.get("worklogs", [])
+            yield from worklogs
+            start_at += len(worklogs)
+            if not worklogs or start_at >= page.get("total", 0):
+                return
+
+    def worklog_data(self, entry: TimeEntry) -> dict:
+        data = {
+            "started": jira_timestamp(entry.from_time),
+            "timeSpentSeconds": int((entry.to_time - entry.from_time).total_seconds()),
+        }
+        if entry.comment:
+            data["comment"] = entry.comment
+        return data
+
+    def find_worklog(self, entry: TimeEntry) -> Optional[str]:
+        """Looks for a worklog on the issue matching the entry's start and duration
+
+        Used before repeating a worklog POST whose outcome is unknown, so a retry never creates a
+        duplicate. Every page of the issue's worklogs is read before concluding there is none.
+
+        Args:
+            entry (TimeEntry): The entry that may have been logged
+
+        Raises:
+            JiraRequestError: The worklogs couldn't be read, so whether one matches is unknown
+            requests.RequestException: Jira could not be reached
+
+        Returns:
+            Optional[str]: The id of the matching worklog, or None if there is none
+        """
+        data = self.worklog_data(entry)
+        started = datetime.strptime(data["started"], JIRA_DATETIME_FORMAT)
+        for worklog in self.iter_worklogs(
+            entry.issue, entry.from_time - timedelta(minutes=1)
+        ):
+            try:
+                matches = (
+                    datetime.strptime(worklog["started"], JIRA_DATETIME_FORMAT)
+                    == started
+                    and worklog["timeSpentSeconds"] == data["timeSpentSeconds"]
+                )
+            except (KeyError, ValueError):
+                continue
+            if matches:
+                self._remember_worklog_id(entry, str(worklog["id"]))
+                return str(worklog["id"])
+        return None
+
+    def worklog_missing(self, entry: TimeEntry) -> bool:
+        """Whether a POST of the entry can be repeated, False unless Jira shows it didn't land"""
+        try:
+            return self.find_worklog(entry) is None
+        except JiraRequestError as e:
+            self.log.warning("Unable to check for a worklog of %s: %s", entry.key, e)
+            return False
+
+    def remember_worklog(self, entry: TimeEntry, response: requests.Response) -> None:
+        try:
+            worklog_id = response.json().get("id")
+        except ValueError:
+            return
+        if worklog_id is None:
+            return
+        self._remember_worklog_id(entry, str(worklog_id))
+
+    def _remember_worklog_id(self, entry: TimeEntry, worklog_id: str) -> None:
+        with self._worklog_lock:
+            self.worklog_ids[entry.key] = worklog_id
+            while len(self.worklog_ids) > MAX_TRACKED_WORKLOGS:
+                self.worklog_ids.pop(next(iter(self.worklog_ids)))
+
+    @METRICS.timed("jira.log_work_batch")
+    def log_work_batch(self, entries: Iterable[TimeEntry]) -> list[TimeEntryResponse]:
+        entries = list(entries)
+        if not entries:
+            return []
+        if not self.auth_provider.get_auth():
+            return [self.log_work(entry) for entry in entries]
+        workers = max(1, min(self.settings.jira_concurrency, len(entries)))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="JiraService"
+        ) as executor:
+            return list(executor.map(self.log_work, entries))
+
     def create_response(self, response: JiraResponse):
         return TimeEntryResponse(
             response.status_code == JiraStatusCodes.SUCCESS,
@@ -111,21 +369,86 @@ class JiraService(ITimeEntryService):
     def get_disposition(
         self, status_code: JiraStatusCodes
     ) -> TimeEntryResponseDisposition:
-        if status_code == JiraStatusCodes.NEEDS_AUTH:
+        if status_code in (
+            JiraStatusCodes.NEEDS_AUTH,
+            JiraStatusCodes.UNAUTHORIZED,
+            JiraStatusCodes.FAILED_AUTH,
+        ):
             return TimeEntryResponseDisposition.NO_AUTH
         if status_code == JiraStatusCodes.SUCCESS:
             return TimeEntryResponseDisposition.SUCCESS
+        if (
+            status_code
+            in (JiraStatusCodes.UNREACHABLE, JiraStatusCodes.TOO_MANY_REQUESTS)
+            or status_code >= 500
+        ):
+            return TimeEntryResponseDisposition.UNAVAILABLE
         return TimeEntryResponseDisposition.FAILURE
 
-    def issue_url(self, issue):
-        return f"{self.base_url}/rest/api/2/issue/{issue}"
+    def is_available(self) -> bool:
+        """Checks whether Jira is answering requests, without retrying
+
+        Returns:
+            bool: True if the server responded without a server error
+        """
+        try:
+            response = self.client.get(
+                f"{self.base_url}/rest/api/2/serverInfo",
+                headers=self.headers,
+                max_retries=0,
+            )
+        except requests.RequestException as e:
+            self.log.debug("Jira is unavailable: %s", e)
+            return False
+        return response.status_code < 500
+
+    @METRICS.timed("jira.search")
+    def search(
+        self,
+        jql: str,
+        start_at: int = 0,
+        max_results: int = 50,
+        fields: Optional[list[str]] = None,
+        validate_query: Optional[str] = None,
+    ) -> requests.Response:
+        """Requests one page of a JQL search
+
+        Args:
+            jql (str): The query
+            start_at (int, optional): Index of the first result. Defaults to 0.
+            max_results (int, optional): Page size. Defaults to 50.
+            fields (Optional[list[str]], optional): Only return these fields. Defaults to None.
+            validate_query (Optional[str], optional): "strict", "warn" or "none", "warn"
+                ignores unknown issue keys instead of failing. Defaults to None, for Jira's
+                default.
+
+        Returns:
+            requests.Response: The raw search response
+        """
+        data = {"jql": jql, "startAt": start_at, "maxResults": max_results}
+        if fields is not None:
+            data["fields"] = fields
+        if validate_query is not None:
+            data["validateQuery"] = validate_query
+        self.log.debug("POST(%s/rest/api/2/search, data=%s)", self.base_url, data)
+        # a search only reads, so repeating it after a server error is safe
+        return self.client.post(
+            f"{self.base_url}/rest/api/2/search",
+            headers=self.headers,
+            json=data,
+            retry_guard=lambda: True,
+        )
+
+    def issue_url(self, issue: Issue | str):
+        return f"{self.base_url}/rest/api/2/issue/{issue_key(issue)}"
 
     def worklog_url(self, issue):
         return f"{self.issue_url(issue)}/worklog"
 
-    def issue_exists(self, issue: str) -> tuple[bool, int]:
+    @METRICS.timed("jira.issue_exists")
+    def issue_exists(self, issue: Issue | str) -> tuple[bool, int]:
         url = self.issue_url(issue)
         self.log.debug(f"GET({url}, headers={self.clean_headers})")
-        response = requests.get(url, headers=self.headers)
+        response = self.client.get(url, headers=self.headers)
 
         return response.status_code == 200, response.status_code
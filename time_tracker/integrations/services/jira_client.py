@@ -0,0 +1,205 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import sleep
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from time_tracker.integrations.models.jira import JiraStatusCodes
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.models.settings import Settings
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.throttling import TokenBucket
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date
+
+    Args:
+        value (Optional[str]): The header value
+
+    Returns:
+        Optional[float]: The seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class JiraClient:
+    """HTTP layer for JiraService that throttles and retries requests
+
+    Requests are paced by a token bucket shared by every thread using this client. A 429 waits
+    for its Retry-After before trying again, while 5xx responses and connection errors back off
+    exponentially with full jitter. Requests that are not idempotent, like creating a worklog,
+    are only retried when the caller's retry guard confirms the first attempt did not land.
+    """
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        settings_provider: ISettingsProvider,
+        sleeper: Callable[[float], None] = sleep,
+    ):
+        self.log = log_provider.get_logger("JiraClient")
+        self.settings_provider = settings_provider
+        self.sleeper = sleeper
+        self._lock = threading.Lock()
+        self._limits: Optional[tuple[float, int]] = None
+        self.limiter = TokenBucket(0)
+        # one pooled session so batches reuse connections instead of reconnecting per call
+        pool_size = max(10, self.settings.jira_concurrency)
+        self.session = requests.Session()
+        self.session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        )
+        self.session.mount(
+            "http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        )
+
+    @property
+    def settings(self) -> Settings:
+        return self.settings_provider.get_settings()
+
+    def _get_limiter(self, settings: Settings) -> TokenBucket:
+        limits = (settings.jira_requests_per_second, settings.jira_burst)
+        with self._lock:
+            if limits != self._limits:
+                self._limits = limits
+                self.limiter = TokenBucket(*limits, sleeper=self.sleeper)
+            return self.limiter
+
+    def backoff(self, attempt: int, settings: Settings) -> float:
+        ceiling = min(
+            settings.jira_max_backoff_seconds,
+            settings.jira_backoff_seconds * 2**attempt,
+        )
+        return random.uniform(0, ceiling)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        retry_guard: Optional[Callable[[], bool]] = None,
+        max_retries: Optional[int] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Sends a request, waiting on the rate limit and retrying transient failures
+
+        Args:
+            method (str): The HTTP method
+            url (str): The url to request
+            retry_guard (Optional[Callable[[], bool]], optional): For requests that are not
+                idempotent, called before each retry; returning False stops retrying because the
+                earlier attempt was applied. Defaults to None, never retrying such requests.
+            max_retries (Optional[int], optional): Overrides the jira_max_retries setting.
+                Defaults to None.
+            **kwargs: Passed on to requests.Session.request
+
+        Raises:
+            requests.RequestException: The connection failed on every attempt
+
+        Returns:
+            requests.Response: The last response received
+        """
+        method = method.upper()
+        settings = self.settings
+        limiter = self._get_limiter(settings)
+        if max_retries is None:
+            max_retries = settings.jira_max_retries
+        kwargs.setdefault("timeout", settings.jira_timeout_seconds)
+        attempt = 0
+        while True:
+            waited = limiter.acquire()
+            if waited:
+                METRICS.observe("jira.throttled_seconds", waited)
+            try:
+                with METRICS.timer("jira.request", method=method):
+                    response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                # a connect timeout means the request was never sent, so it is always safe to repeat
+                if attempt >= max_retries or not (
+                    isinstance(e, requests.ConnectTimeout)
+                    or self._may_retry(method, retry_guard)
+                ):
+                    METRICS.increment("jira.requests", method=method, status="error")
+                    raise
+                delay = self.backoff(attempt, settings)
+                reason = "connection"
+                self.log.warning(
+                    "%s %s failed (%s), retrying in %.2fs", method, url, e, delay
+                )
+            else:
+                status = response.status_code
+                METRICS.increment("jira.requests", method=method, status=str(status))
+                if status == JiraStatusCodes.TOO_MANY_REQUESTS:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    delay = (
+                        retry_after
+                        if retry_after is not None
+                        else self.backoff(attempt, settings)
+                    )
+                    # throttled requests were rejected, so even a POST can safely be repeated
+                    if attempt >= max_retries:
+                        return response
+                    reason = "throttled"
+                elif status >= 500:
+                    if attempt >= max_retries or not self._may_retry(
+                        method, retry_guard
+                    ):
+                        return response
+                    delay = self.backoff(attempt, settings)
+                    reason = "server_error"
+                else:
+                    return response
+                self.log.warning(
+                    "%s %s returned %s, retrying in %.2fs", method, url, status, delay
+                )
+            METRICS.increment("jira.retries", reason=reason)
+            if reason == "throttled" and limiter.rate > 0:
+                # every thread sharing the limiter waits out the throttle in acquire
+                limiter.pause(delay)
+            else:
+                self.sleeper(delay)
+            attempt += 1
+
+    def _may_retry(
+        self, method: str, retry_guard: Optional[Callable[[], bool]]
+    ) -> bool:
+        if method in IDEMPOTENT_METHODS:
+            return True
+        if retry_guard is None:
+            return False
+        try:
+            return retry_guard()
+        except requests.RequestException as e:
+            # can't tell whether the first attempt landed, so don't risk a duplicate
+            self.log.warning("Retry guard failed: %s", e)
+            return False
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
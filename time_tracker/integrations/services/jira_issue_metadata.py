@@ -0,0 +1,120 @@
+import re
+import threading
+from logging import Logger
+from typing import Optional
+
+import requests
+from time_tracker.integrations.models.jira import JIRA_ISSUE_FIELDS, JiraStatusCodes
+from time_tracker.integrations.services.jira import JiraService
+from time_tracker.integrations.services.jira_issue_sync import parse_metadata
+from time_tracker.interfaces.issue import IIssueMetadataCache, IIssueService
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.providers.metrics import METRICS
+
+_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+
+class JiraIssueMetadataService:
+    """Refreshes the cached metadata of the active issues from Jira on a schedule
+
+    The active issues that look like Jira keys are looked up with `key in (...)` searches of
+    jira_sync_page_size keys each, so a refresh of a few thousand issues is a few dozen
+    requests. Keys Jira doesn't know are skipped rather than failing the search. Refreshes are
+    skipped until there are credentials, and a failed search leaves the cache as it was.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        jira_service: JiraService,
+        issue_service: IIssueService,
+        metadata_cache: IIssueMetadataCache,
+    ):
+        self.log = log_provider.get_logger("JiraIssueMetadataService")
+        self.jira_service = jira_service
+        self.issue_service = issue_service
+        self.metadata_cache = metadata_cache
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    @METRICS.timed("jira.refresh_metadata")
+    def refresh(self) -> int:
+        """Fetches the metadata of the active issues into the cache
+
+        Returns:
+            int: The number of issues refreshed
+        """
+        if not self.jira_service.auth_provider.get_auth():
+            return 0
+        keys = sorted(
+            {
+                issue.issue_number
+                for issue in self.issue_service.load_active_issues().issues
+                if _ISSUE_KEY.match(issue.issue_number)
+            }
+        )
+        page_size = max(1, self.jira_service.settings.jira_sync_page_size)
+        refreshed = 0
+        for start in range(0, len(keys), page_size):
+            chunk = keys[start : start + page_size]
+            try:
+                response = self.jira_service.search(
+                    f"key in ({', '.join(chunk)})",
+                    0,
+                    len(chunk),
+                    JIRA_ISSUE_FIELDS,
+                    validate_query="warn",
+                )
+                if response.status_code in (
+                    JiraStatusCodes.UNAUTHORIZED,
+                    JiraStatusCodes.FAILED_AUTH,
+                ):
+                    self.jira_service.auth_provider.clear_auth()
+                if response.status_code != JiraStatusCodes.UPDATED:
+                    self.log.warning(
+                        "Metadata refresh failed with %s: %s",
+                        response.status_code,
+                        response.text[:200],
+                    )
+                    break
+                metadata = [
+                    parse_metadata(issue) for issue in response.json().get("issues", [])
+                ]
+            except (requests.RequestException, ValueError) as e:
+                self.log.warning("Metadata refresh failed: %s", e)
+                break
+            self.metadata_cache.put_many(metadata)
+            refreshed += len(metadata)
+        if refreshed:
+            self.log.info("Refreshed the metadata of %s issues", refreshed)
+        return refreshed
+
+    def start(self, interval_seconds: float) -> None:
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval_seconds,),
+            name="JiraIssueMetadata",
+            daemon=True,
+        )
+        self._refresher.start()
+
+    def stop(self) -> None:
+        if self._refresher is None:
+            return
+        self._stop.set()
+        self._refresher.join()
+        self._refresher = None
+
+    def _refresh_loop(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.log.error("Unable to refresh issue metadata: %s", e)
+            if self._stop.wait(interval_seconds):
+                return
@@ -0,0 +1,221 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Iterable, Optional
+
+import requests
+from time_tracker.integrations.models.jira import (
+    JIRA_DATETIME_FORMAT,
+    JIRA_ISSUE_FIELDS,
+    JIRA_ISSUE_SYNC_FILE,
+    JQL_DATETIME_FORMAT,
+    JiraIssueSyncState,
+    JiraStatusCodes,
+)
+from time_tracker.integrations.services.jira import JiraRequestError, JiraService
+from time_tracker.interfaces.issue import (
+    IIssueMetadataCache,
+    IIssueService,
+    IIssueSyncService,
+)
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.issue import Issue, IssueList, IssueMetadata, IssueSyncResult
+from time_tracker.providers.metrics import METRICS
+
+_ORDER_BY = re.compile(r"\s+ORDER\s+BY\s+.*$", re.IGNORECASE | re.DOTALL)
+
+
+def watermark_jql(jql: str, watermark: Optional[datetime]) -> str:
+    """Restricts a query to issues updated since the watermark, oldest first
+
+    Args:
+        jql (str): The configured query, any ORDER BY clause is replaced
+        watermark (Optional[datetime]): The latest updated time seen by the previous sync
+
+    Returns:
+        str: The query to search with
+    """
+    jql = _ORDER_BY.sub("", jql.strip())
+    if watermark is not None:
+        since = watermark.astimezone().strftime(JQL_DATETIME_FORMAT)
+        jql = f'({jql}) AND updated >= "{since}"' if jql else f'updated >= "{since}"'
+    return f"{jql} ORDER BY updated ASC"
+
+
+def parse_updated(fields: dict) -> Optional[datetime]:
+    if fields.get("updated"):
+        try:
+            return datetime.strptime(fields["updated"], JIRA_DATETIME_FORMAT)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_issue(data: dict) -> tuple[Issue, Optional[datetime]]:
+    fields = data.get("fields") or {}
+    issue = Issue(data["key"], fields.get("summary") or data["key"])
+    return issue, parse_updated(fields)
+
+
+def parse_metadata(data: dict) -> IssueMetadata:
+    fields = data.get("fields") or {}
+    assignee = fields.get("assignee") or {}
+    return IssueMetadata(
+        data["key"],
+        fields.get("summary"),
+        (fields.get("status") or {}).get("name"),
+        assignee.get("displayName") or assignee.get("name"),
+        parse_updated(fields),
+    )
+
+
+def merge_issues(
+    active_list: IssueList, deleted_list: IssueList, issues: Iterable[Issue]
+) -> tuple[int, int]:
+    """Merges fetched issues into the active list by issue number
+
+    Issues the user deleted stay deleted, existing issues take the fetched description.
+
+    Returns:
+        tuple[int, int]: The number of issues added and updated
+    """
+    active = {issue.issue_number: issue for issue in active_list.issues}
+    deleted = {issue.issue_number for issue in deleted_list.issues}
+    added = updated = 0
+    for issue in issues:
+        if issue.issue_number in deleted:
+            continue
+        existing = active.get(issue.issue_number)
+        if existing is None:
+            active_list.append(issue)
+            active[issue.issue_number] = issue
+            added += 1
+        elif existing.description != issue.description:
+            existing.description = issue.description
+            active_list.touch(existing)
+            updated += 1
+    return added, updated
+
+
+class JiraIssueSyncService(IIssueSyncService):
+    """Pulls the issues matching the configured JQL into the active issue list
+
+    The first page gives the total, the remaining pages are fetched concurrently and merged as
+    they arrive. The latest updated time seen is kept as a watermark, so later syncs only ask
+    for issues changed since; changing the JQL starts over with a full sync. Given a metadata
+    cache, the summaries, statuses and assignees of the fetched issues are stored in it too.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        jira_service: JiraService,
+        issue_service: IIssueService,
+        state_file: Path = JIRA_ISSUE_SYNC_FILE,
+        metadata_cache: Optional[IIssueMetadataCache] = None,
+    ):
+        self.log = log_provider.get_logger("JiraIssueSyncService")
+        self.jira_service = jira_service
+        self.issue_service = issue_service
+        self.state_file = state_file
+        self.metadata_cache = metadata_cache
+
+    def set_auth(self, user_name: str, password: str) -> None:
+        self.jira_service.auth_provider.set_auth(user_name, password)
+
+    def load_state(self) -> JiraIssueSyncState:
+        try:
+            with open(self.state_file, "r") as f:
+                return JiraIssueSyncState.from_json(f.read())
+        except FileNotFoundError:
+            return JiraIssueSyncState()
+        except ValueError as e:
+            self.log.warning("Ignoring unreadable sync state: %s", e)
+            return JiraIssueSyncState()
+
+    def save_state(self, state: JiraIssueSyncState) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.state_file.with_name(self.state_file.name + ".tmp")
+        with open(temporary, "w") as f:
+            f.write(state.to_json())
+        os.replace(temporary, self.state_file)
+
+    def fetch_page(self, jql: str, start_at: int, page_size: int) -> dict:
+        response = self.jira_service.search(jql, start_at, page_size, JIRA_ISSUE_FIELDS)
+        if response.status_code in (
+            JiraStatusCodes.UNAUTHORIZED,
+            JiraStatusCodes.FAILED_AUTH,
+        ):
+            self.jira_service.auth_provider.clear_auth()
+        if response.status_code != JiraStatusCodes.UPDATED:
+            raise JiraRequestError(response.status_code, response.text[:200])
+        return response.json()
+
+    @METRICS.timed("jira.sync_issues")
+    def sync_issues(self, full: bool = False) -> IssueSyncResult:
+        if not self.jira_service.auth_provider.get_auth():
+            return IssueSyncResult(
+                False, message="Jira credentials are needed", needs_auth=True
+            )
+        settings = self.jira_service.settings
+        state = self.load_state()
+        if full or state.jql != settings.jira_issue_jql:
+            state = JiraIssueSyncState(settings.jira_issue_jql)
+        jql = watermark_jql(settings.jira_issue_jql, state.watermark)
+        page_size = max(1, settings.jira_sync_page_size)
+        active_list, deleted_list = self.issue_service.load_lists()
+        result = IssueSyncResult()
+        watermark = state.watermark
+
+        def merge(page: dict) -> None:
+            nonlocal watermark
+            parsed = [parse_issue(issue) for issue in page.get("issues", [])]
+            if self.metadata_cache is not None:
+                self.metadata_cache.put_many(
+                    parse_metadata(issue) for issue in page.get("issues", [])
+                )
+            added, updated = merge_issues(
+                active_list, deleted_list, (issue for issue, _ in parsed)
+            )
+            result.fetched += len(parsed)
+            result.added += added
+            result.updated += updated
+            for _, issue_updated in parsed:
+                if issue_updated and (watermark is None or issue_updated > watermark):
+                    watermark = issue_updated
+
+        try:
+            first = self.fetch_page(jql, 0, page_size)
+            merge(first)
+            total = int(first.get("total", 0))
+            page_size = int(first.get("maxResults") or page_size)
+            starts = range(page_size, total, page_size)
+            if starts:
+                workers = max(1, min(settings.jira_concurrency, len(starts)))
+                with ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="JiraIssueSync"
+                ) as executor:
+                    pages = [
+                        executor.submit(self.fetch_page, jql, start, page_size)
+                        for start in starts
+                    ]
+                    for page in as_completed(pages):
+                        merge(page.result())
+        except (JiraRequestError, requests.RequestException, ValueError) as e:
+            self.log.warning("Issue sync failed: %s", e)
+            return IssueSyncResult(
+                False,
+                message=f"Issue sync failed: {e}",
+                needs_auth=not self.jira_service.auth_provider.get_auth(),
+            )
+
+        if result.added or result.updated:
+            self.issue_service.save_active_issues(active_list)
+        self.save_state(JiraIssueSyncState(settings.jira_issue_jql, watermark))
+        self.log.info("%s", result)
+        return result
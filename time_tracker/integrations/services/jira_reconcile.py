@@ -0,0 +1,232 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from logging import Logger
+from typing import Optional
+
+import requests
+from time_tracker.integrations.models.jira import (
+    JIRA_DATETIME_FORMAT,
+    JiraStatusCodes,
+    JiraWorklog,
+    ReconcileFinding,
+    ReconcileKind,
+    ReconcileReport,
+)
+from time_tracker.integrations.services.jira import JiraRequestError, JiraService
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.time_entry import ITimeEntryQueryService
+from time_tracker.models.issue import Issue
+from time_tracker.models.time_entry import TimeEntry
+from time_tracker.providers.metrics import METRICS
+
+# Jira stores worklogs to the minute, so starts and durations within this many seconds match
+MATCH_TOLERANCE_SECONDS = 60
+
+
+def parse_worklog(issue: str, data: dict) -> Optional[JiraWorklog]:
+    try:
+        return JiraWorklog(
+            str(data["id"]),
+            issue,
+            datetime.strptime(data["started"], JIRA_DATETIME_FORMAT),
+            int(data["timeSpentSeconds"]),
+            data.get("comment") if isinstance(data.get("comment"), str) else None,
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def entry_seconds(entry: TimeEntry) -> int:
+    return int((entry.to_time - entry.from_time).total_seconds())
+
+
+def join_worklogs(
+    issue: str,
+    entries: list[TimeEntry],
+    worklogs: list[JiraWorklog],
+    tolerance_seconds: float = MATCH_TOLERANCE_SECONDS,
+) -> tuple[int, list[ReconcileFinding]]:
+    """Matches one issue's local entries to its worklogs with a sorted merge join
+
+    Both lists must be sorted by start. A worklog starting within the tolerance of an entry
+    matches it, and is mismatched if the durations differ by more than the tolerance. Further
+    worklogs at the start of an already matched entry are duplicates, other unmatched worklogs
+    are untracked and unmatched entries are missing.
+
+    Returns:
+        tuple[int, list[ReconcileFinding]]: The number of matches and the findings
+    """
+    findings: list[ReconcileFinding] = []
+    matched = 0
+    last_matched: Optional[float] = None
+
+    def unmatched_worklog(worklog: JiraWorklog) -> ReconcileFinding:
+        started = worklog.started.timestamp()
+        if (
+            last_matched is not None
+            and abs(started - last_matched) <= tolerance_seconds
+        ):
+            return ReconcileFinding(ReconcileKind.DUPLICATE, issue, worklog=worklog)
+        return ReconcileFinding(ReconcileKind.UNTRACKED, issue, worklog=worklog)
+
+    i = j = 0
+    while i < len(entries) and j < len(worklogs):
+        entry, worklog = entries[i], worklogs[j]
+        entry_start = entry.from_time.timestamp()
+        worklog_start = worklog.started.timestamp()
+        if worklog_start < entry_start - tolerance_seconds:
+            findings.append(unmatched_worklog(worklog))
+            j += 1
+        elif worklog_start > entry_start + tolerance_seconds:
+            findings.append(ReconcileFinding(ReconcileKind.MISSING, issue, entry=entry))
+            i += 1
+        else:
+            if abs(worklog.seconds - entry_seconds(entry)) > tolerance_seconds:
+                findings.append(
+                    ReconcileFinding(
+                        ReconcileKind.MISMATCHED, issue, entry=entry, worklog=worklog
+                    )
+                )
+            else:
+                matched += 1
+            last_matched = entry_start
+            i += 1
+            j += 1
+    findings.extend(
+        ReconcileFinding(ReconcileKind.MISSING, issue, entry=entry)
+        for entry in entries[i:]
+    )
+    findings.extend(unmatched_worklog(worklog) for worklog in worklogs[j:])
+    return matched, findings
+
+
+class JiraReconcileService:
+    """Checks that the locally recorded entries in a range landed in Jira
+
+    Local entries are streamed and grouped per issue, then each issue's worklogs are read page by
+    page and joined against them, with the issues handled concurrently. Only issues that have
+    local entries in the range are checked.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        source: ITimeEntryQueryService,
+        jira_service: JiraService,
+        tolerance_seconds: float = MATCH_TOLERANCE_SECONDS,
+    ):
+        self.log = log_provider.get_logger("JiraReconcileService")
+        self.source = source
+        self.jira_service = jira_service
+        self.tolerance_seconds = tolerance_seconds
+
+    def group_entries(
+        self, start: datetime, end: datetime, issue: Optional[Issue | str] = None
+    ) -> dict[str, list[TimeEntry]]:
+        groups: dict[str, dict[str, TimeEntry]] = {}
+        for entry in self.source.iter_entries(start, end, issue):
+            # the same entry recorded twice is still one worklog
+            groups.setdefault(entry.issue_number, {}).setdefault(entry.key, entry)
+        return {
+            issue_number: sorted(
+                entries.values(), key=lambda entry: entry.from_time.timestamp()
+            )
+            for issue_number, entries in groups.items()
+        }
+
+    def fetch_worklogs(
+        self, issue: str, start: datetime, end: datetime
+    ) -> list[JiraWorklog]:
+        first, last = start.timestamp(), end.timestamp()
+        worklogs = []
+        for data in self.jira_service.iter_worklogs(issue, started_after=start):
+            worklog = parse_worklog(issue, data)
+            if worklog is not None and first <= worklog.started.timestamp() < last:
+                worklogs.append(worklog)
+        worklogs.sort(key=lambda worklog: worklog.started.timestamp())
+        return worklogs
+
+    def reconcile_issue(
+        self,
+        issue: str,
+        entries: list[TimeEntry],
+        start: datetime,
+        end: datetime,
+        repair: bool,
+    ) -> tuple[int, list[ReconcileFinding]]:
+        worklogs = self.fetch_worklogs(issue, start, end)
+        matched, findings = join_worklogs(
+            issue, entries, worklogs, self.tolerance_seconds
+        )
+        if repair:
+            for finding in findings:
+                self.repair(finding)
+        return matched, findings
+
+    def repair(self, finding: ReconcileFinding) -> None:
+        """Makes Jira agree with the local entry; untracked worklogs are left alone"""
+        match finding.kind:
+            case ReconcileKind.MISSING:
+                response = self.jira_service.log_work(finding.entry)
+                finding.repaired, finding.message = response.success, response.message
+                return
+            case ReconcileKind.MISMATCHED:
+                result = self.jira_service.update_worklog(
+                    finding.worklog.id, finding.entry
+                )
+            case ReconcileKind.DUPLICATE:
+                result = self.jira_service.delete_worklog(
+                    finding.issue, finding.worklog.id
+                )
+            case _:
+                return
+        finding.repaired = result.status_code == JiraStatusCodes.SUCCESS
+        finding.message = result.message
+
+    @METRICS.timed("jira.reconcile")
+    def reconcile(
+        self,
+        start: datetime,
+        end: datetime,
+        issue: Optional[Issue | str] = None,
+        repair: bool = False,
+    ) -> ReconcileReport:
+        """Compares the local entries in a range with the worklogs in Jira
+
+        Args:
+            start (datetime): The inclusive start of the range
+            end (datetime): The exclusive end of the range
+            issue (Optional[Issue | str], optional): Only check this issue. Defaults to None.
+            repair (bool, optional): Post missing entries, correct mismatched worklogs and delete
+                duplicates. Defaults to False.
+
+        Returns:
+            ReconcileReport: The matches and findings, ordered by issue
+        """
+        groups = self.group_entries(start, end, issue)
+        report = ReconcileReport()
+        if not groups:
+            return report
+        workers = max(1, min(self.jira_service.settings.jira_concurrency, len(groups)))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="JiraReconcile"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self.reconcile_issue, issue_number, entries, start, end, repair
+                ): issue_number
+                for issue_number, entries in groups.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    matched, findings = future.result()
+                except (JiraRequestError, requests.RequestException) as e:
+                    self.log.warning("Unable to reconcile %s: %s", futures[future], e)
+                    report.errors.append(f"{futures[future]}: {e}")
+                    continue
+                report.matched += matched
+                report.findings.extend(findings)
+        report.findings.sort(key=lambda finding: finding.issue)
+        return report
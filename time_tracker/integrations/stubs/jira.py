@@ -0,0 +1,435 @@
+"""Local stand-in for the Jira REST endpoints used by the time tracker
+
+Implements enough of /rest/api/2 for JiraService and the load harness: issues, worklogs and
+search, backed by an in memory store. Latency, server errors and 401/403/429 responses can be
+injected at random rates or queued up for the next requests.
+
+Usage:
+    python -m time_tracker.integrations.stubs.jira --port 8080 --issues 500 --latency 0.05
+"""
+
+import json
+import random
+import re
+import threading
+from argparse import ArgumentParser
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from time_tracker.integrations.models.jira import JIRA_DATETIME_FORMAT
+
+_ISSUE_PATH = re.compile(
+    r"^/rest/api/2/issue/(?P<key>[^/]+)(?P<worklog>/worklog(?:/(?P<id>\d+))?)?$"
+)
+_SEARCH_PATH = "/rest/api/2/search"
+_SERVER_INFO_PATH = "/rest/api/2/serverInfo"
+_UPDATED_CLAUSE = re.compile(
+    r"updated\s*(?P<op>>=|>)\s*[\"']?(?P<value>\d{4}[-/]\d{2}[-/]\d{2}(?: \d{2}:\d{2})?)[\"']?",
+    re.IGNORECASE,
+)
+_KEY_IN_CLAUSE = re.compile(r"key\s+in\s*\((?P<keys>[^)]*)\)", re.IGNORECASE)
+MAX_RESULTS = 100
+
+
+def jira_now() -> str:
+    return datetime.now(timezone.utc).strftime(JIRA_DATETIME_FORMAT)
+
+
+@dataclass(slots=True)
+class JiraEmulatorConfig:
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after_seconds: int = 1
+    unauthorized_rate: float = 0.0
+    forbidden_rate: float = 0.0
+    require_auth: bool = False
+    # when False any issue key exists, as if created on first access
+    strict_issues: bool = False
+    seed: Optional[int] = None
+
+
+@dataclass(slots=True)
+class InjectedResponse:
+    status: int
+    retry_after: Optional[int] = None
+    # a landed response is applied to the store before the error is returned
+    landed: bool = False
+
+
+@dataclass(slots=True)
+class EmulatedIssue:
+    key: str
+    summary: str
+    updated: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    assignee: Optional[str] = None
+    status: str = "In Progress"
+    worklogs: list[dict] = field(default_factory=list)
+
+    def to_json(self, fields: Optional[set[str]] = None) -> dict:
+        values = {
+            "summary": self.summary,
+            "updated": self.updated.strftime(JIRA_DATETIME_FORMAT),
+            "assignee": {"name": self.assignee} if self.assignee else None,
+            "status": {"name": self.status},
+        }
+        if fields:
+            values = {name: value for name, value in values.items() if name in fields}
+        return {"key": self.key, "fields": values}
+
+
+class JiraEmulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send headers and body in one segment, otherwise keep-alive clients stall on delayed acks
+    disable_nagle_algorithm = True
+    wbufsize = -1
+    server: "JiraEmulator"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(
+        self,
+        status: int,
+        body: Optional[dict] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.server.record(self.command, status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _error(self, status: int, message: str, **headers: str) -> None:
+        self._reply(status, {"errorMessages": [message]}, headers)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _handle(self, route) -> None:
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        body = self._read_body() if self.command in ("POST", "PUT") else {}
+        injected = self.server.next_fault(self.headers.get("Authorization"))
+        self.server.delay()
+        if injected is not None and not injected.landed:
+            return self._inject(injected)
+        status, payload = route(url.path, query, body)
+        if injected is not None:
+            return self._inject(injected)
+        self._reply(status, payload)
+
+    def _inject(self, injected: InjectedResponse) -> None:
+        headers = {}
+        if injected.retry_after is not None:
+            headers["Retry-After"] = str(injected.retry_after)
+        self._error(injected.status, "Injected failure", **headers)
+
+    def do_GET(self):
+        self._handle(self.server.get)
+
+    def do_POST(self):
+        self._handle(self.server.post)
+
+    def do_PUT(self):
+        self._handle(self.server.put)
+
+    def do_DELETE(self):
+        self._handle(self.server.delete)
+
+
+class JiraEmulator(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, config: Optional[JiraEmulatorConfig] = None, port: int = 0
+    ) -> None:
+        super().__init__(("127.0.0.1", port), JiraEmulatorHandler)
+        self.config = config or JiraEmulatorConfig()
+        self.random = random.Random(self.config.seed)
+        self.lock = threading.Lock()
+        self.issues: dict[str, EmulatedIssue] = {}
+        self.next_worklog_id = 1
+        self.faults: deque[InjectedResponse] = deque()
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> "JiraEmulator":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def worklogs(self) -> int:
+        with self.lock:
+            return sum(len(issue.worklogs) for issue in self.issues.values())
+
+    def add_issue(
+        self,
+        key: str,
+        summary: Optional[str] = None,
+        updated: Optional[datetime] = None,
+        assignee: Optional[str] = None,
+    ) -> EmulatedIssue:
+        issue = EmulatedIssue(key, summary or key, assignee=assignee)
+        if updated is not None:
+            issue.updated = updated
+        with self.lock:
+            self.issues[key] = issue
+        return issue
+
+    def worklogs_for(self, key: str) -> list[dict]:
+        with self.lock:
+            issue = self.issues.get(key)
+            return list(issue.worklogs) if issue else []
+
+    def inject(
+        self,
+        status: int,
+        count: int = 1,
+        retry_after: Optional[int] = None,
+        landed: bool = False,
+    ) -> None:
+        """Queues responses for the next requests, ahead of the random failure rates
+
+        Args:
+            status (int): The status code to respond with
+            count (int, optional): How many requests get it. Defaults to 1.
+            retry_after (Optional[int], optional): A Retry-After header value. Defaults to None.
+            landed (bool, optional): Apply the request before failing, like a lost response.
+                Defaults to False.
+        """
+        with self.lock:
+            self.faults.extend(
+                InjectedResponse(status, retry_after, landed) for _ in range(count)
+            )
+
+    def record(self, method: str, status: int) -> None:
+        with self.lock:
+            self.requests[(method, status)] += 1
+
+    def delay(self) -> None:
+        config = self.config
+        if config.latency_seconds or config.latency_jitter_seconds:
+            with self.lock:
+                jitter = self.random.uniform(0, config.latency_jitter_seconds)
+            sleep(config.latency_seconds + jitter)
+
+    def next_fault(self, authorization: Optional[str]) -> Optional[InjectedResponse]:
+        config = self.config
+        with self.lock:
+            if self.faults:
+                return self.faults.popleft()
+            if config.require_auth and not authorization:
+                return InjectedResponse(401)
+            roll = self.random.random()
+        for rate, fault in (
+            (config.unauthorized_rate, InjectedResponse(401)),
+            (config.forbidden_rate, InjectedResponse(403)),
+            (
+                config.throttle_rate,
+                InjectedResponse(429, config.retry_after_seconds),
+            ),
+            (config.error_rate, InjectedResponse(503)),
+        ):
+            if roll < rate:
+                return fault
+            roll -= rate
+        return None
+
+    def _issue(self, key: str) -> Optional[EmulatedIssue]:
+        issue = self.issues.get(key)
+        if issue is None and not self.config.strict_issues:
+            issue = self.issues[key] = EmulatedIssue(key, key)
+        return issue
+
+    def get(self, path: str, query: dict, _) -> tuple[int, Optional[dict]]:
+        if path == _SERVER_INFO_PATH:
+            return 200, {"version": "emulator", "serverTime": jira_now()}
+        if path == _SEARCH_PATH:
+            return self.search(query)
+        match = _ISSUE_PATH.match(path)
+        if match is None:
+            return 404, {"errorMessages": ["Not found"]}
+        with self.lock:
+            issue = self._issue(match["key"])
+            if issue is None:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            if not match["worklog"]:
+                fields = set(filter(None, query.get("fields", "").split(",")))
+                return 200, issue.to_json(fields)
+            if match["id"]:
+                for worklog in issue.worklogs:
+                    if worklog["id"] == match["id"]:
+                        return 200, worklog
+                return 404, {"errorMessages": ["Worklog does not exist"]}
+            worklogs = issue.worklogs
+            if "startedAfter" in query:
+                after = int(query["startedAfter"]) / 1000
+                worklogs = [
+                    worklog
+                    for worklog in worklogs
+                    if datetime.strptime(
+                        worklog["started"], JIRA_DATETIME_FORMAT
+                    ).timestamp()
+                    >= after
+                ]
+            start = int(query.get("startAt", 0))
+            limit = min(int(query.get("maxResults", 5000)), 5000)
+            return 200, {
+                "startAt": start,
+                "maxResults": limit,
+                "total": len(worklogs),
+                "worklogs": worklogs[start : start + limit],
+            }
+
+    def post(self, path: str, query: dict, body: dict) -> tuple[int, Optional[dict]]:
+        if path == _SEARCH_PATH:
+            return self.search({**query, **body})
+        match = _ISSUE_PATH.match(path)
+        if match is None or not match["worklog"] or match["id"]:
+            return 404, {"errorMessages": ["Not found"]}
+        if "started" not in body or "timeSpentSeconds" not in body:
+            return 400, {"errorMessages": ["started and timeSpentSeconds are required"]}
+        with self.lock:
+            issue = self._issue(match["key"])
+            if issue is None:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            worklog = {
+                **body,
+                "id": str(self.next_worklog_id),
+                "issueId": issue.key,
+                "updated": jira_now(),
+            }
+            self.next_worklog_id += 1
+            issue.worklogs.append(worklog)
+            issue.updated = datetime.now(timezone.utc)
+        return 201, worklog
+
+    def put(self, path: str, query: dict, body: dict) -> tuple[int, Optional[dict]]:
+        match = _ISSUE_PATH.match(path)
+        if match is None or not match["id"]:
+            return 404, {"errorMessages": ["Not found"]}
+        with self.lock:
+            issue = self._issue(match["key"])
+            for worklog in issue.worklogs if issue else []:
+                if worklog["id"] == match["id"]:
+                    worklog.update(body, updated=jira_now())
+                    return 200, worklog
+        return 404, {"errorMessages": ["Worklog does not exist"]}
+
+    def delete(self, path: str, query: dict, _) -> tuple[int, Optional[dict]]:
+        match = _ISSUE_PATH.match(path)
+        if match is None or not match["id"]:
+            return 404, {"errorMessages": ["Not found"]}
+        with self.lock:
+            issue = self._issue(match["key"])
+            for index, worklog in enumerate(issue.worklogs if issue else []):
+                if worklog["id"] == match["id"]:
+                    del issue.worklogs[index]
+                    return 204, None
+        return 404, {"errorMessages": ["Worklog does not exist"]}
+
+    def search(self, query: dict) -> tuple[int, dict]:
+        """Answers a search with the small subset of JQL the time tracker sends
+
+        Only `key in (...)` and `updated >= / > "yyyy-MM-dd HH:mm"` clauses filter the issues,
+        anything else in the query matches every issue. Results are ordered by updated.
+        """
+        jql = query.get("jql", "")
+        start = int(query.get("startAt", 0))
+        limit = min(int(query.get("maxResults", 50)), MAX_RESULTS)
+        fields = query.get("fields", "")
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        fields = set(filter(None, fields))
+        with self.lock:
+            issues = list(self.issues.values())
+        keys = _KEY_IN_CLAUSE.search(jql)
+        if keys:
+            wanted = {key.strip(" \"'") for key in keys["keys"].split(",")}
+            issues = [issue for issue in issues if issue.key in wanted]
+        updated = _UPDATED_CLAUSE.search(jql)
+        if updated:
+            value = updated["value"].replace("/", "-")
+            after = datetime.strptime(
+                value, "%Y-%m-%d %H:%M" if " " in value else "%Y-%m-%d"
+            ).astimezone(timezone.utc)
+            issues = [
+                issue
+                for issue in issues
+                if issue.updated > after
+                or (updated["op"] == ">=" and issue.updated == after)
+            ]
+        issues.sort(key=lambda issue: (issue.updated, issue.key))
+        return 200, {
+            "startAt": start,
+            "maxResults": limit,
+            "total": len(issues),
+            "issues": [
+                issue.to_json(fields) for issue in issues[start : start + limit]
+            ],
+        }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.integrations.stubs.jira",
+        description="Serve a local Jira emulator",
+    )
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--issues", type=int, default=0, help="Issues to create")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--forbidden-rate", type=float, default=0.0)
+    parser.add_argument("--require-auth", action="store_true")
+    args = parser.parse_args(argv)
+    emulator = JiraEmulator(
+        JiraEmulatorConfig(
+            latency_seconds=args.latency,
+            latency_jitter_seconds=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            unauthorized_rate=args.unauthorized_rate,
+            forbidden_rate=args.forbidden_rate,
+            require_auth=args.require_auth,
+            strict_issues=args.issues > 0,
+        ),
+        args.port,
+    )
+    for number in range(args.issues):
+        emulator.add_issue(f"EMU-{number + 1}", f"Emulated issue {number + 1}")
+    print(f"Jira emulator listening on {emulator.base_url}")
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Local receiver for the webhook sink
+
+Accepts batches posted by WebhookTimeEntryService, gzipped or not, and keeps them in memory. A
+batch delivered again under the same Idempotency-Key is acknowledged without being stored twice.
+Error statuses can be queued up for the next requests to exercise the sink's retries.
+
+Usage:
+    python -m time_tracker.integrations.stubs.webhook --port 8090 [--token TOKEN]
+"""
+
+import gzip
+import json
+import threading
+from argparse import ArgumentParser
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from time_tracker.models.webhook import WEBHOOK_BATCH_HEADER
+
+WEBHOOK_PATH = "/webhook"
+
+
+class WebhookReceiverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "WebhookReceiver"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(status)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        fault = self.server.next_fault()
+        if fault is not None:
+            return self._reply(fault, {"error": "injected"})
+        if self.path != WEBHOOK_PATH:
+            return self._reply(404, {"error": "Not found"})
+        if self.server.token and self.headers.get("Authorization") != (
+            f"Bearer {self.server.token}"
+        ):
+            return self._reply(401, {"error": "A valid token is required"})
+        try:
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            batch = json.loads(body)
+            entries = batch["entries"]
+        except (OSError, KeyError, TypeError, ValueError) as e:
+            return self._reply(400, {"error": f"Invalid batch: {e}"})
+        stored = self.server.store(self.headers.get(WEBHOOK_BATCH_HEADER), batch)
+        self._reply(200, {"received": len(entries), "duplicate": not stored})
+
+
+class WebhookReceiver(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, token: Optional[str] = None) -> None:
+        super().__init__(("127.0.0.1", port), WebhookReceiverHandler)
+        self.token = token
+        self.lock = threading.Lock()
+        self.batches: list[dict] = []
+        self.batch_ids: set[str] = set()
+        self.faults: deque[int] = deque()
+        self.requests: Counter[int] = Counter()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{WEBHOOK_PATH}"
+
+    def __enter__(self) -> "WebhookReceiver":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def entries(self) -> list[dict]:
+        with self.lock:
+            return [entry for batch in self.batches for entry in batch["entries"]]
+
+    def inject(self, *statuses: int) -> None:
+        """Answers the next requests with these statuses, in order"""
+        with self.lock:
+            self.faults.extend(statuses)
+
+    def next_fault(self) -> Optional[int]:
+        with self.lock:
+            return self.faults.popleft() if self.faults else None
+
+    def record(self, status: int) -> None:
+        with self.lock:
+            self.requests[status] += 1
+
+    def store(self, batch_id: Optional[str], batch: dict) -> bool:
+        with self.lock:
+            if batch_id is not None:
+                if batch_id in self.batch_ids:
+                    return False
+                self.batch_ids.add(batch_id)
+            self.batches.append(batch)
+            return True
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog="python -m time_tracker.integrations.stubs.webhook",
+        description="Serve a local webhook receiver that prints what it gets",
+    )
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--token")
+    args = parser.parse_args(argv)
+    receiver = WebhookReceiver(args.port, args.token)
+    print(f"Webhook receiver listening on {receiver.url}")
+    seen = 0
+    try:
+        with receiver:
+            while True:
+                receiver.thread.join(1)
+                with receiver.lock:
+                    batches = receiver.batches[seen:]
+                    seen = len(receiver.batches)
+                for batch in batches:
+                    print(
+                        f"{batch.get('source')}: {len(batch['entries'])} entries "
+                        + f"({batch.get('batch_id')})"
+                    )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
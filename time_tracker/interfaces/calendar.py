@@ -0,0 +1,114 @@
+from abc import ABCMeta, abstractmethod
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from time_tracker.models.calendar import WorkInterval
+
+
+class IWorkCalendar(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IWorkCalendar"):
+        return (
+            (hasattr(subclass, "interval_at") and callable(subclass.interval_at))
+            and (
+                hasattr(subclass, "intervals_between")
+                and callable(subclass.intervals_between)
+            )
+            and (
+                hasattr(subclass, "slots_between") and callable(subclass.slots_between)
+            )
+            and (
+                hasattr(subclass, "slots_ending_between")
+                and callable(subclass.slots_ending_between)
+            )
+            and (
+                hasattr(subclass, "expected_time") and callable(subclass.expected_time)
+            )
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def interval_at(self, moment: datetime) -> Optional[WorkInterval]:
+        """Returns the working interval containing a moment
+
+        Args:
+            moment (datetime): The moment to look up
+
+        Returns:
+            Optional[WorkInterval]: The working interval, or None outside working hours
+        """
+        raise NotImplementedError(self.interval_at)
+
+    @abstractmethod
+    def intervals_between(self, start: datetime, end: datetime) -> list[WorkInterval]:
+        """Returns the working intervals overlapping a range, clipped to the range
+
+        Args:
+            start (datetime): The start of the range
+            end (datetime): The end of the range
+
+        Returns:
+            list[WorkInterval]: The clipped working intervals in order
+        """
+        raise NotImplementedError(self.intervals_between)
+
+    @abstractmethod
+    def slots_between(self, start: datetime, end: datetime) -> list[WorkInterval]:
+        """Returns the prompt slots that start within a range
+
+        Args:
+            start (datetime): The inclusive start of the range
+            end (datetime): The exclusive end of the range
+
+        Returns:
+            list[WorkInterval]: The prompt slots in order
+        """
+        raise NotImplementedError(self.slots_between)
+
+    @abstractmethod
+    def slots_ending_between(
+        self, start: datetime, end: datetime
+    ) -> list[WorkInterval]:
+        """Returns the prompt slots that end within (start, end], the first one clipped to start
+
+        Args:
+            start (datetime): The exclusive start of the range
+            end (datetime): The inclusive end of the range
+
+        Returns:
+            list[WorkInterval]: The due slots in order
+        """
+        raise NotImplementedError(self.slots_ending_between)
+
+    @abstractmethod
+    def expected_time(self, start: datetime, end: datetime) -> timedelta:
+        """Returns the amount of working time within a range
+
+        Args:
+            start (datetime): The start of the range
+            end (datetime): The end of the range
+
+        Returns:
+            timedelta: The expected working time
+        """
+        raise NotImplementedError(self.expected_time)
+
+
+class IWorkCalendarProvider(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IWorkCalendarProvider"):
+        return (
+            hasattr(subclass, "get_calendar") and callable(subclass.get_calendar)
+        ) or NotImplemented
+
+    @abstractmethod
+    def get_calendar(self, day: Optional[date] = None) -> IWorkCalendar:
+        """Returns a calendar covering a day, built from the current settings
+
+        Args:
+            day (Optional[date], optional): A day the calendar must cover. Defaults to today.
+
+        Returns:
+            IWorkCalendar: The work calendar
+        """
+        raise NotImplementedError(self.get_calendar)
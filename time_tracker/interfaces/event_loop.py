@@ -0,0 +1,59 @@
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import Future
+from typing import Any, Awaitable
+
+import PySimpleGUI as sg
+
+
+class IEventLoopProvider(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IEventLoopProvider"):
+        return (
+            (hasattr(subclass, "submit") and callable(subclass.submit))
+            and (
+                hasattr(subclass, "submit_to_window")
+                and callable(subclass.submit_to_window)
+            )
+            and (hasattr(subclass, "stop") and callable(subclass.stop))
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def submit(self, awaitable: Awaitable) -> Future:
+        """Schedules a coroutine on the background event loop
+
+        Args:
+            awaitable (Awaitable): The coroutine to run
+
+        Returns:
+            Future: Resolves with the coroutine's result, safe to wait on from any thread
+        """
+        raise NotImplementedError(self.submit)
+
+    @abstractmethod
+    def submit_to_window(
+        self, window: sg.Window, event: Any, awaitable: Awaitable
+    ) -> Future:
+        """Schedules a coroutine and posts its result to a window as an event
+
+        The window receives event with the result, or the exception if it failed, as its value,
+        so the GUI thread never waits on the coroutine.
+
+        Args:
+            window (sg.Window): The window to notify
+            event (Any): The event key to post
+            awaitable (Awaitable): The coroutine to run
+
+        Returns:
+            Future: Resolves with the coroutine's result
+        """
+        raise NotImplementedError(self.submit_to_window)
+
+    @abstractmethod
+    def stop(self, timeout: float = 30) -> None:
+        """Waits for the scheduled coroutines to finish, then stops the event loop
+
+        Args:
+            timeout (float, optional): Seconds to wait for pending work. Defaults to 30.
+        """
+        raise NotImplementedError(self.stop)
@@ -1,9 +1,13 @@
+import asyncio
 from abc import ABCMeta, abstractmethod
+from typing import Iterable
 
 
 from time_tracker.models.issue import (
     Issue,
     IssueList,
+    IssueMetadata,
+    IssueSyncResult,
 )
 
 
@@ -107,6 +111,133 @@ class IIssueService(metaclass=ABCMeta):
         raise NotImplementedError(self.new_issue)
 
 
+class IAsyncIssueService(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IAsyncIssueService"):
+        return (
+            (
+                hasattr(subclass, "load_active_issues_async")
+                and callable(subclass.load_active_issues_async)
+            )
+            and (
+                hasattr(subclass, "load_deleted_issues_async")
+                and callable(subclass.load_deleted_issues_async)
+            )
+            and (
+                hasattr(subclass, "save_all_lists_async")
+                and callable(subclass.save_all_lists_async)
+            )
+            or NotImplemented
+        )
+
+    @abstractmethod
+    async def load_active_issues_async(self) -> IssueList:
+        """Loads and returns the active issue list without blocking the event loop
+
+        Returns:
+            IssueList: the active issue list
+        """
+        raise NotImplementedError(self.load_active_issues_async)
+
+    @abstractmethod
+    async def load_deleted_issues_async(self) -> IssueList:
+        """Loads and returns the deleted issue list without blocking the event loop
+
+        Returns:
+            IssueList: the deleted issue list
+        """
+        raise NotImplementedError(self.load_deleted_issues_async)
+
+    async def load_lists_async(self) -> tuple[IssueList, IssueList]:
+        """Loads the active and deleted issue lists concurrently
+
+        Returns:
+            tuple[IssueList, IssueList]: The active and deleted issue lists respectively
+        """
+        return tuple(
+            await asyncio.gather(
+                self.load_active_issues_async(), self.load_deleted_issues_async()
+            )
+        )
+
+    @abstractmethod
+    async def save_all_lists_async(
+        self, active_list: IssueList, deleted_list: IssueList
+    ) -> None:
+        """Save both the active and deleted issue lists without blocking the event loop
+
+        Args:
+            active_list (IssueList): The list of active issues
+            deleted_list (IssueList): The list of deleted issues
+
+        """
+        raise NotImplementedError(self.save_all_lists_async)
+
+
+class IIssueSyncService(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IIssueSyncService"):
+        return (
+            (hasattr(subclass, "sync_issues") and callable(subclass.sync_issues))
+            and (hasattr(subclass, "set_auth") and callable(subclass.set_auth))
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def sync_issues(self, full: bool = False) -> IssueSyncResult:
+        """Pulls issues from a remote tracker into the active issue list
+
+        Args:
+            full (bool, optional): Fetch every matching issue instead of only the ones changed
+                since the last sync. Defaults to False.
+
+        Returns:
+            IssueSyncResult: The number of issues fetched, added and updated
+        """
+        raise NotImplementedError(self.sync_issues)
+
+    @abstractmethod
+    def set_auth(self, user_name: str, password: str) -> None:
+        """Sets the credentials used for the remote tracker
+
+        Args:
+            user_name (str): The username
+            password (str): The password
+        """
+        raise NotImplementedError(self.set_auth)
+
+
+class IIssueMetadataCache(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IIssueMetadataCache"):
+        return (
+            (hasattr(subclass, "get_many") and callable(subclass.get_many))
+            and (hasattr(subclass, "put_many") and callable(subclass.put_many))
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def get_many(self, issue_numbers: Iterable[str]) -> dict[str, IssueMetadata]:
+        """Looks up cached metadata without touching the network
+
+        Args:
+            issue_numbers (Iterable[str]): The issues to look up
+
+        Returns:
+            dict[str, IssueMetadata]: The metadata of the issues that are cached
+        """
+        raise NotImplementedError(self.get_many)
+
+    @abstractmethod
+    def put_many(self, metadata: Iterable[IssueMetadata]) -> None:
+        """Stores fetched metadata, replacing what was cached for those issues
+
+        Args:
+            metadata (Iterable[IssueMetadata]): The fetched metadata
+        """
+        raise NotImplementedError(self.put_many)
+
+
 class IIssueServiceFactory(metaclass=ABCMeta):
     @classmethod
     def __subclasshook__(cls, subclass):
@@ -116,5 +247,5 @@ class IIssueServiceFactory(metaclass=ABCMeta):
         ) or NotImplemented
 
     @abstractmethod
-    def make_issue_service(self) -> IIssueService:
+    def make_issue_service(self, prompt: bool = True) -> IIssueService:
         raise NotImplementedError(self.make_issue_service)
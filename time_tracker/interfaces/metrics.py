@@ -0,0 +1,72 @@
+from abc import ABCMeta, abstractmethod
+from typing import Callable, ContextManager
+
+
+class IMetricsProvider(metaclass=ABCMeta):
+    enabled: bool
+
+    @classmethod
+    def __subclasshook__(cls, subclass: "IMetricsProvider"):
+        return (
+            (hasattr(subclass, "timer") and callable(subclass.timer))
+            and (hasattr(subclass, "timed") and callable(subclass.timed))
+            and (hasattr(subclass, "increment") and callable(subclass.increment))
+            and (hasattr(subclass, "observe") and callable(subclass.observe))
+            and (hasattr(subclass, "export") and callable(subclass.export))
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def timer(self, name: str, **labels: str) -> ContextManager:
+        """Returns a context manager that records the duration of its block
+
+        Args:
+            name (str): The name of the histogram, e.g. issue_service.load_list
+            **labels (str): Labels to distinguish series of the same histogram
+
+        Returns:
+            ContextManager: The timing context
+        """
+        raise NotImplementedError(self.timer)
+
+    @abstractmethod
+    def timed(self, name: str, **labels: str) -> Callable[[Callable], Callable]:
+        """Decorator that records the duration of every call to the decorated function
+
+        Args:
+            name (str): The name of the histogram
+            **labels (str): Labels to distinguish series of the same histogram
+
+        Returns:
+            Callable[[Callable], Callable]: The decorator
+        """
+        raise NotImplementedError(self.timed)
+
+    @abstractmethod
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        """Increments a counter
+
+        Args:
+            name (str): The name of the counter
+            amount (int, optional): The amount to add. Defaults to 1.
+            **labels (str): Labels to distinguish series of the same counter
+
+        """
+        raise NotImplementedError(self.increment)
+
+    @abstractmethod
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records a value in a histogram
+
+        Args:
+            name (str): The name of the histogram
+            value (float): The value to record, in seconds for timings
+            **labels (str): Labels to distinguish series of the same histogram
+
+        """
+        raise NotImplementedError(self.observe)
+
+    @abstractmethod
+    def export(self) -> None:
+        """Writes the current metrics to the Prometheus text file and the JSON snapshot file"""
+        raise NotImplementedError(self.export)
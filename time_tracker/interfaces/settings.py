@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from typing import Callable, Optional
 
 from time_tracker.models.settings import Settings
 
@@ -7,9 +8,41 @@ class ISettingsProvider(metaclass=ABCMeta):
     @classmethod
     def __subclasshook__(cls, subclass: "ISettingsProvider"):
         return (
-            hasattr(subclass, "get_settings") and callable(subclass.get_settings)
-        ) or NotImplemented
+            (hasattr(subclass, "get_settings") and callable(subclass.get_settings))
+            and (
+                hasattr(subclass, "save_settings") and callable(subclass.save_settings)
+            )
+            and (hasattr(subclass, "subscribe") and callable(subclass.subscribe))
+            or NotImplemented
+        )
 
     @abstractmethod
     def get_settings(self) -> Settings:
+        """Returns the current settings, only reloading them when the settings file has changed
+
+        Returns:
+            Settings: The current settings
+        """
         raise NotImplementedError(self.get_settings)
+
+    @abstractmethod
+    def save_settings(self, settings: Settings) -> Optional[Settings]:
+        """Saves the settings and notifies subscribers if they changed
+
+        Args:
+            settings (Settings): The new settings
+
+        Returns:
+            Optional[Settings]: The saved settings, or None if they could not be saved
+        """
+        raise NotImplementedError(self.save_settings)
+
+    @abstractmethod
+    def subscribe(self, callback: Callable[[Settings], None]) -> None:
+        """Registers a callback that receives the new settings whenever they change
+
+        Args:
+            callback (Callable[[Settings], None]): The callback to register
+
+        """
+        raise NotImplementedError(self.subscribe)
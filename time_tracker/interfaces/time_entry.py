@@ -1,5 +1,9 @@
+import asyncio
 from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
 
+from time_tracker.models.issue import Issue
 from time_tracker.models.time_entry import TimeEntry, TimeEntryResponse
 
 
@@ -60,6 +64,127 @@ class ITimeEntryService(metaclass=ABCMeta):
         """
         raise NotImplementedError(self.log_work)
 
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        """Creates work entry logs for several entries at once
+
+        Services that can submit a batch more cheaply than one entry at a time override this.
+
+        Args:
+            time_entries (Iterable[TimeEntry]): The entries to be logged
+
+        Returns:
+            list[TimeEntryResponse]: The result of logging each entry, in order
+        """
+        return [self.log_work(time_entry) for time_entry in time_entries]
+
+
+class IAsyncTimeEntryService(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IAsyncTimeEntryService"):
+        return (
+            hasattr(subclass, "log_work_async") and callable(subclass.log_work_async)
+        ) or NotImplemented
+
+    @abstractmethod
+    async def log_work_async(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        """Creates a work entry log in a time entry system without blocking the event loop
+
+        Args:
+            time_entry (TimeEntry): The entry to be logged
+
+        Returns:
+            TimeEntryResponse: The results of the logging call
+        """
+        raise NotImplementedError(self.log_work_async)
+
+    async def log_work_batch_async(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        """Creates work entry logs for several entries at once, concurrently by default
+
+        Args:
+            time_entries (Iterable[TimeEntry]): The entries to be logged
+
+        Returns:
+            list[TimeEntryResponse]: The result of logging each entry, in order
+        """
+        return list(
+            await asyncio.gather(
+                *(self.log_work_async(time_entry) for time_entry in time_entries)
+            )
+        )
+
+
+class IExtendableTimeEntryService(ITimeEntryService):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IExtendableTimeEntryService"):
+        return (
+            (hasattr(subclass, "log_work") and callable(subclass.log_work))
+            and (hasattr(subclass, "extend_work") and callable(subclass.extend_work))
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def extend_work(self, previous: TimeEntry, entry: TimeEntry) -> TimeEntryResponse:
+        """Replaces a previously logged entry with one that covers and extends it
+
+        Args:
+            previous (TimeEntry): The entry that was logged before
+            entry (TimeEntry): The merged entry replacing it
+
+        Returns:
+            TimeEntryResponse: The results of the update, unsuccessful if previous could not be found
+        """
+        raise NotImplementedError(self.extend_work)
+
+
+class IMonitoredTimeEntryService(ITimeEntryService):
+    @classmethod
+    def __subclasshook__(cls, subclass: "IMonitoredTimeEntryService"):
+        return (
+            (hasattr(subclass, "log_work") and callable(subclass.log_work))
+            and (hasattr(subclass, "status_text") and callable(subclass.status_text))
+            or NotImplemented
+        )
+
+    @abstractmethod
+    def status_text(self) -> Optional[str]:
+        """Describes the health of the service for display in the menu
+
+        Returns:
+            Optional[str]: A short status line, or None if there is nothing to report
+        """
+        raise NotImplementedError(self.status_text)
+
+
+class ITimeEntryQueryService(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "ITimeEntryQueryService"):
+        return (
+            hasattr(subclass, "iter_entries") and callable(subclass.iter_entries)
+        ) or NotImplemented
+
+    @abstractmethod
+    def iter_entries(
+        self,
+        start: datetime,
+        end: datetime,
+        issue: Optional[Issue | str] = None,
+    ) -> Iterator[TimeEntry]:
+        """Lazily yields the recorded entries that start within a range
+
+        Args:
+            start (datetime): The inclusive start of the range
+            end (datetime): The exclusive end of the range
+            issue (Optional[Issue | str], optional): Only yield entries for this issue. Defaults to None.
+
+        Yields:
+            TimeEntry: The matching entries, ordered by day
+        """
+        raise NotImplementedError(self.iter_entries)
+
 
 class ITimeEntryServiceFactory:
     @classmethod
@@ -1,6 +1,7 @@
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
 from typing import Any, Optional
+from time_tracker.models.calendar import WorkInterval
 from time_tracker.models.prompts import PromptEvents
 from time_tracker.models.time_entry import TimeEntry, TimeEntryEvents
 
@@ -60,6 +61,24 @@ class ITimeEntryView(metaclass=ABCMeta):
         raise NotImplementedError(self.run)
 
 
+class ICatchUpView(metaclass=ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: "ICatchUpView"):
+        return (hasattr(subclass, "run") and callable(subclass.run)) or NotImplemented
+
+    @abstractmethod
+    def run(self, slots: list[WorkInterval]) -> tuple[TimeEntryEvents, list[TimeEntry]]:
+        """Display a single view that captures entries for several missed slots
+
+        Args:
+            slots (list[WorkInterval]): The missed slots, in order
+
+        Returns:
+            tuple[TimeEntryEvents, list[TimeEntry]]: The user event and the entries for the slots that were filled in
+        """
+        raise NotImplementedError(self.run)
+
+
 class IViewFactory(metaclass=ABCMeta):
     @classmethod
     def __subclasshook__(cls, subclass: "IViewFactory"):
@@ -87,6 +106,15 @@ class IViewFactory(metaclass=ABCMeta):
     def make_time_entry_view(self) -> ITimeEntryView:
         raise NotImplementedError(self.make_time_entry_view)
 
+    @abstractmethod
+    def make_catch_up_view(self) -> ICatchUpView:
+        """Initializes a view for filling in several missed slots at once
+
+        Returns:
+            ICatchUpView: the initialized view
+        """
+        raise NotImplementedError(self.make_catch_up_view)
+
     @abstractmethod
     def make_new_issue_view(self) -> IView:
         """Initializes a view for capturing issue information
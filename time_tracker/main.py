@@ -1,6 +1,7 @@
 from time_tracker.constants import CLOSE_EVENTS
 
 from time_tracker.factories.dependencies import DependencyFactory
+from time_tracker.providers.metrics import METRICS
 
 view_factory, log_provider = DependencyFactory.make_dependencies()
 log = log_provider.get_logger("Main")
@@ -9,6 +10,8 @@ running = True
 
 while running:
     menu_view = view_factory.make_menu_view()
-    event = menu_view.run(close=True)
+    event = menu_view.run()
     log.info(f"Event: %s received!", event)
     running = event not in CLOSE_EVENTS
+
+METRICS.stop()
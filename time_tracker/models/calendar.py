@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.settings import WORKING_DIR
+
+HOLIDAYS_FILE: Path = WORKING_DIR.joinpath("holidays.json")
+
+
+@dataclass(slots=True, frozen=True)
+class WorkInterval(DataClassJsonMixin):
+    start: datetime
+    end: datetime
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+    def __contains__(self, moment: datetime) -> bool:
+        return self.start <= moment < self.end
+
+
+@dataclass(slots=True, frozen=True)
+class Holiday(DataClassJsonMixin):
+    day: date
+    name: str = ""
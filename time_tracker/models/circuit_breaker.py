@@ -0,0 +1,12 @@
+from pathlib import Path
+
+from time_tracker.models.enums import StringEnum
+from time_tracker.models.settings import WORKING_DIR
+
+JIRA_QUEUE_FILE: Path = WORKING_DIR.joinpath("jiraQueue.jsonl")
+
+
+class CircuitState(StringEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half open"
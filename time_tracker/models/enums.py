@@ -1,11 +1,15 @@
 from enum import Enum
+from typing import Optional
 
 
 class StringEnum(Enum):
-    def __eq__(self, other: "StringEnum" | None) -> bool:
+    def __eq__(self, other: Optional["StringEnum"]) -> bool:
         if other is None:
             return self.value is None
-        return str(self.value) == str(other.value)
+        return str(self.value) == str(other)
+
+    def __hash__(self):
+        return hash(str(self.value))
 
     def __repr__(self):
         return str(self.value)
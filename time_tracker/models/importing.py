@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.enums import StringEnum
+
+# rows handed to a worker at a time
+IMPORT_CHUNK_ROWS = 50_000
+# parsed entries held before the days they belong to are written, bounding an import's memory
+IMPORT_FLUSH_ENTRIES = 50_000
+# rejected rows reported by line, the rest are only counted
+IMPORT_MAX_ERRORS = 20
+
+
+class ImportFormat(StringEnum):
+    CSV = "csv"
+    JSON = "json"
+    JSON_LINES = "jsonl"
+
+
+class ImportStage(StringEnum):
+    PARSING = "parsing"
+    WRITING = "writing"
+
+
+@dataclass(slots=True)
+class ImportProgress:
+    stage: ImportStage
+    done: int
+    # unknown while parsing, rows are counted as they're read
+    total: Optional[int] = None
+
+
+@dataclass(slots=True)
+class ImportMapping(DataClassJsonMixin):
+    """Which columns of an export hold the parts of an entry
+
+    Times are ISO 8601 unless time_format is given, or timestamps. When the day is in a separate
+    column from the time, it's named by start_date and end_date. Without an end column the end
+    is the start plus the duration, given as H:MM[:SS] or as decimal hours.
+    """
+
+    issue: str = "issue"
+    start: str = "start"
+    end: Optional[str] = "end"
+    description: Optional[str] = "description"
+    comment: Optional[str] = "comment"
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    duration: Optional[str] = None
+    time_format: Optional[str] = None
+
+
+IMPORT_PRESETS: dict[str, ImportMapping] = {
+    "default": ImportMapping(),
+    # entries exported from this tracker, e.g. a day log's entries
+    "tracker": ImportMapping(start="from_time", end="to_time"),
+    "toggl": ImportMapping(
+        issue="Description",
+        description="Project",
+        comment="Tags",
+        start="Start time",
+        start_date="Start date",
+        end="End time",
+        end_date="End date",
+    ),
+    "clockify": ImportMapping(
+        issue="Description",
+        description="Project",
+        comment="Tags",
+        start="Start Time",
+        start_date="Start Date",
+        end="End Time",
+        end_date="End Date",
+        time_format="%m/%d/%Y %I:%M %p",
+    ),
+}
+
+
+@dataclass(slots=True)
+class ParsedChunk:
+    """The entries parsed from one chunk of rows, encoded as by TimeEntry.to_dict"""
+
+    # entries by the ordinal of their day
+    days: dict[int, list[dict]] = field(default_factory=dict)
+    # issue number to description
+    issues: dict[str, str] = field(default_factory=dict)
+    rows: int = 0
+    # rows repeating an entry earlier in the chunk
+    duplicates: int = 0
+    rejected: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ImportResult(DataClassJsonMixin):
+    rows: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    days: int = 0
+    issues_added: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def __str__(self):
+        return (
+            f"{self.rows} rows: {self.imported} entries imported into {self.days} days, "
+            + f"{self.duplicates} duplicates, {self.rejected} rejected, "
+            + f"{self.issues_added} issues added"
+        )
@@ -1,15 +1,16 @@
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Optional
 
-from dataclasses_json import DataClassJsonMixin
+from dataclasses_json import DataClassJsonMixin, config
 
 from time_tracker.models.enums import StringEnum
 from time_tracker.models.settings import WORKING_DIR
 
 ACTIVE_ISSUES_FILE: Path = WORKING_DIR.joinpath("issues.json")
 DELETED_ISSUES_FILE: Path = WORKING_DIR.joinpath("deletedIssues.json")
+ISSUE_METADATA_FILE: Path = WORKING_DIR.joinpath("issueMetadata.sqlite3")
 
 
 class NewIssueViewKeys(StringEnum):
@@ -25,17 +26,48 @@ class NewIssueViewEvents(StringEnum):
     SAVE = "-SAVE-"
 
 
+# rows handed to an issue listbox at a time
+ISSUE_PAGE_SIZE = 100
+
+
 class IssueManagementViewKeys(StringEnum):
     ACTIVE_ISSUES = "ActiveIssues"
+    ACTIVE_PAGE = "ActivePage"
     DELETED_ISSUES = "DeletedIssues"
+    DELETED_PAGE = "DeletedPage"
+    SYNC_RESULT = "SyncResult"
 
 
 class IssueManagementViewEvents(StringEnum):
+    ACTIVE_FILTER = "-ACTIVE_FILTER-"
+    ACTIVE_NEXT = "-ACTIVE_NEXT-"
+    ACTIVE_PREVIOUS = "-ACTIVE_PREVIOUS-"
     CANCEL = "-CANCEL-"
     DELETE = "-DELETE-"
+    DELETED_FILTER = "-DELETED_FILTER-"
+    DELETED_NEXT = "-DELETED_NEXT-"
+    DELETED_PREVIOUS = "-DELETED_PREVIOUS-"
     NEW = "-NEW-"
     RESTORE = "-RESTORE-"
     SAVE = "-SAVE-"
+    SYNC = "-SYNC-"
+    SYNC_DONE = "-SYNC_DONE-"
+
+
+def decode_datetime(value: Optional[float | str]) -> datetime:
+    """Decodes a datetime the way dataclasses_json does, as an aware local time
+
+    Args:
+        value (Optional[float | str]): A timestamp or an ISO format string
+
+    Returns:
+        datetime: The decoded datetime, or now if the value is missing
+    """
+    if value is None:
+        return datetime.now()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value, timezone.utc).astimezone()
 
 
 @dataclass(slots=True)
@@ -66,20 +98,95 @@ class Issue(DataClassJsonMixin):
         return self.issue_number <= issue.issue_number
 
 
+@dataclass(slots=True)
+class IssueListSnapshot:
+    """What an issue list file held when it was read, used to merge concurrent saves"""
+
+    version: tuple[int, int, int]
+    descriptions: dict[str, str] = field(default_factory=dict)
+
+
 @dataclass(slots=True)
 class IssueList(DataClassJsonMixin):
-    filepath: Path
+    """A list of issues saved to one file
+
+    The issue numbers added, removed or edited since the list was last read or saved are kept in
+    changed, so saving a list that wasn't modified can be skipped. Edits made to an issue in
+    place must be recorded with touch. Reordering doesn't mark the list as changed.
+    """
+
+    filepath: Path = field(metadata=config(encoder=str, decoder=Path))
     issues: list[Issue] = field(default_factory=list)
     updated: datetime = field(default_factory=datetime.now)
+    snapshot: Optional[IssueListSnapshot] = field(
+        default=None,
+        init=False,
+        compare=False,
+        repr=False,
+        metadata=config(exclude=lambda _: True),
+    )
+    changed: set[str] = field(
+        default_factory=set,
+        init=False,
+        compare=False,
+        repr=False,
+        metadata=config(exclude=lambda _: True),
+    )
+
+    @classmethod
+    def from_dict(cls, kvs: dict, *, infer_missing=False) -> "IssueList":
+        # decoding field by field through dataclasses_json takes seconds for large catalogues
+        issue_list = cls(
+            Path(kvs["filepath"]) if kvs.get("filepath") is not None else None,
+            [
+                Issue(
+                    issue["issue_number"],
+                    issue["description"],
+                    decode_datetime(issue.get("created")),
+                )
+                for issue in kvs.get("issues") or []
+            ],
+            decode_datetime(kvs.get("updated")),
+        )
+        return issue_list
+
+    def to_dict(self, encode_json=False) -> dict:
+        return {
+            "filepath": str(self.filepath),
+            "issues": [
+                {
+                    "issue_number": issue.issue_number,
+                    "description": issue.description,
+                    "created": issue.created.timestamp(),
+                }
+                for issue in self.issues
+            ],
+            "updated": self.updated.timestamp(),
+        }
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.changed)
+
+    def touch(self, issue: Issue) -> None:
+        self.changed.add(issue.issue_number)
+        self.updated = datetime.now()
+
+    def mark_clean(self) -> None:
+        self.changed.clear()
 
     def append(self, issue: Issue) -> None:
         self.issues.append(issue)
-        self.updated = datetime.now()
+        self.touch(issue)
 
     def copy(self):
-        return IssueList(self.filepath, self.issues.copy(), self.updated)
+        issue_list = IssueList(self.filepath, self.issues.copy(), self.updated)
+        issue_list.snapshot = self.snapshot
+        issue_list.changed = self.changed.copy()
+        return issue_list
 
     def clear(self):
+        self.changed.update(issue.issue_number for issue in self.issues)
         self.issues.clear()
         self.updated = datetime.now()
 
@@ -87,7 +194,9 @@ class IssueList(DataClassJsonMixin):
         return self.issues.count(issue)
 
     def extend(self, issues: Iterable[Issue]):
-        self.issues.extend(issues)
+        for issue in issues:
+            self.issues.append(issue)
+            self.changed.add(issue.issue_number)
         self.updated = datetime.now()
 
     def index(self, issue: Issue) -> int:
@@ -95,14 +204,16 @@ class IssueList(DataClassJsonMixin):
 
     def insert(self, index: int, issue: Issue):
         self.issues.insert(index, issue)
-        self.updated = datetime.now()
+        self.touch(issue)
 
-    def pop(self, index: int = None) -> Issue:
-        return self.issues.pop(index)
+    def pop(self, index: int = -1) -> Issue:
+        issue = self.issues.pop(index)
+        self.touch(issue)
+        return issue
 
     def remove(self, issue: Issue):
         self.issues.remove(issue)
-        self.updated = datetime.now()
+        self.touch(issue)
 
     def reverse(self):
         self.issues.reverse()
@@ -113,3 +224,50 @@ class IssueList(DataClassJsonMixin):
         reverse: bool = False,
     ):
         self.issues.sort(key=key, reverse=reverse)
+
+
+@dataclass(slots=True)
+class IssueSyncResult(DataClassJsonMixin):
+    success: bool = True
+    fetched: int = 0
+    added: int = 0
+    updated: int = 0
+    message: Optional[str] = None
+    needs_auth: bool = False
+
+    def __str__(self):
+        if not self.success:
+            return self.message or "Sync failed"
+        return (
+            f"Synced {self.fetched} issues: {self.added} added, {self.updated} updated"
+        )
+
+
+@dataclass(slots=True)
+class IssueMetadata(DataClassJsonMixin):
+    """What the remote tracker says about an issue, as last fetched"""
+
+    issue_number: str
+    summary: Optional[str] = None
+    status: Optional[str] = None
+    assignee: Optional[str] = None
+    updated: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class IssueChoice:
+    """An issue offered in a picker, shown with its cached metadata when there is any"""
+
+    issue: Issue
+    metadata: Optional[IssueMetadata] = None
+
+    def __str__(self):
+        if self.metadata is None:
+            return str(self.issue)
+        text = f"{self.issue.issue_number} - {self.metadata.summary or self.issue.description}"
+        details = ", ".join(
+            detail
+            for detail in (self.metadata.status, self.metadata.assignee)
+            if detail
+        )
+        return f"{text} [{details}]" if details else text
@@ -4,6 +4,10 @@ from time_tracker.models.enums import StringEnum
 BUTTON_SIZE: tuple[int, int] = (35, 1)
 
 
+class MenuViewKeys(StringEnum):
+    STATUS = "-STATUS-"
+
+
 class MenuViewEvents(StringEnum):
     RECORD = "-RECORD-"
     MANAGE = "-MANAGE-"
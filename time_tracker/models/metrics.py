@@ -0,0 +1,69 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from time_tracker.models.settings import WORKING_DIR
+
+METRICS_FILE: Path = WORKING_DIR.joinpath("metrics.prom")
+METRICS_SNAPSHOT_FILE: Path = WORKING_DIR.joinpath("metrics.json")
+METRICS_PREFIX = "time_tracker"
+
+# upper bounds in seconds, from sub-millisecond file access to multi-second network calls
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass(slots=True)
+class Histogram:
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Returns the bucket counts in Prometheus form, each bucket including the ones below it
+
+        Returns:
+            list[tuple[str, int]]: The upper bound label and cumulative count of each bucket
+        """
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((f"{bound:g}", running))
+        result.append(("+Inf", running + self.counts[-1]))
+        return result
+
+    def to_snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": dict(self.cumulative()),
+        }
@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.settings import WORKING_DIR
+
+REPLAY_LEDGER_FILE: Path = WORKING_DIR.joinpath("jiraReplayLedger.txt")
+
+
+@dataclass(slots=True)
+class ReplayResult(DataClassJsonMixin):
+    submitted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    failures: list[str] = field(default_factory=list)
+    aborted: bool = False
@@ -3,11 +3,13 @@ from datetime import timedelta, datetime
 
 from os import getenv
 from pathlib import Path
+from typing import Optional
 
 from dataclasses_json import DataClassJsonMixin
 
 from time_tracker.models.enums import StringEnum
 from time_tracker.models.logging import LogLevel
+from time_tracker.models.sink import SinkSettings
 
 try:
     WORKING_DIR: Path = Path(getenv("USERPROFILE"), "TimeTracking")
@@ -20,7 +22,7 @@ SETTINGS_FILE: Path = Path(WORKING_DIR, "settings.json")
 @dataclass(slots=True)
 class Settings(DataClassJsonMixin):
     theme: str = "DarkBlue3"
-    base_url: str = None
+    base_url: Optional[str] = None
     start_hour: int = 8
     start_minute: int = 0
     end_hour: int = 17
@@ -28,11 +30,48 @@ class Settings(DataClassJsonMixin):
     interval_hours: int = 1
     interval_minutes: int = 0
     enable_jira: bool = False
+    jira_concurrency: int = 4
+    jira_requests_per_second: float = 10.0
+    jira_burst: int = 10
+    jira_max_retries: int = 4
+    jira_backoff_seconds: float = 0.5
+    jira_max_backoff_seconds: float = 30.0
+    jira_timeout_seconds: float = 10.0
+    jira_breaker_failures: int = 3
+    jira_breaker_reset_seconds: int = 300
+    jira_issue_jql: str = "assignee = currentUser() AND resolution = Unresolved"
+    jira_sync_page_size: int = 100
+    jira_metadata_cache_size: int = 5000
+    jira_metadata_refresh_minutes: int = 30
+    coalesce_entries: bool = False
+    enable_team: bool = False
+    team_url: Optional[str] = None
+    team_user: Optional[str] = None
+    team_token: Optional[str] = None
+    team_batch_size: int = 200
+    team_timeout_seconds: float = 10.0
+    enable_webhook: bool = False
+    webhook_url: Optional[str] = None
+    webhook_token: Optional[str] = None
+    webhook_batch_size: int = 100
+    webhook_flush_seconds: float = 5.0
+    webhook_timeout_seconds: float = 10.0
+    webhook_max_retries: int = 3
+    webhook_gzip: bool = True
+    deleted_issue_retention_days: int = 30
+    sinks: dict[str, SinkSettings] = field(default_factory=dict)
     log_level: LogLevel = LogLevel.INFO
-    _log_file_path: str = None
+    _log_file_path: Optional[str] = None
+    _json_log_file_path: Optional[str] = None
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_rotate_hours: int = 24
+    log_backup_count: int = 10
+    log_compress: bool = True
     days_of_week: frozenset[int] = field(
         default_factory=lambda: frozenset({0, 1, 2, 3, 4})
     )
+    enable_metrics: bool = False
+    metrics_export_seconds: int = 60
 
     @property
     def log_file_path(self) -> Path:
@@ -40,6 +79,12 @@ class Settings(DataClassJsonMixin):
             return Path(self._log_file_path)
         return None
 
+    @property
+    def json_log_file_path(self) -> Path:
+        if self._json_log_file_path:
+            return Path(self._json_log_file_path)
+        return None
+
     @property
     def time_interval(self) -> timedelta:
         return timedelta(hours=self.interval_hours, minutes=self.interval_minutes)
@@ -49,10 +94,10 @@ class Settings(DataClassJsonMixin):
         now = datetime.now()
         if self.start_hour > self.end_hour >= now.hour:
             return datetime(
-                now.year, now.day, now.month, self.start_hour, self.start_minute, 0
+                now.year, now.month, now.day, self.start_hour, self.start_minute, 0
             ) - timedelta(days=1)
         return datetime(
-            now.year, now.day, now.month, self.start_hour, self.start_minute, 0
+            now.year, now.month, now.day, self.start_hour, self.start_minute, 0
         )
 
     @property
@@ -60,10 +105,10 @@ class Settings(DataClassJsonMixin):
         now = datetime.now()
         if self.start_hour > self.end_hour >= now.hour:
             return datetime(
-                now.year, now.day, now.month, self.end_hour, self.end_minute, 0
+                now.year, now.month, now.day, self.end_hour, self.end_minute, 0
             )
         return datetime(
-            now.year, now.day, now.month, self.end_hour, self.end_minute, 0
+            now.year, now.month, now.day, self.end_hour, self.end_minute, 0
         ) + timedelta(days=1)
 
     @property
@@ -79,18 +124,19 @@ class Settings(DataClassJsonMixin):
         return self.to_json()
 
     @classmethod
-    def load(cls) -> "Settings":
+    def load(cls, settings_file: Path = SETTINGS_FILE) -> "Settings":
         try:
-            with open(SETTINGS_FILE, "r") as f:
+            with open(settings_file, "r") as f:
                 return cls.from_json(f.read())
         except FileNotFoundError:
             settings = Settings()
-            settings.save()
-            return settings.save()
+            settings.save(settings_file)
+            return settings
 
-    def save(self) -> "Settings":
+    def save(self, settings_file: Path = SETTINGS_FILE) -> "Settings":
         try:
-            with open(SETTINGS_FILE, "w+") as f:
+            settings_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(settings_file, "w+") as f:
                 f.write(self.to_json())
         except Exception as e:
             return None
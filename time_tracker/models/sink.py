@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.enums import StringEnum
+
+# installed packages register sinks under this entry point group, as "name = module:factory"
+SINK_ENTRY_POINT_GROUP = "time_tracker.sinks"
+
+
+class SinkNames(StringEnum):
+    FILE = "file"
+    JIRA = "jira"
+    TEAM = "team"
+    WEBHOOK = "webhook"
+
+
+@dataclass(slots=True)
+class SinkSettings(DataClassJsonMixin):
+    """Per sink settings, keyed by the sink's name in Settings.sinks
+
+    A sink that isn't installed as an entry point can be registered by giving its factory as
+    "module:attribute". The factory is called with the logging and settings providers and returns
+    an ITimeEntryService.
+    """
+
+    # None leaves it to the sink, built in sinks follow their own settings and plugins are off
+    enabled: Optional[bool] = None
+    factory: Optional[str] = None
+    # entries per call to the sink, None passes batches through whole
+    batch_size: Optional[int] = None
+    # batches submitted at once
+    concurrency: int = 1
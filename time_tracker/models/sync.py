@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.settings import WORKING_DIR
+
+SYNC_STATE_DIR: Path = WORKING_DIR.joinpath("sync")
+
+
+@dataclass(slots=True)
+class SyncFileState(DataClassJsonMixin):
+    """A file as it was on both sides after the last sync"""
+
+    # None when the file doesn't exist on that side
+    local_hash: Optional[str]
+    peer_hash: Optional[str]
+    # record id to record hash
+    records: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SyncState(DataClassJsonMixin):
+    """What was last synced with one peer, the base for three way merges"""
+
+    peer: str
+    files: dict[str, SyncFileState] = field(default_factory=dict)
+    # file name to size, modification time and hash, so unchanged files aren't hashed again
+    local_hashes: dict[str, tuple[int, int, str]] = field(default_factory=dict)
+    peer_hashes: dict[str, tuple[int, int, str]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SyncResult(DataClassJsonMixin):
+    files: int = 0
+    unchanged: int = 0
+    merged: int = 0
+    # records written to the peer and to the local working directory
+    sent: int = 0
+    received: int = 0
+    removed: int = 0
+    conflicts: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def __str__(self):
+        return (
+            f"{self.files} files, {self.unchanged} unchanged, {self.merged} merged: "
+            + f"{self.sent} records sent, {self.received} received, {self.removed} removed, "
+            + f"{self.conflicts} conflicts"
+        )
@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.enums import StringEnum
+from time_tracker.models.settings import WORKING_DIR
+from time_tracker.models.time_entry import TimeEntry
+
+TEAM_DATABASE_FILE: Path = WORKING_DIR.joinpath("team.sqlite3")
+# entries not yet uploaded while the team server is unreachable
+TEAM_QUEUE_FILE: Path = WORKING_DIR.joinpath("teamQueue.jsonl")
+TEAM_ENTRIES_PATH = "/api/v1/entries"
+TEAM_REPORT_PATH = "/api/v1/report"
+TEAM_HEALTH_PATH = "/api/v1/health"
+# largest upload body the server accepts
+TEAM_MAX_UPLOAD_BYTES = 16 * 1024 * 1024
+# read connections kept open for reports, more concurrent reports wait for one
+TEAM_READERS = 8
+
+
+class TeamReportGroup(StringEnum):
+    USER = "user"
+    ISSUE = "issue"
+
+
+@dataclass(slots=True)
+class TeamUpload(DataClassJsonMixin):
+    user: str
+    entries: list[TimeEntry] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TeamUploadResult(DataClassJsonMixin):
+    accepted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+
+
+@dataclass(slots=True)
+class TeamReportRow(DataClassJsonMixin):
+    key: str
+    seconds: float
+    entries: int
+    description: Optional[str] = None
+
+    @property
+    def hours(self) -> float:
+        return self.seconds / 3600
+
+
+@dataclass(slots=True)
+class TeamReport(DataClassJsonMixin):
+    group: TeamReportGroup
+    start: datetime
+    end: datetime
+    rows: list[TeamReportRow] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(row.seconds for row in self.rows)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
 from sqlite3 import Time
 from typing import Optional
 
@@ -8,11 +8,53 @@ from dataclasses_json import DataClassJsonMixin
 from time_tracker.models.enums import StringEnum
 from time_tracker.models.issue import Issue
 
+TIME_ENTRY_LOG_PREFIX = "TimeEntryLog-"
+
+
+def time_entry_log_name(day: date) -> str:
+    return f"{TIME_ENTRY_LOG_PREFIX}{day.month:02}-{day.day:02}-{day.year}"
+
+
+def parse_time_entry_log_name(name: str) -> Optional[date]:
+    """Parses the day out of a time entry log file name
+
+    Args:
+        name (str): The file name, e.g. TimeEntryLog-01-31-2022
+
+    Returns:
+        Optional[date]: The day of the log, or None if the name is not a time entry log
+    """
+    if not name.startswith(TIME_ENTRY_LOG_PREFIX):
+        return None
+    try:
+        month, day, year = name[len(TIME_ENTRY_LOG_PREFIX) :].split("-")
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def local_datetime(value: datetime) -> datetime:
+    """Converts a datetime to a naive datetime in local time
+
+    Datetimes read back from json are timezone aware, while the ones created by the views are naive.
+
+    Args:
+        value (datetime): The datetime to convert
+
+    Returns:
+        datetime: The naive local datetime
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
 
 class TimeEntryResponseDisposition(StringEnum):
     SUCCESS = "success"
     NO_AUTH = "no credentials"
     FAILURE = "failure"
+    UNAVAILABLE = "unavailable"
+    QUEUED = "queued"
 
 
 @dataclass(slots=True)
@@ -35,6 +77,19 @@ class TimeEntryEvents(StringEnum):
     SUBMIT = "-SUBMIT-"
 
 
+class CatchUpKeys(StringEnum):
+    COMMENT = "-SLOT_COMMENT-"
+    ISSUE = "-SLOT_ISSUE-"
+    RANGE_COMMENT = "-RANGE_COMMENT-"
+    RANGE_FROM = "-RANGE_FROM-"
+    RANGE_ISSUE = "-RANGE_ISSUE-"
+    RANGE_TO = "-RANGE_TO-"
+
+
+class CatchUpEvents(StringEnum):
+    APPLY_RANGE = "-APPLY_RANGE-"
+
+
 @dataclass(slots=True)
 class TimeEntry(DataClassJsonMixin):
     issue: Issue
@@ -42,6 +97,18 @@ class TimeEntry(DataClassJsonMixin):
     to_time: datetime
     comment: Optional[str] = None
 
+    @property
+    def issue_number(self) -> str:
+        return self.issue.issue_number
+
+    @property
+    def key(self) -> str:
+        """Stable identifier of the entry, derived from its issue and time range"""
+        return (
+            f"{self.issue_number}@{int(self.from_time.timestamp())}"
+            + f"-{int(self.to_time.timestamp())}"
+        )
+
 
 @dataclass(slots=True)
 class TimeEntryLog(DataClassJsonMixin):
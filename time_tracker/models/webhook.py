@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dataclasses_json import DataClassJsonMixin
+
+from time_tracker.models.settings import WORKING_DIR
+from time_tracker.models.time_entry import TimeEntry
+
+# entries waiting to be sent, kept across restarts
+WEBHOOK_QUEUE_FILE: Path = WORKING_DIR.joinpath("webhookQueue.jsonl")
+# entries held while the receiver is unreachable, more are refused until some are sent
+WEBHOOK_MAX_BUFFERED = 50_000
+# identifies a batch, so a receiver can ignore one delivered twice by a retry
+WEBHOOK_BATCH_HEADER = "Idempotency-Key"
+
+
+@dataclass(slots=True)
+class WebhookBatch(DataClassJsonMixin):
+    """The body of one webhook request"""
+
+    source: str
+    batch_id: str
+    entries: list[TimeEntry] = field(default_factory=list)
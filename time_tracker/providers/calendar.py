@@ -0,0 +1,58 @@
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.interfaces.calendar import IWorkCalendarProvider
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.models.calendar import HOLIDAYS_FILE
+from time_tracker.models.settings import Settings
+from time_tracker.services.calendar import WorkCalendar, load_holidays
+
+
+class WorkCalendarProvider(IWorkCalendarProvider):
+    """Caches a WorkCalendar, rebuilding it when settings or holidays change or a day outside it is needed"""
+
+    def __init__(
+        self,
+        settings_provider: ISettingsProvider,
+        holidays_file: Path = HOLIDAYS_FILE,
+        horizon: timedelta = timedelta(days=400),
+    ):
+        self.settings_provider = settings_provider
+        self.holidays_file = holidays_file
+        self.horizon = horizon
+        self.calendar: Optional[WorkCalendar] = None
+        self.holidays_modified: Optional[int] = None
+        self._lock = threading.Lock()
+        settings_provider.subscribe(self.invalidate)
+
+    def invalidate(self, settings: Optional[Settings] = None) -> None:
+        with self._lock:
+            self.calendar = None
+
+    def _holidays_modified(self) -> Optional[int]:
+        try:
+            return self.holidays_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def get_calendar(self, day: Optional[date] = None) -> WorkCalendar:
+        day = day or date.today()
+        settings = self.settings_provider.get_settings()
+        modified = self._holidays_modified()
+        with self._lock:
+            calendar = self.calendar
+            if (
+                calendar is None
+                or modified != self.holidays_modified
+                or not calendar.covers(day, day)
+            ):
+                calendar = self.calendar = WorkCalendar(
+                    settings,
+                    day - self.horizon,
+                    day + self.horizon,
+                    load_holidays(self.holidays_file),
+                )
+                self.holidays_modified = modified
+            return calendar
@@ -0,0 +1,87 @@
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future, wait
+from logging import Logger
+from typing import Any, Awaitable, Optional
+
+import PySimpleGUI as sg
+
+from time_tracker.interfaces.event_loop import IEventLoopProvider
+from time_tracker.interfaces.logging import ILoggingProvider
+
+
+class EventLoopProvider(IEventLoopProvider):
+    """An asyncio event loop running on a daemon worker thread
+
+    The GUI thread hands coroutines to the loop and gets results back through futures or through
+    window.write_event_value, so network calls never block the PySimpleGUI event loop.
+    """
+
+    log: Logger
+
+    def __init__(self, log_provider: ILoggingProvider):
+        self.log = log_provider.get_logger("EventLoopProvider")
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pending: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(
+                    target=self.loop.run_forever, name="EventLoop", daemon=True
+                )
+                self.thread.start()
+                atexit.register(self.stop)
+            return self.loop
+
+    def submit(self, awaitable: Awaitable) -> Future:
+        future = asyncio.run_coroutine_threadsafe(awaitable, self.start())
+        with self._lock:
+            self.pending.add(future)
+        future.add_done_callback(self._finished)
+        return future
+
+    def submit_to_window(
+        self, window: sg.Window, event: Any, awaitable: Awaitable
+    ) -> Future:
+        future = self.submit(awaitable)
+
+        def notify(done: Future) -> None:
+            value = done.exception() or done.result()
+            try:
+                window.write_event_value(event, value)
+            except Exception as e:
+                # the window was closed before the work finished
+                self.log.debug("Unable to post %s to window: %s", event, e)
+
+        future.add_done_callback(notify)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self.pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            self.log.error("Background task failed: %s", future.exception())
+
+    def stop(self, timeout: float = 30) -> None:
+        with self._lock:
+            loop, thread, pending = self.loop, self.thread, list(self.pending)
+            self.loop = self.thread = None
+        if loop is None:
+            return
+        if pending:
+            self.log.info("Waiting for %s background tasks", len(pending))
+            wait(pending, timeout)
+        try:
+            asyncio.run_coroutine_threadsafe(
+                loop.shutdown_default_executor(), loop
+            ).result(timeout)
+        except TimeoutError:
+            self.log.warning("Background threads did not finish in %ss", timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
@@ -1,5 +1,15 @@
+import atexit
+import gzip
+import json
 import logging
-from logging import Logger, FileHandler
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from logging import Formatter, Handler, Logger, LogRecord
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
+from pathlib import Path
+from queue import SimpleQueue
 
 from rich.logging import RichHandler
 from time_tracker.interfaces.logging import ILoggingProvider
@@ -7,32 +17,205 @@ from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.models.settings import Settings
 from time_tracker.models.logging import LogLevel
 
+DATE_FORMAT = "[%Y-%m-%d %H:%M:%S]"
+LOG_FORMAT = "%(levelname)7s %(asctime)s - %(name)20s - %(message)s"
+CONSOLE_FORMAT = "%(name)20s - %(message)s"
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread
+
+    The message is merged with its arguments so later changes to them are not observed, but
+    the exception info is kept so the listener can still render rich tracebacks.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """Appends to a log file and rolls it over once it reaches a size or an age
+
+    Rolled segments are named after the time of the rollover, gzipped when compress is set, and
+    only the newest backup_count segments are kept. The age of a file left by an earlier run
+    counts from when that file was started, so restarts don't postpone its rollover.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        max_bytes: int = 0,
+        interval: timedelta = timedelta(0),
+        backup_count: int = 0,
+        compress: bool = True,
+        encoding: str = "utf-8",
+    ):
+        super().__init__(str(filename), "a", encoding=encoding)
+        self.max_bytes = max_bytes
+        self.interval_seconds = interval.total_seconds()
+        self.backup_count = backup_count
+        self.compress = compress
+        self.rollover_at = self._next_rollover(self._started())
+
+    def _next_rollover(self, started: float) -> float:
+        if self.interval_seconds <= 0:
+            return float("inf")
+        return started + self.interval_seconds
+
+    def _started(self) -> float:
+        """When the current log file was started, as near as the file system tells"""
+        base = Path(self.baseFilename)
+        try:
+            stat = base.stat()
+        except FileNotFoundError:
+            return time.time()
+        started = getattr(stat, "st_birthtime", None)
+        if started is not None:
+            return started
+        # without a creation time, the last rollover is when the file was started
+        return max(
+            (path.stat().st_mtime for path in self._segments(base)),
+            default=stat.st_mtime,
+        )
+
+    def shouldRollover(self, record: LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            # checking the current size rather than formatting the record a second time
+            # allows one record of overshoot in exchange for a cheaper write path
+            return self.stream.tell() >= self.max_bytes
+        return False
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        base = Path(self.baseFilename)
+        if base.exists() and base.stat().st_size > 0:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            destination = base.with_name(f"{base.name}.{stamp}")
+            counter = 1
+            while self._segment_exists(destination):
+                destination = base.with_name(f"{base.name}.{stamp}-{counter}")
+                counter += 1
+            os.replace(base, destination)
+            if self.compress:
+                with open(destination, "rb") as source, gzip.open(
+                    f"{destination}.gz", "wb"
+                ) as target:
+                    shutil.copyfileobj(source, target)
+                destination.unlink()
+            self._purge_segments(base)
+        self.stream = self._open()
+        self.rollover_at = self._next_rollover(time.time())
+
+    def _segment_exists(self, destination: Path) -> bool:
+        return destination.exists() or Path(f"{destination}.gz").exists()
+
+    def _segments(self, base: Path) -> list[Path]:
+        return [
+            path
+            for path in base.parent.glob(f"{base.name}.*")
+            if path.name[len(base.name) + 1 :][:1].isdigit()
+        ]
+
+    def _purge_segments(self, base: Path) -> None:
+        if self.backup_count <= 0:
+            return
+        segments = sorted(
+            self._segments(base), key=lambda path: path.stat().st_mtime_ns
+        )
+        for path in segments[: -self.backup_count]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class JsonLinesFormatter(Formatter):
+    """Formats each record as a single json object per line"""
+
+    def format(self, record: LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
 
 class LoggingProvider(ILoggingProvider):
     log_level: LogLevel
 
     def __init__(self, settings: Settings):
         self.log_level = settings.log_level
-        handlers = [RichHandler(rich_tracebacks=True)]
+        self.loggers: dict[str, Logger] = {}
+        # rich renders the time and level columns itself
+        console_handler = RichHandler(rich_tracebacks=True, log_time_format=DATE_FORMAT)
+        console_handler.setFormatter(Formatter(CONSOLE_FORMAT))
+        handlers: list[Handler] = [console_handler]
         if settings.log_file_path:
-            handlers.append(
-                FileHandler(str(settings.log_file_path), mode="w+", encoding="utf-8")
-            )
-        logging.basicConfig(
-            datefmt="[%Y-%m-%d %H:%M:%S]",
-            format="%(levelname)7s %(date)s - %(name)20s - %(message)s",
-            handlers=handlers,
-            level=LogLevel.NOTSET,
+            file_handler = self.make_file_handler(settings, settings.log_file_path)
+            file_handler.setFormatter(Formatter(LOG_FORMAT, DATE_FORMAT))
+            handlers.append(file_handler)
+        if settings.json_log_file_path:
+            json_handler = self.make_file_handler(settings, settings.json_log_file_path)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+
+        self.queue = SimpleQueue()
+        self.queue_handler = DeferredQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(LogLevel.NOTSET)
+        self.listener.start()
+        atexit.register(self.shutdown)
+
+    @staticmethod
+    def make_file_handler(settings: Settings, path: Path) -> Handler:
+        return CompressingRotatingFileHandler(
+            path,
+            max_bytes=settings.log_max_bytes,
+            interval=timedelta(hours=settings.log_rotate_hours),
+            backup_count=settings.log_backup_count,
+            compress=settings.log_compress,
         )
 
+    def shutdown(self) -> None:
+        """Flushes queued records and stops the background listener"""
+        if self.listener._thread is None:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
     def update_level(self, log_Level: LogLevel):
+        if log_Level == self.log_level:
+            return
         self.log_level = log_Level
+        for log in self.loggers.values():
+            log.setLevel(log_Level)
 
     def get_logger(self, name: str = None) -> Logger:
         """Return a logger with the specified name, creating it if necessary.
 
         If no name is specified, return the root logger.
         """
-        log = logging.getLogger(name)
-        log.setLevel(self.log_level)
+        log = self.loggers.get(name)
+        if log is None:
+            log = self.loggers[name] = logging.getLogger(name)
+            log.setLevel(self.log_level)
         return log
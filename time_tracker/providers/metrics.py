@@ -0,0 +1,238 @@
+import json
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, ContextManager, Optional
+
+from time_tracker.interfaces.metrics import IMetricsProvider
+from time_tracker.models.metrics import (
+    METRICS_FILE,
+    METRICS_PREFIX,
+    METRICS_SNAPSHOT_FILE,
+    Histogram,
+    MetricKey,
+)
+from time_tracker.models.settings import Settings
+
+_INVALID_NAME_CHARACTERS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("provider", "key", "started")
+
+    def __init__(self, provider: "MetricsProvider", key: MetricKey):
+        self.provider = provider
+        self.key = key
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.provider._observe(self.key, perf_counter() - self.started)
+        return False
+
+
+def _make_key(name: str, labels: dict[str, str]) -> MetricKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _series_name(name: str, suffix: str = "") -> str:
+    return f"{METRICS_PREFIX}_{_INVALID_NAME_CHARACTERS.sub('_', name)}{suffix}"
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...], **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"')) for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class MetricsProvider(IMetricsProvider):
+    """In process timing histograms and counters
+
+    While disabled every call returns before taking the lock, so instrumented code paths only pay
+    for an attribute check.
+    """
+
+    enabled: bool
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        metrics_file: Path = METRICS_FILE,
+        snapshot_file: Path = METRICS_SNAPSHOT_FILE,
+        snapshot_history: int = 60,
+    ):
+        self.enabled = enabled
+        self.metrics_file = metrics_file
+        self.snapshot_file = snapshot_file
+        self.snapshots: deque[dict] = deque(maxlen=snapshot_history)
+        self.histograms: dict[MetricKey, Histogram] = {}
+        self.counters: dict[MetricKey, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._exporter: Optional[threading.Thread] = None
+
+    def configure(self, settings: Settings) -> None:
+        """Applies the metrics settings, starting or stopping the periodic exporter
+
+        Args:
+            settings (Settings): The application settings
+        """
+        self.enabled = settings.enable_metrics
+        if self.enabled and settings.metrics_export_seconds > 0:
+            self.start(settings.metrics_export_seconds)
+        else:
+            self.stop()
+
+    def start(self, interval_seconds: float) -> None:
+        if self._exporter is not None and self._exporter.is_alive():
+            return
+        self._stop.clear()
+        self._exporter = threading.Thread(
+            target=self._export_loop,
+            args=(interval_seconds,),
+            name="MetricsExporter",
+            daemon=True,
+        )
+        self._exporter.start()
+
+    def stop(self) -> None:
+        """Stops the periodic exporter, writing a final export if metrics are enabled"""
+        if self._exporter is None:
+            return
+        self._stop.set()
+        self._exporter.join()
+        self._exporter = None
+        if self.enabled:
+            self.export()
+
+    def _export_loop(self, interval_seconds: float) -> None:
+        while not self._stop.wait(interval_seconds):
+            self.export()
+
+    def timer(self, name: str, **labels: str) -> ContextManager:
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, _make_key(name, labels))
+
+    def timed(self, name: str, **labels: str) -> Callable[[Callable], Callable]:
+        key = _make_key(name, labels)
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._observe(key, perf_counter() - started)
+
+            return wrapper
+
+        return decorator
+
+    def increment(self, name: str, amount: int = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = _make_key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        self._observe(_make_key(name, labels), value)
+
+    def _observe(self, key: MetricKey, value: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def to_prometheus(self) -> str:
+        """Renders the current metrics in the Prometheus text exposition format
+
+        Returns:
+            str: The rendered metrics
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, histogram.cumulative(), histogram.total, histogram.count)
+                for key, histogram in self.histograms.items()
+            )
+        declared = set()
+        for (name, labels), value in counters:
+            series = _series_name(name, "_total")
+            if series not in declared:
+                declared.add(series)
+                lines.append(f"# TYPE {series} counter")
+            lines.append(f"{series}{_format_labels(labels)} {value}")
+        for (name, labels), buckets, total, count in histograms:
+            series = _series_name(name, "_seconds")
+            if series not in declared:
+                declared.add(series)
+                lines.append(f"# TYPE {series} histogram")
+            for bound, bucket_count in buckets:
+                lines.append(
+                    f"{series}_bucket{_format_labels(labels, le=bound)} {bucket_count}"
+                )
+            lines.append(f"{series}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{series}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "timestamp": datetime.now().isoformat(),
+                "counters": {
+                    name + _format_labels(labels): value
+                    for (name, labels), value in self.counters.items()
+                },
+                "histograms": {
+                    name + _format_labels(labels): histogram.to_snapshot()
+                    for (name, labels), histogram in self.histograms.items()
+                },
+            }
+
+    def export(self) -> None:
+        self.snapshots.append(self.snapshot())
+        _write_atomic(self.metrics_file, self.to_prometheus())
+        _write_atomic(self.snapshot_file, json.dumps(list(self.snapshots), indent=2))
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+METRICS = MetricsProvider()
@@ -1,12 +1,65 @@
-from time_tracker.models.settings import Settings
+import threading
+from logging import getLogger
+from pathlib import Path
+from typing import Callable, Optional
 
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.models.settings import SETTINGS_FILE, Settings
 
-class SettingsProvider:
-    def __init__(self):
-        self.settings = None
+
+class SettingsProvider(ISettingsProvider):
+    """Single cached source of Settings
+
+    The settings file is only parsed again when its modification time changes, and subscribers
+    are notified whenever the settings differ from the cached copy.
+    """
+
+    def __init__(self, settings_file: Path = SETTINGS_FILE):
+        self.settings_file = settings_file
+        self.settings: Optional[Settings] = None
+        self.modified: Optional[int] = None
+        self.subscribers: list[Callable[[Settings], None]] = []
+        self._lock = threading.RLock()
+
+    def _modified(self) -> Optional[int]:
+        try:
+            return self.settings_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
 
     def get_settings(self) -> Settings:
-        if self.settings is None:
-            self.settings = Settings.load()
-        else:
-            return self.settings
+        modified = self._modified()
+        with self._lock:
+            if self.settings is not None and modified == self.modified:
+                return self.settings
+            previous = self.settings
+            self.settings = Settings.load(self.settings_file)
+            self.modified = self._modified()
+            settings = self.settings
+        if previous is not None and previous != settings:
+            self._publish(settings)
+        return settings
+
+    def save_settings(self, settings: Settings) -> Optional[Settings]:
+        with self._lock:
+            if settings.save(self.settings_file) is None:
+                return None
+            previous = self.settings
+            self.settings = settings
+            self.modified = self._modified()
+        if previous != settings:
+            self._publish(settings)
+        return settings
+
+    def subscribe(self, callback: Callable[[Settings], None]) -> None:
+        with self._lock:
+            self.subscribers.append(callback)
+
+    def _publish(self, settings: Settings) -> None:
+        for callback in list(self.subscribers):
+            try:
+                callback(settings)
+            except Exception as e:
+                getLogger("SettingsProvider").error(
+                    "Settings subscriber %s failed: %s", callback, e
+                )
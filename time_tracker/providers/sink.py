@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from importlib import import_module
+from importlib.metadata import entry_points
+from logging import Logger
+from pathlib import Path
+from typing import Callable, Optional
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.interfaces.time_entry import ITimeEntryService
+from time_tracker.models.circuit_breaker import JIRA_QUEUE_FILE
+from time_tracker.models.settings import Settings
+from time_tracker.models.sink import SINK_ENTRY_POINT_GROUP, SinkNames
+from time_tracker.models.team import TEAM_QUEUE_FILE
+from time_tracker.services.time_entry import TimeEntryFileService
+
+
+@dataclass(slots=True)
+class SinkSpec:
+    """A registered sink, imported and built only when enabled"""
+
+    name: str
+    # "module:attribute" of a callable taking the logging and settings providers
+    factory: str
+    # whether the sink is on when Settings.sinks doesn't say
+    enabled: Callable[[Settings], bool] = lambda settings: False
+    title: Optional[str] = None
+    # remote sinks queue entries here while they're unavailable
+    queue_file: Optional[Path] = None
+
+
+def make_file_sink(
+    log_provider: ILoggingProvider, settings_provider: ISettingsProvider
+) -> ITimeEntryService:
+    return TimeEntryFileService(log_provider, settings_provider.get_settings())
+
+
+BUILTIN_SINKS: tuple[SinkSpec, ...] = (
+    SinkSpec(
+        SinkNames.FILE,
+        "time_tracker.providers.sink:make_file_sink",
+        lambda settings: True,
+    ),
+    SinkSpec(
+        SinkNames.JIRA,
+        "time_tracker.integrations.services.jira:JiraService",
+        lambda settings: settings.enable_jira,
+        "Jira",
+        JIRA_QUEUE_FILE,
+    ),
+    SinkSpec(
+        SinkNames.TEAM,
+        "time_tracker.services.team:TeamTimeEntryService",
+        lambda settings: settings.enable_team and bool(settings.team_url),
+        "Team server",
+        TEAM_QUEUE_FILE,
+    ),
+    SinkSpec(
+        SinkNames.WEBHOOK,
+        "time_tracker.services.webhook:WebhookTimeEntryService",
+        lambda settings: settings.enable_webhook and bool(settings.webhook_url),
+    ),
+)
+
+
+def load_factory(path: str) -> Callable[..., ITimeEntryService]:
+    """Imports the object named by "module:attribute"
+
+    Raises:
+        ImportError, AttributeError, ValueError: The path doesn't name an object
+    """
+    module_name, _, attribute = path.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected 'module:attribute', got {path!r}")
+    target = import_module(module_name)
+    for name in attribute.split("."):
+        target = getattr(target, name)
+    return target
+
+
+class SinkRegistry:
+    """The sinks time entries can be logged to, by name
+
+    Built in sinks are registered in code, installed packages add theirs through the
+    time_tracker.sinks entry point group and anything else can be named in Settings.sinks. Only
+    names and import paths are read up front, a sink's module is imported when the sink is
+    created, so disabled sinks never load their dependencies.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        settings_provider: ISettingsProvider,
+        builtins: tuple[SinkSpec, ...] = BUILTIN_SINKS,
+    ):
+        self.log = log_provider.get_logger("SinkRegistry")
+        self.log_provider = log_provider
+        self.settings_provider = settings_provider
+        self.specs: dict[str, SinkSpec] = {spec.name: spec for spec in builtins}
+        self._discovered = False
+
+    def register(self, spec: SinkSpec) -> None:
+        self.specs[spec.name] = spec
+
+    def discover(self) -> None:
+        """Registers the sinks of installed packages, without importing them"""
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in entry_points(group=SINK_ENTRY_POINT_GROUP):
+            if entry_point.name in self.specs:
+                self.log.warning(
+                    "Ignoring sink %s from %s, the name is taken",
+                    entry_point.name,
+                    entry_point.value,
+                )
+                continue
+            self.register(SinkSpec(entry_point.name, entry_point.value))
+
+    def all_specs(self, settings: Settings) -> list[SinkSpec]:
+        self.discover()
+        specs = dict(self.specs)
+        for name, sink_settings in settings.sinks.items():
+            if sink_settings.factory:
+                specs[name] = SinkSpec(name, sink_settings.factory)
+        return list(specs.values())
+
+    def is_enabled(self, spec: SinkSpec, settings: Settings) -> bool:
+        sink_settings = settings.sinks.get(spec.name)
+        if sink_settings is not None and sink_settings.enabled is not None:
+            return sink_settings.enabled
+        return spec.enabled(settings)
+
+    def enabled_specs(self, settings: Optional[Settings] = None) -> list[SinkSpec]:
+        settings = settings or self.settings_provider.get_settings()
+        return [
+            spec for spec in self.all_specs(settings) if self.is_enabled(spec, settings)
+        ]
+
+    def spec(self, name: str) -> SinkSpec:
+        for spec in self.all_specs(self.settings_provider.get_settings()):
+            if spec.name == name:
+                return spec
+        raise KeyError(f"No sink named {name!r}")
+
+    def create(self, name: str) -> ITimeEntryService:
+        """Imports and builds a sink
+
+        Raises:
+            KeyError: No sink has the name
+            ImportError, AttributeError, ValueError: The sink's factory can't be loaded
+
+        Returns:
+            ITimeEntryService: A new instance of the sink
+        """
+        spec = self.spec(name)
+        service = load_factory(spec.factory)(self.log_provider, self.settings_provider)
+        self.log.debug("Created sink %s from %s", name, spec.factory)
+        return service
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Iterable
+
+from time_tracker.interfaces.issue import IAsyncIssueService, IIssueService
+from time_tracker.interfaces.time_entry import (
+    IAsyncTimeEntryService,
+    ITimeEntryService,
+)
+from time_tracker.models.issue import IssueList
+from time_tracker.models.time_entry import TimeEntry, TimeEntryResponse
+
+
+class AsyncTimeEntryServiceAdapter(IAsyncTimeEntryService):
+    """Runs a blocking ITimeEntryService on the event loop's thread pool
+
+    Calls are serialized, since the wrapped services were written for a single caller; batches
+    still go through the service's own log_work_batch so it can apply its own concurrency.
+    """
+
+    def __init__(self, service: ITimeEntryService):
+        self.service = service
+        self._lock = asyncio.Lock()
+
+    async def log_work_async(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        async with self._lock:
+            return await asyncio.to_thread(self.service.log_work, time_entry)
+
+    async def log_work_batch_async(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        time_entries = list(time_entries)
+        async with self._lock:
+            return await asyncio.to_thread(self.service.log_work_batch, time_entries)
+
+
+class AsyncIssueServiceAdapter(IAsyncIssueService):
+    """Runs a blocking IIssueService on the event loop's thread pool"""
+
+    def __init__(self, issue_service: IIssueService):
+        self.issue_service = issue_service
+
+    async def load_active_issues_async(self) -> IssueList:
+        return await asyncio.to_thread(self.issue_service.load_active_issues)
+
+    async def load_deleted_issues_async(self) -> IssueList:
+        return await asyncio.to_thread(self.issue_service.load_deleted_issues)
+
+    async def save_all_lists_async(
+        self, active_list: IssueList, deleted_list: IssueList
+    ) -> None:
+        await asyncio.to_thread(
+            self.issue_service.save_all_lists, active_list, deleted_list
+        )
+
+
+def as_async_time_entry_service(
+    service: ITimeEntryService | IAsyncTimeEntryService,
+) -> IAsyncTimeEntryService:
+    if isinstance(service, IAsyncTimeEntryService):
+        return service
+    return AsyncTimeEntryServiceAdapter(service)
+
+
+def as_async_issue_service(
+    issue_service: IIssueService | IAsyncIssueService,
+) -> IAsyncIssueService:
+    if isinstance(issue_service, IAsyncIssueService):
+        return issue_service
+    return AsyncIssueServiceAdapter(issue_service)
+
+
+async def log_work_everywhere(
+    services: Iterable[IAsyncTimeEntryService], time_entries: list[TimeEntry]
+) -> list[list[TimeEntryResponse]]:
+    """Logs the entries to every service at once
+
+    Returns:
+        list[list[TimeEntryResponse]]: Each service's responses, in the order of services
+    """
+    return list(
+        await asyncio.gather(
+            *(service.log_work_batch_async(time_entries) for service in services)
+        )
+    )
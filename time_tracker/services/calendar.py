@@ -0,0 +1,149 @@
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+
+from time_tracker.interfaces.calendar import IWorkCalendar
+from time_tracker.models.calendar import Holiday, WorkInterval
+from time_tracker.models.settings import Settings
+from time_tracker.models.time_entry import local_datetime
+
+
+def load_holidays(path: Path) -> list[Holiday]:
+    """Loads holidays from a json list of ISO dates or {"day": ..., "name": ...} objects
+
+    Args:
+        path (Path): The holidays file
+
+    Returns:
+        list[Holiday]: The holidays, or an empty list if the file does not exist
+    """
+    if not path.exists():
+        return []
+    with open(path, "r") as f:
+        items = json.load(f)
+    holidays = []
+    for item in items:
+        if isinstance(item, str):
+            holidays.append(Holiday(date.fromisoformat(item)))
+        else:
+            holidays.append(
+                Holiday(date.fromisoformat(item["day"]), item.get("name", ""))
+            )
+    return holidays
+
+
+class WorkCalendar(IWorkCalendar):
+    """Working intervals and prompt slots precomputed for a range of days
+
+    Intervals and slots are kept in sorted lists with a running total of working seconds, so every
+    query is a binary search plus the size of its result.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        first_day: date,
+        last_day: date,
+        holidays: Iterable[Holiday] = (),
+    ):
+        self.first_day = first_day
+        self.last_day = last_day
+        self.holidays = frozenset(holiday.day for holiday in holidays)
+        self.intervals: list[WorkInterval] = []
+        self.slots: list[WorkInterval] = []
+        self._build(settings)
+        self.starts = [interval.start for interval in self.intervals]
+        self.ends = [interval.end for interval in self.intervals]
+        self.elapsed = [0.0]
+        for interval in self.intervals:
+            self.elapsed.append(self.elapsed[-1] + interval.duration.total_seconds())
+        self.slot_starts = [slot.start for slot in self.slots]
+        self.slot_ends = [slot.end for slot in self.slots]
+
+    def _build(self, settings: Settings) -> None:
+        slot_length = settings.time_interval
+        day = self.first_day
+        while day <= self.last_day:
+            if day.weekday() in settings.days_of_week and day not in self.holidays:
+                start = datetime.combine(
+                    day, time(settings.start_hour, settings.start_minute)
+                )
+                end = datetime.combine(
+                    day, time(settings.end_hour, settings.end_minute)
+                )
+                if end <= start:
+                    # overnight shift, ends on the following day
+                    end += timedelta(days=1)
+                self.intervals.append(WorkInterval(start, end))
+                slot_start = start
+                while slot_start < end:
+                    slot_end = (
+                        min(slot_start + slot_length, end) if slot_length else end
+                    )
+                    self.slots.append(WorkInterval(slot_start, slot_end))
+                    slot_start = slot_end
+            day += timedelta(days=1)
+
+    def covers(self, first_day: date, last_day: date) -> bool:
+        return self.first_day <= first_day and last_day <= self.last_day
+
+    def is_holiday(self, day: date) -> bool:
+        return day in self.holidays
+
+    def interval_at(self, moment: datetime) -> Optional[WorkInterval]:
+        moment = local_datetime(moment)
+        index = bisect_right(self.starts, moment) - 1
+        if index >= 0 and moment < self.ends[index]:
+            return self.intervals[index]
+        return None
+
+    def _overlapping(self, start: datetime, end: datetime) -> tuple[int, int]:
+        return bisect_right(self.ends, start), bisect_left(self.starts, end)
+
+    def intervals_between(self, start: datetime, end: datetime) -> list[WorkInterval]:
+        start, end = local_datetime(start), local_datetime(end)
+        first, last = self._overlapping(start, end)
+        return [
+            WorkInterval(max(interval.start, start), min(interval.end, end))
+            for interval in self.intervals[first:last]
+        ]
+
+    def slots_between(self, start: datetime, end: datetime) -> list[WorkInterval]:
+        start, end = local_datetime(start), local_datetime(end)
+        return self.slots[
+            bisect_left(self.slot_starts, start) : bisect_left(self.slot_starts, end)
+        ]
+
+    def slots_ending_between(
+        self, start: datetime, end: datetime
+    ) -> list[WorkInterval]:
+        """Returns the slots that end within (start, end], the first one clipped to start
+
+        This is the set of prompts that became due between two moments, e.g. since the last entry.
+
+        Args:
+            start (datetime): The exclusive start of the range
+            end (datetime): The inclusive end of the range
+
+        Returns:
+            list[WorkInterval]: The due slots in order
+        """
+        start, end = local_datetime(start), local_datetime(end)
+        slots = self.slots[
+            bisect_right(self.slot_ends, start) : bisect_right(self.slot_ends, end)
+        ]
+        if slots and slots[0].start < start:
+            slots[0] = WorkInterval(start, slots[0].end)
+        return slots
+
+    def expected_time(self, start: datetime, end: datetime) -> timedelta:
+        start, end = local_datetime(start), local_datetime(end)
+        first, last = self._overlapping(start, end)
+        if first >= last:
+            return timedelta(0)
+        seconds = self.elapsed[last] - self.elapsed[first]
+        seconds -= max(0.0, (start - self.starts[first]).total_seconds())
+        seconds -= max(0.0, (self.ends[last - 1] - end).total_seconds())
+        return timedelta(seconds=seconds)
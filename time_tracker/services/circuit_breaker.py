@@ -0,0 +1,293 @@
+import os
+import threading
+from logging import Logger
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Iterable, Optional
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.time_entry import (
+    IMonitoredTimeEntryService,
+    ITimeEntryService,
+)
+from time_tracker.models.circuit_breaker import JIRA_QUEUE_FILE, CircuitState
+from time_tracker.models.time_entry import (
+    TimeEntry,
+    TimeEntryResponse,
+    TimeEntryResponseDisposition,
+)
+from time_tracker.providers.metrics import METRICS
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures of a remote dependency
+
+    Closed lets every call through. After failure_threshold consecutive failures it opens and
+    rejects calls until reset_seconds have passed, then lets a single half open probe through;
+    a successful probe closes it again and a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_seconds: float = 300,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self._state = CircuitState.CLOSED
+        self.subscribers: list[Callable[[CircuitState], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            if self._state == CircuitState.OPEN and self.retry_in() <= 0:
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def configure(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker allows a probe"""
+        return max(0.0, self.opened_at + self.reset_seconds - self.clock())
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self.probing or self.retry_in() > 0:
+                return False
+            self.probing = True
+            changed = self._set_state(CircuitState.HALF_OPEN)
+        if changed:
+            self._publish(CircuitState.HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.probing = False
+            changed = self._set_state(CircuitState.CLOSED)
+        if changed:
+            self._publish(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if (
+                self._state == CircuitState.CLOSED
+                and self.failures < self.failure_threshold
+            ):
+                return
+            self.opened_at = self.clock()
+            changed = self._set_state(CircuitState.OPEN)
+        if changed:
+            self._publish(CircuitState.OPEN)
+
+    def subscribe(self, callback: Callable[[CircuitState], None]) -> None:
+        self.subscribers.append(callback)
+
+    def _set_state(self, state: CircuitState) -> bool:
+        if self._state == state:
+            return False
+        self._state = state
+        return True
+
+    def _publish(self, state: CircuitState) -> None:
+        METRICS.increment("circuit_breaker.transitions", state=str(state))
+        for callback in list(self.subscribers):
+            callback(state)
+
+
+class CircuitBreakerTimeEntryService(IMonitoredTimeEntryService):
+    """Fails fast in front of a remote sink that is unavailable
+
+    While the breaker is open, entries are appended to a local queue file instead of waiting on
+    the remote service. A background thread probes the service once per reset interval and
+    replays the queue once a probe succeeds; anything still queued at exit is sent on the next
+    start.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        service: ITimeEntryService,
+        breaker: CircuitBreaker,
+        probe: Callable[[], bool],
+        name: str = "Jira",
+        queue_file: Path = JIRA_QUEUE_FILE,
+    ):
+        self.log = log_provider.get_logger("CircuitBreakerTimeEntryService")
+        self.service = service
+        self.breaker = breaker
+        self.probe = probe
+        self.name = name
+        self.queue_file = queue_file
+        self._queue_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._prober: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        breaker.subscribe(self._on_state_change)
+        if self.queued_count():
+            self._start_prober(0)
+
+    def status_text(self) -> Optional[str]:
+        state = self.breaker.state
+        queued = self.queued_count()
+        if state == CircuitState.CLOSED:
+            return f"{self.name}: connected" + (
+                f", sending {queued} queued" if queued else ""
+            )
+        if state == CircuitState.HALF_OPEN:
+            return f"{self.name}: checking connection, {queued} queued"
+        minutes = int(self.breaker.retry_in() // 60) + 1
+        return f"{self.name}: unavailable, {queued} queued, retrying in {minutes} min"
+
+    def log_work(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        return self.log_work_batch([time_entry])[0]
+
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        time_entries = list(time_entries)
+        if not time_entries:
+            return []
+        if not self.breaker.allow_request():
+            METRICS.increment("circuit_breaker.rejected", amount=len(time_entries))
+            self.enqueue(time_entries)
+            return [self.queued_response() for _ in time_entries]
+        responses = self.service.log_work_batch(time_entries)
+        unavailable = [
+            entry
+            for entry, response in zip(time_entries, responses)
+            if response.disposition == TimeEntryResponseDisposition.UNAVAILABLE
+        ]
+        if not unavailable:
+            self.breaker.record_success()
+            return responses
+        self.breaker.record_failure()
+        self.enqueue(unavailable)
+        return [
+            (
+                self.queued_response()
+                if response.disposition == TimeEntryResponseDisposition.UNAVAILABLE
+                else response
+            )
+            for response in responses
+        ]
+
+    def queued_response(self) -> TimeEntryResponse:
+        return TimeEntryResponse(
+            True,
+            f"{self.name} is unavailable, the entry will be sent when it is back",
+            TimeEntryResponseDisposition.QUEUED,
+        )
+
+    def enqueue(self, time_entries: list[TimeEntry]) -> None:
+        with self._queue_lock:
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.queue_file, "a", encoding="utf-8") as f:
+                for entry in time_entries:
+                    f.write(entry.to_json() + "\n")
+        self.log.info("Queued %s entries for %s", len(time_entries), self.name)
+
+    def read_queue(self) -> list[TimeEntry]:
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                return [TimeEntry.from_json(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def queued_count(self) -> int:
+        try:
+            with open(self.queue_file, "rb") as f:
+                return sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            return 0
+
+    def drain(self) -> None:
+        """Sends the queued entries, keeping all but the ones the service rejected outright
+
+        The queue is read under the lock and sent without it, so entries can still be queued
+        while a drain waits on the service; those are kept after the ones still pending.
+        """
+        with self._drain_lock:
+            with self._queue_lock:
+                entries = self.read_queue()
+            if not entries:
+                return
+            self.log.info("Sending %s queued entries to %s", len(entries), self.name)
+            responses = self.service.log_work_batch(entries)
+            remaining = []
+            unavailable = False
+            for entry, response in zip(entries, responses):
+                if response.success:
+                    continue
+                if response.disposition == TimeEntryResponseDisposition.FAILURE:
+                    self.log.error(
+                        "Dropping queued entry %s: %s", entry.key, response.message
+                    )
+                    continue
+                # unreachable, rate limited or waiting on credentials, worth sending again
+                unavailable |= (
+                    response.disposition == TimeEntryResponseDisposition.UNAVAILABLE
+                )
+                remaining.append(entry)
+            with self._queue_lock:
+                # only enqueue appends while a drain runs
+                remaining.extend(self.read_queue()[len(entries) :])
+                temporary = self.queue_file.with_name(self.queue_file.name + ".tmp")
+                with open(temporary, "w", encoding="utf-8") as f:
+                    for entry in remaining:
+                        f.write(entry.to_json() + "\n")
+                os.replace(temporary, self.queue_file)
+        if unavailable:
+            self.breaker.record_failure()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _on_state_change(self, state: CircuitState) -> None:
+        self.log.warning("%s circuit breaker is %s", self.name, state)
+        if state == CircuitState.OPEN:
+            self._start_prober(self.breaker.reset_seconds)
+
+    def _start_prober(self, delay: float) -> None:
+        if self._prober is not None and self._prober.is_alive():
+            return
+        self._prober = threading.Thread(
+            target=self._probe_loop,
+            args=(delay,),
+            name=f"{self.name}Prober",
+            daemon=True,
+        )
+        self._prober.start()
+
+    def _next_probe_delay(self) -> float:
+        return max(self.breaker.retry_in() or self.breaker.reset_seconds, 1.0)
+
+    def _probe_loop(self, delay: float) -> None:
+        while not self._stop.wait(delay):
+            delay = self._next_probe_delay()
+            if self.breaker.state != CircuitState.CLOSED:
+                if not self.breaker.allow_request():
+                    continue
+                if not self.probe():
+                    self.breaker.record_failure()
+                    delay = self._next_probe_delay()
+                    continue
+                self.breaker.record_success()
+            self.drain()
+            if self.breaker.state == CircuitState.CLOSED and not self.queued_count():
+                return
+            delay = self._next_probe_delay()
@@ -0,0 +1,137 @@
+import threading
+from logging import Logger
+from typing import Iterable, Optional
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.time_entry import (
+    IExtendableTimeEntryService,
+    ITimeEntryService,
+)
+from time_tracker.models.time_entry import (
+    TimeEntry,
+    TimeEntryResponse,
+    local_datetime,
+)
+from time_tracker.providers.metrics import METRICS
+
+
+def comments_compatible(first: Optional[str], second: Optional[str]) -> bool:
+    return not first or not second or first == second
+
+
+def can_coalesce(previous: TimeEntry, entry: TimeEntry) -> bool:
+    """Whether entry directly continues previous on the same issue
+
+    Args:
+        previous (TimeEntry): The earlier entry
+        entry (TimeEntry): The later entry
+
+    Returns:
+        bool: True when the issues match, entry starts where previous ends and the comments agree
+    """
+    return (
+        previous.issue_number == entry.issue_number
+        and local_datetime(previous.to_time) == local_datetime(entry.from_time)
+        and comments_compatible(previous.comment, entry.comment)
+    )
+
+
+def merge_entries(previous: TimeEntry, entry: TimeEntry) -> TimeEntry:
+    return TimeEntry(
+        previous.issue,
+        previous.from_time,
+        entry.to_time,
+        previous.comment or entry.comment,
+    )
+
+
+def coalesce(entries: Iterable[TimeEntry]) -> list[tuple[TimeEntry, int]]:
+    """Merges runs of adjacent entries that continue each other
+
+    Args:
+        entries (Iterable[TimeEntry]): The entries in chronological order
+
+    Returns:
+        list[tuple[TimeEntry, int]]: Each merged entry with the number of entries it replaces
+    """
+    merged: list[tuple[TimeEntry, int]] = []
+    for entry in entries:
+        if merged and can_coalesce(merged[-1][0], entry):
+            previous, count = merged[-1]
+            merged[-1] = (merge_entries(previous, entry), count + 1)
+        else:
+            merged.append((entry, 1))
+    return merged
+
+
+class CoalescingTimeEntryService(ITimeEntryService):
+    """Merges contiguous same-issue entries before they reach a sink
+
+    Entries within a batch are merged before submission. When the sink supports extend_work, an
+    entry that continues the last one submitted extends that record (e.g. the open Jira worklog)
+    instead of creating a new one. Calls are serialised, since a circuit breaker in front may
+    drain its queue through this service while new entries are logged.
+    """
+
+    log: Logger
+
+    def __init__(self, log_provider: ILoggingProvider, service: ITimeEntryService):
+        self.log = log_provider.get_logger("CoalescingTimeEntryService")
+        self.service = service
+        self.open_entry: Optional[TimeEntry] = None
+        # held across each submission and the open_entry update that follows it
+        self._lock = threading.Lock()
+
+    def _extend(self, entry: TimeEntry) -> Optional[TimeEntryResponse]:
+        if (
+            self.open_entry is None
+            or not isinstance(self.service, IExtendableTimeEntryService)
+            or not can_coalesce(self.open_entry, entry)
+        ):
+            return None
+        merged = merge_entries(self.open_entry, entry)
+        response = self.service.extend_work(self.open_entry, merged)
+        if not response.success:
+            self.log.debug("Could not extend %s: %s", self.open_entry.key, response)
+            return None
+        METRICS.increment("coalescing.extended")
+        self.open_entry = merged
+        return response
+
+    def log_work(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        with self._lock:
+            response = self._extend(time_entry)
+            if response is None:
+                response = self.service.log_work(time_entry)
+                self.open_entry = time_entry if response.success else None
+        return response
+
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        groups = coalesce(time_entries)
+        if not groups:
+            return []
+        METRICS.increment(
+            "coalescing.merged", sum(count for _, count in groups) - len(groups)
+        )
+        responses: list[TimeEntryResponse] = []
+        pending = groups
+        with self._lock:
+            extended = self._extend(groups[0][0])
+            if extended is not None:
+                responses.append(extended)
+                pending = groups[1:]
+            if pending:
+                pending_responses = self.service.log_work_batch(
+                    [entry for entry, _ in pending]
+                )
+                responses.extend(pending_responses)
+                last_entry, _ = pending[-1]
+                self.open_entry = last_entry if pending_responses[-1].success else None
+        # every original entry gets the response of the group it was merged into
+        return [
+            response
+            for response, (_, count) in zip(responses, groups)
+            for _ in range(count)
+        ]
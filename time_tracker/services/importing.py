@@ -0,0 +1,387 @@
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from logging import Logger
+from pathlib import Path
+from time import time
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.importing import (
+    IMPORT_CHUNK_ROWS,
+    IMPORT_FLUSH_ENTRIES,
+    IMPORT_MAX_ERRORS,
+    ImportFormat,
+    ImportMapping,
+    ImportProgress,
+    ImportResult,
+    ImportStage,
+    ParsedChunk,
+)
+from time_tracker.models.issue import ACTIVE_ISSUES_FILE, Issue, IssueList
+from time_tracker.models.settings import WORKING_DIR
+from time_tracker.models.time_entry import local_datetime, time_entry_log_name
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.issue import IssueService
+from time_tracker.services.locking import FileLock, path_lock
+from time_tracker.services.streaming import iter_json_array
+from time_tracker.services.sync import entry_id, write_atomic
+
+
+def parse_time(value: Any, day: Any, time_format: Optional[str]) -> datetime:
+    """Parses an exported time into a naive local datetime"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value)
+    text = f"{day} {value}" if day else str(value).strip()
+    if time_format:
+        return datetime.strptime(text, time_format)
+    try:
+        return local_datetime(datetime.fromisoformat(text))
+    except ValueError:
+        return datetime.fromtimestamp(float(text))
+
+
+def parse_duration(value: Any) -> timedelta:
+    """Parses H:MM[:SS] or decimal hours"""
+    text = str(value).strip()
+    if ":" in text:
+        hours, minutes, seconds = ([float(part) for part in text.split(":")] + [0, 0])[
+            :3
+        ]
+        return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    return timedelta(hours=float(text))
+
+
+def parse_chunk(
+    mapping: ImportMapping,
+    header: Optional[list[str]],
+    first_row: int,
+    rows: list,
+    created: float,
+) -> ParsedChunk:
+    """Maps a chunk of exported rows to entries encoded as by TimeEntry.to_dict
+
+    Runs in the import's worker processes, so it only takes and returns plain data.
+
+    Args:
+        mapping (ImportMapping): The columns holding each part of an entry
+        header (Optional[list[str]]): The column names of csv rows, None for json records
+        first_row (int): The number of the first row, for error messages
+        rows (list): Csv rows, json records or lines of json
+        created (float): The created timestamp given to the entries' issues
+
+    Returns:
+        ParsedChunk: The entries by day and key, and the rows that couldn't be mapped
+    """
+    chunk = ParsedChunk(rows=len(rows))
+    columns = {name: index for index, name in enumerate(header or ())}
+    for number, row in enumerate(rows, first_row):
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            if header is not None:
+                get = lambda column: (
+                    row[columns[column]] if column in columns else None
+                )
+            else:
+                get = lambda column: row.get(column) if column else None
+            issue, issue_created = get(mapping.issue), created
+            if isinstance(issue, dict):
+                issue_number = str(issue["issue_number"]).strip()
+                description = issue.get("description") or ""
+                issue_created = issue.get("created", created)
+            else:
+                issue_number = str(issue or "").strip()
+                description = str(get(mapping.description) or "")
+            if not issue_number:
+                raise ValueError("no issue")
+            start_day = get(mapping.start_date) if mapping.start_date else None
+            from_time = parse_time(get(mapping.start), start_day, mapping.time_format)
+            end = get(mapping.end) if mapping.end else None
+            if end not in (None, ""):
+                end_day = get(mapping.end_date) if mapping.end_date else start_day
+                to_time = parse_time(end, end_day, mapping.time_format)
+                if to_time < from_time and start_day and not mapping.end_date:
+                    # only times of day were given and the entry runs past midnight
+                    to_time += timedelta(days=1)
+            elif mapping.duration:
+                to_time = from_time + parse_duration(get(mapping.duration))
+            else:
+                raise ValueError("no end or duration")
+            if to_time < from_time:
+                raise ValueError("ends before it starts")
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            chunk.rejected += 1
+            if len(chunk.errors) < IMPORT_MAX_ERRORS:
+                chunk.errors.append(f"row {number}: {e!r}")
+            continue
+        comment = get(mapping.comment) if mapping.comment else None
+        entry = {
+            "issue": {
+                "issue_number": issue_number,
+                "description": description,
+                "created": issue_created,
+            },
+            "from_time": from_time.timestamp(),
+            "to_time": to_time.timestamp(),
+            "comment": comment or None,
+        }
+        day_entries = chunk.days.setdefault(from_time.toordinal(), {})
+        key = entry_id(entry)
+        chunk.duplicates += key in day_entries
+        day_entries[key] = entry
+        if description or issue_number not in chunk.issues:
+            chunk.issues[issue_number] = description
+    return chunk
+
+
+def write_day(path: Path, day: int, entries: dict[str, dict], dry_run: bool) -> int:
+    """Adds entries to a day log, skipping ones it already has
+
+    Returns:
+        int: The number of entries added
+    """
+    # the same locks a running tracker takes to log, so neither drops the other's entries
+    with path_lock(path).write(), FileLock(path).acquire():
+        try:
+            with open(path, "r") as f:
+                entry_log = json.load(f)
+        except FileNotFoundError:
+            midnight = datetime.combine(date.fromordinal(day), datetime.min.time())
+            entry_log = {"date": midnight.timestamp(), "entries": []}
+        existing = {entry_id(entry) for entry in entry_log["entries"]}
+        new_entries = [entry for key, entry in entries.items() if key not in existing]
+        if new_entries and not dry_run:
+            entry_log["entries"].extend(new_entries)
+            entry_log["entries"].sort(key=lambda entry: entry["from_time"])
+            write_atomic(path, json.dumps(entry_log).encode())
+    return len(new_entries)
+
+
+class InlineExecutor(Executor):
+    """Runs submitted work right away, when a process pool would only add overhead"""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class TimeEntryImportService:
+    """Imports time entries exported from spreadsheets and other trackers
+
+    Rows are read in chunks of IMPORT_CHUNK_ROWS and mapped to entries by a pool of worker
+    processes. Entries are then grouped per day and each day log is read and written in the
+    pool, skipping entries the log already has. Days are written whenever IMPORT_FLUSH_ENTRIES
+    entries are pending and once more at the end, so memory stays bounded for any size of
+    export, at the cost of writing a day more than once when its rows are spread through the
+    file. Importing the same file twice adds nothing the second time.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        issue_service: IssueService,
+        working_dir: Path = WORKING_DIR,
+        workers: Optional[int] = None,
+    ):
+        self.log = log_provider.get_logger("TimeEntryImportService")
+        self.issue_service = issue_service
+        self.working_dir = working_dir
+        self.workers = workers or os.cpu_count() or 1
+
+    def make_executor(self) -> Executor:
+        if self.workers <= 1:
+            return InlineExecutor()
+        return ProcessPoolExecutor(self.workers)
+
+    @METRICS.timed("import.import_file")
+    def import_file(
+        self,
+        path: Path,
+        mapping: ImportMapping,
+        format: Optional[ImportFormat] = None,
+        add_issues: bool = False,
+        dry_run: bool = False,
+        progress: Optional[Callable[[ImportProgress], None]] = None,
+    ) -> ImportResult:
+        """Imports the entries of an export into the day logs
+
+        Args:
+            path (Path): The csv, json or json lines file
+            mapping (ImportMapping): The columns holding each part of an entry
+            format (Optional[ImportFormat], optional): The file's format. Defaults to the
+                format matching its extension.
+            add_issues (bool, optional): Add issues not in the active list to it. Defaults to
+                False.
+            dry_run (bool, optional): Count what would be imported without writing. Defaults to
+                False.
+            progress (Optional[Callable[[ImportProgress], None]], optional): Called as chunks
+                are parsed and days written. Defaults to None.
+
+        Returns:
+            ImportResult: The entries imported, already present and rejected
+        """
+        format = format or self.format_of(path)
+        report = progress or (lambda _: None)
+        result = ImportResult()
+        days: dict[int, dict[str, dict]] = {}
+        pending = 0
+        written_days: set[int] = set()
+        # keys of the entries a dry run has counted, as nothing is written to dedupe against
+        counted: Optional[dict[int, set[str]]] = {} if dry_run else None
+        issues: dict[str, str] = {}
+        with self.make_executor() as executor:
+            for chunk in self.parse(executor, path, format, mapping):
+                result.rows += chunk.rows
+                result.rejected += chunk.rejected
+                result.duplicates += chunk.duplicates
+                result.errors.extend(
+                    chunk.errors[: IMPORT_MAX_ERRORS - len(result.errors)]
+                )
+                for day, entries in chunk.days.items():
+                    day_entries = days.setdefault(day, {})
+                    before = len(day_entries)
+                    day_entries.update(entries)
+                    pending += len(day_entries) - before
+                    result.duplicates += before + len(entries) - len(day_entries)
+                for issue_number, description in chunk.issues.items():
+                    if description or issue_number not in issues:
+                        issues[issue_number] = description
+                report(ImportProgress(ImportStage.PARSING, result.rows))
+                if pending >= IMPORT_FLUSH_ENTRIES:
+                    self.write_days(executor, days, result, dry_run, counted, report)
+                    written_days.update(days)
+                    days, pending = {}, 0
+            self.write_days(executor, days, result, dry_run, counted, report)
+            written_days.update(days)
+        result.days = len(written_days)
+
+        if add_issues:
+            result.issues_added = self.add_issues(issues, dry_run)
+        METRICS.increment("import.entries", result.imported)
+        self.log.info("Imported %s: %s", path, result)
+        return result
+
+    def write_days(
+        self,
+        executor: Executor,
+        days: dict[int, dict[str, dict]],
+        result: ImportResult,
+        dry_run: bool,
+        counted: Optional[dict[int, set[str]]],
+        report: Callable[[ImportProgress], None],
+    ) -> None:
+        """Adds the pending entries of each day to its log in the pool, counting the results"""
+        if counted is not None:
+            for day, entries in days.items():
+                seen = counted.setdefault(day, set())
+                for key in seen.intersection(entries):
+                    del entries[key]
+                    result.duplicates += 1
+                seen.update(entries)
+        ordered = sorted(days)
+        written = executor.map(
+            write_day,
+            [
+                self.working_dir / time_entry_log_name(date.fromordinal(day))
+                for day in ordered
+            ],
+            ordered,
+            [days[day] for day in ordered],
+            [dry_run] * len(ordered),
+            chunksize=max(1, len(ordered) // (self.workers * 4)),
+        )
+        for done, (day, added) in enumerate(zip(ordered, written), 1):
+            result.imported += added
+            result.duplicates += len(days[day]) - added
+            report(ImportProgress(ImportStage.WRITING, done, len(ordered)))
+
+    def parse(
+        self,
+        executor: Executor,
+        path: Path,
+        format: ImportFormat,
+        mapping: ImportMapping,
+    ) -> Iterator[ParsedChunk]:
+        """Parses the chunks of a file in the pool, yielding them in order
+
+        At most two chunks per worker are in flight, so memory stays bounded by the entries
+        parsed rather than the rows read.
+        """
+        created = time()
+        pending: deque[Future] = deque()
+        first_row = 1
+        for header, rows in self.iter_chunks(path, format):
+            pending.append(
+                executor.submit(parse_chunk, mapping, header, first_row, rows, created)
+            )
+            first_row += len(rows)
+            if len(pending) >= self.workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def iter_chunks(
+        self, path: Path, format: ImportFormat
+    ) -> Iterator[tuple[Optional[list[str]], list]]:
+        if format == ImportFormat.CSV:
+            with open(path, "r", newline="", encoding="utf-8-sig") as f:
+                reader = csv.reader(f)
+                header = [column.strip() for column in next(reader, [])]
+                yield from (
+                    (header, rows) for rows in iter_batches(reader, IMPORT_CHUNK_ROWS)
+                )
+        elif format == ImportFormat.JSON_LINES:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = (line for line in f if line.strip())
+                yield from (
+                    (None, rows) for rows in iter_batches(lines, IMPORT_CHUNK_ROWS)
+                )
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                # a day log or team upload is an object with the records under "entries"
+                key = "entries" if f.read(1024).lstrip().startswith("{") else None
+                f.seek(0)
+                records = iter_json_array(f, key)
+                yield from (
+                    (None, rows) for rows in iter_batches(records, IMPORT_CHUNK_ROWS)
+                )
+
+    def add_issues(self, issues: dict[str, str], dry_run: bool) -> int:
+        path = self.working_dir / ACTIVE_ISSUES_FILE.name
+        active_list = self.issue_service.read_list(path) or IssueList(path)
+        known = {issue.issue_number for issue in active_list.issues}
+        new_issues = [
+            Issue(issue_number, description)
+            for issue_number, description in issues.items()
+            if issue_number not in known
+        ]
+        if new_issues and not dry_run:
+            active_list.extend(new_issues)
+            self.issue_service.save_list(active_list)
+        return len(new_issues)
+
+    @staticmethod
+    def format_of(path: Path) -> ImportFormat:
+        suffix = path.suffix.lower().lstrip(".")
+        if suffix in ("jsonl", "ndjson"):
+            return ImportFormat.JSON_LINES
+        if suffix == "json":
+            return ImportFormat.JSON
+        return ImportFormat.CSV
+
+
+def iter_batches(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
+import os
+from datetime import datetime
 from logging import Logger
 from pathlib import Path
+from typing import Optional
 
 from time_tracker.interfaces.issue import IIssueService
 from time_tracker.models.issue import (
@@ -8,41 +10,110 @@ from time_tracker.models.issue import (
     DELETED_ISSUES_FILE,
     Issue,
     IssueList,
+    IssueListSnapshot,
 )
 from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.models.prompts import PromptEvents
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.locking import FileLock, path_lock
 from time_tracker.views.prompt import RetryPromptView
 
 
+def file_version(stat: os.stat_result) -> tuple[int, int, int]:
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def snapshot_of(
+    issue_list: IssueList, version: tuple[int, int, int]
+) -> IssueListSnapshot:
+    return IssueListSnapshot(
+        version, {issue.issue_number: issue.description for issue in issue_list.issues}
+    )
+
+
+def merge_changes(issue_list: IssueList, current: IssueList) -> list[Issue]:
+    """Applies the changes made to a list since its snapshot onto the file's current issues
+
+    Issues are matched by issue number. A list without a snapshot was never read from the file,
+    so its issues are all treated as added and nothing is removed.
+
+    Returns:
+        list[Issue]: The current issues in their order with the changes applied, followed by the
+            issues this list added
+    """
+    base = issue_list.snapshot.descriptions if issue_list.snapshot else {}
+    mine = {issue.issue_number: issue for issue in issue_list.issues}
+    merged = {
+        issue.issue_number: issue
+        for issue in current.issues
+        if issue.issue_number in mine or issue.issue_number not in base
+    }
+    for issue_number, issue in mine.items():
+        if base.get(issue_number) != issue.description:
+            # added or changed here; an edit here wins over a removal elsewhere
+            merged[issue_number] = issue
+    return list(merged.values())
+
+
 class IssueService(IIssueService):
+    """Reads and writes the issue list files
+
+    Safe to share between threads and processes. Loads take a per file reader lock, saves take
+    the writer lock plus an advisory file lock and write atomically through a temporary file.
+    Saves are optimistic: a list is merged with whatever was saved since it was read instead of
+    overwriting it, so the GUI and a background sync don't lose each other's updates.
+
+    I/O errors are offered to the user for a retry. Services used off the GUI thread, or
+    without a display, are made with prompt=False and raise the error after logging it instead.
+    """
+
     log: Logger
 
-    def __init__(self, log_provider: ILoggingProvider):
+    def __init__(self, log_provider: ILoggingProvider, prompt: bool = True):
+        self.log_provider = log_provider
         self.log = log_provider.get_logger("IssueService")
+        self.prompt = prompt
 
+    @METRICS.timed("issue_service.load_list")
     def load_list(self, path: Path) -> IssueList:
         try:
-            if not path.exists():
+            with path_lock(path).read():
+                issue_list = self.read_list(path)
+            if issue_list is None:
                 self.log.info(f"Issue List at '{path}' not found, creating new list")
                 new_list = IssueList(path)
-                with open(path, "w") as f:
-                    f.write(new_list.to_json())
+                self.save_list(new_list)
                 return new_list
-            with open(path, "r") as f:
-                return IssueList.from_json(f.read(), many=True).issues
-        except FileNotFoundError as e:
-            self.log.error(e)
-            new_list = IssueList(path, [])
-            self.save_list(new_list)
-            return new_list
+            return issue_list
         except Exception as e:
             self.log.error(e)
+            if not self.prompt:
+                raise
             event = RetryPromptView(
-                f"An error occurred while loading {path}\nError: {e}"
+                f"An error occurred while loading {path}\nError: {e}", self.log_provider
             ).run()
             if event == PromptEvents.RETRY:
                 return self.load_list(path)
 
+    def read_list(self, path: Path) -> Optional[IssueList]:
+        """Reads an issue list along with a snapshot of the file it came from
+
+        Writes replace the file atomically, so the content and the version read through one open
+        file always agree and reading needs no file lock.
+
+        Returns:
+            Optional[IssueList]: The list, or None if the file doesn't exist
+        """
+        try:
+            with open(path, "r") as f:
+                version = file_version(os.fstat(f.fileno()))
+                issue_list = IssueList.from_json(f.read())
+        except FileNotFoundError:
+            return None
+        issue_list.filepath = path
+        issue_list.snapshot = snapshot_of(issue_list, version)
+        return issue_list
+
     def load_active_issues(self) -> IssueList:
         return self.load_list(ACTIVE_ISSUES_FILE)
 
@@ -52,49 +123,70 @@ class IssueService(IIssueService):
     def load_lists(self) -> tuple[IssueList, IssueList]:
         return self.load_active_issues(), self.load_deleted_issues()
 
+    @METRICS.timed("issue_service.save_list")
     def save_list(self, issue_list: IssueList, filepath: Path = None) -> None:
         if filepath is None:
             filepath = issue_list.filepath
-        else:
+        elif filepath != issue_list.filepath:
+            # the snapshot describes the old file, so saving elsewhere writes everything
             issue_list.filepath = filepath
+            issue_list.snapshot = None
+        if issue_list.snapshot is not None and not issue_list.dirty:
+            METRICS.increment("issue_service.skipped_saves")
+            return
         try:
-            updated_list = IssueList(filepath, issue_list.issues)
-            with open(updated_list.filepath, "w") as f:
-                f.write(
-                    updated_list.to_json(),
-                    many=True,
-                )
-            updated_list
+            with path_lock(filepath).write(), FileLock(filepath).acquire():
+                self.write_merged(issue_list, filepath)
         except Exception as e:
             self.log.error(e)
+            if not self.prompt:
+                raise
             event = RetryPromptView(
-                f"An error occurred while saving file '{filepath}'\nError: {e}"
+                f"An error occurred while saving file '{filepath}'\nError: {e}",
+                self.log_provider,
             ).run()
             if event == PromptEvents.RETRY:
                 self.save_list(issue_list, filepath)
 
-    def save_active_list(self, active_list: IssueList) -> None:
-        active_list.filepath = ACTIVE_ISSUES_FILE
+    def write_merged(self, issue_list: IssueList, filepath: Path) -> None:
+        """Writes the list, first merging in changes saved since it was read
+
+        Must hold the write locks for the file. If the file still has the version the list was
+        read from it is replaced as is; otherwise the issues this list added, changed or removed
+        since its snapshot are applied to the file's current issues by issue number. The list is
+        updated to what was written, so it can be saved again.
+        """
+        current = self.read_list(filepath)
+        if current is not None and (
+            issue_list.snapshot is None
+            or current.snapshot.version != issue_list.snapshot.version
+        ):
+            METRICS.increment("issue_service.merges")
+            issue_list.issues = merge_changes(issue_list, current)
+        updated_list = IssueList(filepath, issue_list.issues, issue_list.updated)
+        temporary = filepath.with_name(filepath.name + ".tmp")
+        with open(temporary, "w") as f:
+            f.write(updated_list.to_json())
+            version = file_version(os.fstat(f.fileno()))
+        os.replace(temporary, filepath)
+        issue_list.snapshot = snapshot_of(issue_list, version)
+        issue_list.mark_clean()
+
+    def save_active_issues(self, active_list: IssueList) -> None:
         self.save_list(active_list, ACTIVE_ISSUES_FILE)
 
-    def save_deleted_list(self, deleted_list: IssueList) -> None:
-        now = datetime.now()
-        deleted_list.filepath = DELETED_ISSUES_FILE
-        deleted_list.issues = [
-            issue
-            for issue in deleted_list.issues
-            if now - issue.created >= timedelta(days=30)
-        ]
+    def save_deleted_issues(self, deleted_list: IssueList) -> None:
+        # expired issues are dropped by IssueRetentionService, not on every save
         self.save_list(deleted_list, DELETED_ISSUES_FILE)
 
     def save_all_lists(
         self, active_issue_list: IssueList, deleted_issue_list: IssueList
     ) -> None:
-        self.save_active_list(active_issue_list)
-        self.save_deleted_list(deleted_issue_list)
+        self.save_active_issues(active_issue_list)
+        self.save_deleted_issues(deleted_issue_list)
 
     def new_issue(self, issue: Issue) -> IssueList:
         active_list = self.load_active_issues()
         active_list.append(issue)
-        self.save_active_list(active_list)
+        self.save_active_issues(active_list)
         return active_list
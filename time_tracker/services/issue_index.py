@@ -0,0 +1,55 @@
+from typing import Optional
+
+from time_tracker.models.issue import Issue
+
+
+def search_key(issue: Issue) -> str:
+    return f"{issue.issue_number} {issue.description}".casefold()
+
+
+class IssueIndex:
+    """Case insensitive substring search over a list of issues
+
+    The lowered text of every issue is computed once and kept by issue number, so a search is a
+    single pass of substring checks. Typing usually extends the previous query, in which case
+    only the previous matches are searched again.
+    """
+
+    def __init__(self, issues: list[Issue]):
+        self.issues = issues
+        self.keys = {issue.issue_number: search_key(issue) for issue in issues}
+        self.last_query: Optional[str] = None
+        self.last_matches: list[Issue] = []
+
+    def add(self, issue: Issue) -> None:
+        """Indexes an issue appended to the list"""
+        self.keys[issue.issue_number] = search_key(issue)
+        self.last_query = None
+
+    def remove(self, issue: Issue) -> None:
+        """Forgets an issue removed from the list"""
+        self.keys.pop(issue.issue_number, None)
+        self.last_query = None
+
+    def search(self, query: str) -> list[Issue]:
+        """Finds the issues whose number or description contains the query
+
+        Args:
+            query (str): The text to look for, ignoring case
+
+        Returns:
+            list[Issue]: The matching issues in list order; the list itself for an empty query
+        """
+        query = query.casefold()
+        if not query:
+            return self.issues
+        if self.last_query is not None and query.startswith(self.last_query):
+            candidates = self.last_matches
+        else:
+            candidates = self.issues
+        keys = self.keys
+        matches = [
+            issue for issue in candidates if query in keys.get(issue.issue_number, "")
+        ]
+        self.last_query, self.last_matches = query, matches
+        return matches
@@ -0,0 +1,155 @@
+import atexit
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Iterable, Optional
+
+from time_tracker.interfaces.issue import IIssueMetadataCache
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.issue import ISSUE_METADATA_FILE, IssueMetadata
+from time_tracker.providers.metrics import METRICS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issue_metadata (
+    issue_number TEXT PRIMARY KEY,
+    summary TEXT,
+    status TEXT,
+    assignee TEXT,
+    updated REAL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issue_metadata_used ON issue_metadata (used);
+"""
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+def _datetime(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value) if value is not None else None
+
+
+class IssueMetadataCache(IIssueMetadataCache):
+    """Issue metadata kept in a small sqlite file, so pickers can show it offline
+
+    The whole store is read into memory when it's opened and lookups never touch the disk, so
+    views can call it from the UI thread. Stores are written in one transaction. At most
+    capacity issues are kept, storing more evicts the ones least recently looked up or stored.
+    When an issue was last looked up is written along with the next store, or on close, which
+    runs at exit.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        path: Path = ISSUE_METADATA_FILE,
+        capacity: int = 5000,
+    ):
+        self.log = log_provider.get_logger("IssueMetadataCache")
+        self.path = path
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, IssueMetadata] = OrderedDict()
+        # lookups not yet written, issue number to when
+        self._used: dict[str, int] = {}
+        # counts lookups and stores, ordering them even when they land in the same instant
+        self._clock = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        rows = self._connection.execute(
+            "SELECT issue_number, summary, status, assignee, updated, used "
+            + "FROM issue_metadata ORDER BY used"
+        )
+        for issue_number, summary, status, assignee, updated, used in rows:
+            self._entries[issue_number] = IssueMetadata(
+                issue_number, summary, status, assignee, _datetime(updated)
+            )
+            self._clock = used
+        self.log.debug("Loaded metadata of %s issues", len(self._entries))
+        self._closed = False
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_many(self, issue_numbers: Iterable[str]) -> dict[str, IssueMetadata]:
+        found = {}
+        with self._lock:
+            self._clock += 1
+            for issue_number in issue_numbers:
+                metadata = self._entries.get(issue_number)
+                if metadata is None:
+                    continue
+                self._entries.move_to_end(issue_number)
+                self._used[issue_number] = self._clock
+                found[issue_number] = metadata
+        METRICS.increment("issue_metadata.hits", len(found))
+        return found
+
+    @METRICS.timed("issue_metadata.put_many")
+    def put_many(self, metadata: Iterable[IssueMetadata]) -> None:
+        with self._lock:
+            if self._closed:
+                # a refresh finishing while the app exits
+                return
+            self._clock += 1
+            stored = []
+            for item in metadata:
+                self._entries[item.issue_number] = item
+                self._entries.move_to_end(item.issue_number)
+                self._used.pop(item.issue_number, None)
+                stored.append(
+                    (
+                        item.issue_number,
+                        item.summary,
+                        item.status,
+                        item.assignee,
+                        _timestamp(item.updated),
+                        self._clock,
+                    )
+                )
+            evicted = []
+            while len(self._entries) > self.capacity:
+                issue_number, _ = self._entries.popitem(last=False)
+                self._used.pop(issue_number, None)
+                evicted.append((issue_number,))
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO issue_metadata "
+                    + "(issue_number, summary, status, assignee, updated, used) "
+                    + "VALUES (?, ?, ?, ?, ?, ?)",
+                    stored,
+                )
+                self._connection.executemany(
+                    "DELETE FROM issue_metadata WHERE issue_number = ?", evicted
+                )
+                self._write_used()
+        if evicted:
+            METRICS.increment("issue_metadata.evicted", len(evicted))
+
+    def close(self) -> None:
+        """Writes the pending lookups and closes the store, later calls do nothing"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            with self._connection:
+                self._write_used()
+            self._connection.close()
+        atexit.unregister(self.close)
+
+    def _write_used(self) -> None:
+        self._connection.executemany(
+            "UPDATE issue_metadata SET used = ? WHERE issue_number = ?",
+            [(used, issue_number) for issue_number, used in self._used.items()],
+        )
+        self._used.clear()
@@ -0,0 +1,156 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.time_entry import (
+    ITimeEntryQueryService,
+    ITimeEntryService,
+)
+from time_tracker.models.issue import Issue
+from time_tracker.models.replay import ReplayResult
+from time_tracker.models.time_entry import (
+    TimeEntry,
+    TimeEntryResponseDisposition,
+)
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.throttling import TokenBucket
+
+# failures are counted in full but only this many keys are kept for the report
+MAX_REPORTED_FAILURES = 100
+
+
+class CheckpointLedger:
+    """Append only record of the entry keys already delivered to a sink
+
+    Each key is flushed as soon as it is recorded, so an interrupted replay resumes where it
+    stopped.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.keys: set[str] = set()
+        self._lock = threading.Lock()
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.keys.update(line.strip() for line in f if line.strip())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def record(self, key: str) -> None:
+        with self._lock:
+            if key in self.keys:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(f"{key}\n")
+            self.keys.add(key)
+
+
+class ReplayService:
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        source: ITimeEntryQueryService,
+        sink: ITimeEntryService,
+        ledger: CheckpointLedger,
+        concurrency: int = 4,
+        rate_per_second: float = 5.0,
+    ):
+        self.log = log_provider.get_logger("ReplayService")
+        self.source = source
+        self.sink = sink
+        self.ledger = ledger
+        self.concurrency = max(1, concurrency)
+        self.limiter = TokenBucket(rate_per_second, capacity=self.concurrency)
+
+    def replay(
+        self,
+        start: datetime,
+        end: datetime,
+        issue: Optional[Issue | str] = None,
+        dry_run: bool = False,
+    ) -> ReplayResult:
+        """Submits the recorded entries in a range that are not yet in the ledger
+
+        Entries are streamed from the source and at most twice the concurrency are in flight at
+        once, so memory does not grow with the size of the range.
+
+        Args:
+            start (datetime): The inclusive start of the range
+            end (datetime): The exclusive end of the range
+            issue (Optional[Issue | str], optional): Only replay this issue. Defaults to None.
+            dry_run (bool, optional): Count what would be submitted without submitting. Defaults to False.
+
+        Returns:
+            ReplayResult: The counts of submitted, skipped and failed entries
+        """
+        result = ReplayResult()
+        result_lock = threading.Lock()
+        in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+        abort = threading.Event()
+        # keys handed to the executor, so a duplicate is not submitted before the first is recorded
+        claimed: set[str] = set()
+
+        def submit(entry: TimeEntry) -> None:
+            try:
+                if abort.is_set():
+                    return
+                self.limiter.acquire()
+                response = self.sink.log_work(entry)
+                with result_lock:
+                    if response.success:
+                        self.ledger.record(entry.key)
+                        result.submitted += 1
+                        METRICS.increment("replay.submitted")
+                        return
+                    result.failed += 1
+                    if len(result.failures) < MAX_REPORTED_FAILURES:
+                        result.failures.append(f"{entry.key}: {response.message}")
+                    METRICS.increment("replay.failed")
+                if response.disposition == TimeEntryResponseDisposition.NO_AUTH:
+                    # every remaining entry would fail the same way
+                    abort.set()
+            except Exception as e:
+                self.log.error("Replaying %s failed: %s", entry.key, e)
+                with result_lock:
+                    result.failed += 1
+                    if len(result.failures) < MAX_REPORTED_FAILURES:
+                        result.failures.append(f"{entry.key}: {e}")
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="Replay"
+        ) as executor:
+            for entry in self.source.iter_entries(start, end, issue):
+                if abort.is_set():
+                    break
+                if entry.key in self.ledger or entry.key in claimed:
+                    result.skipped += 1
+                    continue
+                claimed.add(entry.key)
+                if dry_run:
+                    result.submitted += 1
+                    continue
+                in_flight.acquire()
+                executor.submit(submit, entry)
+                seen = result.submitted + result.skipped + result.failed
+                if seen and seen % 100 == 0:
+                    self.log.info(
+                        "Replay progress: %s submitted, %s skipped, %s failed",
+                        result.submitted,
+                        result.skipped,
+                        result.failed,
+                    )
+        result.aborted = abort.is_set()
+        return result
@@ -0,0 +1,123 @@
+import heapq
+import os
+import threading
+from datetime import datetime, timedelta
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+
+from time_tracker.interfaces.issue import IIssueService
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.models.issue import DELETED_ISSUES_FILE
+from time_tracker.models.time_entry import local_datetime
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.issue import file_version
+
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+
+class IssueRetentionService:
+    """Purges deleted issues older than the retention period on a schedule
+
+    The creation times of the deleted issues are kept in a min-heap along with the version of
+    the file they were read from. While the file is unchanged and the oldest issue is within
+    retention a pass costs one stat; otherwise the list is read, the expired issues are popped
+    off the heap and removed, and the list is saved only if something was removed.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        issue_service: IIssueService,
+        settings_provider: ISettingsProvider,
+        path: Path = DELETED_ISSUES_FILE,
+    ):
+        self.log = log_provider.get_logger("IssueRetentionService")
+        self.issue_service = issue_service
+        self.settings_provider = settings_provider
+        self.path = path
+        self.heap: list[tuple[datetime, str]] = []
+        self.version: Optional[tuple[int, int, int]] = None
+        self._stop = threading.Event()
+        self._purger: Optional[threading.Thread] = None
+
+    @METRICS.timed("issue_retention.purge")
+    def purge(self, now: Optional[datetime] = None) -> int:
+        """Removes the deleted issues created before the retention period
+
+        Args:
+            now (Optional[datetime], optional): The current time. Defaults to None, for now.
+
+        Returns:
+            int: The number of issues removed
+        """
+        retention_days = (
+            self.settings_provider.get_settings().deleted_issue_retention_days
+        )
+        if retention_days <= 0:
+            return 0
+        cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+        try:
+            version = file_version(os.stat(self.path))
+        except FileNotFoundError:
+            return 0
+        if version == self.version and (not self.heap or self.heap[0][0] >= cutoff):
+            return 0
+
+        deleted_list = self.issue_service.load_deleted_issues()
+        heap = [
+            (local_datetime(issue.created), issue.issue_number)
+            for issue in deleted_list.issues
+        ]
+        heapq.heapify(heap)
+        expired = set()
+        while heap and heap[0][0] < cutoff:
+            expired.add(heapq.heappop(heap)[1])
+        if expired:
+            for issue in [
+                issue for issue in deleted_list.issues if issue.issue_number in expired
+            ]:
+                deleted_list.remove(issue)
+            self.issue_service.save_deleted_issues(deleted_list)
+            self.log.info("Purged %s expired deleted issues", len(expired))
+            METRICS.increment("issue_retention.purged", len(expired))
+            # the save may have merged in issues deleted elsewhere
+            heap = [
+                (local_datetime(issue.created), issue.issue_number)
+                for issue in deleted_list.issues
+            ]
+            heapq.heapify(heap)
+        self.heap = heap
+        self.version = deleted_list.snapshot.version if deleted_list.snapshot else None
+        return len(expired)
+
+    def start(self, interval_seconds: float = PURGE_INTERVAL_SECONDS) -> None:
+        if self._purger is not None and self._purger.is_alive():
+            return
+        self._stop.clear()
+        self._purger = threading.Thread(
+            target=self._purge_loop,
+            args=(interval_seconds,),
+            name="IssueRetention",
+            daemon=True,
+        )
+        self._purger.start()
+
+    def stop(self) -> None:
+        if self._purger is None:
+            return
+        self._stop.set()
+        self._purger.join()
+        self._purger = None
+
+    def _purge_loop(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                self.purge()
+            except Exception as e:
+                self.log.error("Unable to purge deleted issues: %s", e)
+            if self._stop.wait(interval_seconds):
+                return
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from time_tracker.interfaces.time_entry import (
+    IExtendableTimeEntryService,
+    ITimeEntryService,
+)
+from time_tracker.models.time_entry import (
+    TimeEntry,
+    TimeEntryResponse,
+    TimeEntryResponseDisposition,
+)
+
+
+class BatchingTimeEntryService(IExtendableTimeEntryService):
+    """Hands a sink its entries in batches of at most batch_size, concurrency batches at a time"""
+
+    def __init__(
+        self,
+        service: ITimeEntryService,
+        batch_size: Optional[int] = None,
+        concurrency: int = 1,
+    ):
+        self.service = service
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+
+    def log_work(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        return self.service.log_work(time_entry)
+
+    def extend_work(self, previous: TimeEntry, entry: TimeEntry) -> TimeEntryResponse:
+        if not isinstance(self.service, IExtendableTimeEntryService):
+            return TimeEntryResponse(
+                False,
+                "The sink can't extend entries",
+                TimeEntryResponseDisposition.FAILURE,
+            )
+        return self.service.extend_work(previous, entry)
+
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        time_entries = list(time_entries)
+        size = self.batch_size or len(time_entries) or 1
+        batches = [
+            time_entries[start : start + size]
+            for start in range(0, len(time_entries), size)
+        ]
+        if len(batches) <= 1 or self.concurrency == 1:
+            return [
+                response
+                for batch in batches
+                for response in self.service.log_work_batch(batch)
+            ]
+        with ThreadPoolExecutor(
+            min(self.concurrency, len(batches)), thread_name_prefix="SinkBatch"
+        ) as executor:
+            return [
+                response
+                for responses in executor.map(self.service.log_work_batch, batches)
+                for response in responses
+            ]
@@ -0,0 +1,108 @@
+import json
+import re
+from typing import Any, Iterator, Optional, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = ",:]}"
+
+
+class JsonStreamReader:
+    """Reads JSON values one at a time from a text file without loading the whole file
+
+    Only the unconsumed part of the file is kept in memory, so the footprint is bounded by
+    the size of the largest single value plus one chunk.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or an empty string at the end of the file"""
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(
+                f"Expecting '{char}'", self.buffer, self.position
+            )
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.position)
+                # inside a container a value is always followed by a delimiter, anything
+                # else means the buffer ended part way through a number or literal
+                following = _WHITESPACE.match(self.buffer, end).end()
+                if self.eof or (
+                    following < len(self.buffer)
+                    and self.buffer[following] in _DELIMITERS
+                ):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_json_array(
+    file: TextIO, key: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Yields the items of a JSON array one at a time
+
+    Args:
+        file (TextIO): The file to read from
+        key (Optional[str], optional): When set, the array is read from this key of a top level object
+            instead of being the top level value. Defaults to None.
+        chunk_size (int, optional): Number of characters read per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Yields:
+        Any: Each decoded item of the array
+    """
+    reader = JsonStreamReader(file, chunk_size)
+    if key is not None:
+        reader.expect("{")
+        while reader.peek() != "}":
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value()
+            if reader.peek() == ",":
+                reader.position += 1
+        else:
+            return
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ",":
+            reader.position += 1
+            continue
+        reader.expect("]")
+        return
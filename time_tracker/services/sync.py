@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from logging import Logger
+from pathlib import Path
+from typing import Iterator, Optional
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.issue import ACTIVE_ISSUES_FILE, DELETED_ISSUES_FILE
+from time_tracker.models.settings import WORKING_DIR
+from time_tracker.models.sync import (
+    SYNC_STATE_DIR,
+    SyncFileState,
+    SyncResult,
+    SyncState,
+)
+from time_tracker.models.time_entry import parse_time_entry_log_name
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.locking import FileLock, path_lock
+
+ISSUE_LIST_NAMES = frozenset({ACTIVE_ISSUES_FILE.name, DELETED_ISSUES_FILE.name})
+
+
+def is_synced_file(name: str) -> bool:
+    return name in ISSUE_LIST_NAMES or parse_time_entry_log_name(name) is not None
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def record_hash(record: dict) -> str:
+    return content_hash(json.dumps(record, sort_keys=True).encode())
+
+
+def entry_id(entry: dict) -> str:
+    """The TimeEntry.key of an entry as stored in a day file"""
+    issue = entry["issue"]
+    issue_number = issue["issue_number"] if isinstance(issue, dict) else str(issue)
+    return f"{issue_number}@{int(entry['from_time'])}-{int(entry['to_time'])}"
+
+
+@dataclass(slots=True)
+class SyncedFile:
+    """One side's copy of a synced file, split into records by id"""
+
+    path: Path
+    exists: bool = False
+    hash: Optional[str] = None
+    # the file's own fields other than its records
+    header: dict = field(default_factory=dict)
+    records: dict[str, dict] = field(default_factory=dict)
+    mtime_ns: int = 0
+
+    @property
+    def is_issue_list(self) -> bool:
+        return self.path.name in ISSUE_LIST_NAMES
+
+    @property
+    def updated(self) -> float:
+        """The time the last writer wins by: the list's updated time, or the file's mtime"""
+        if self.is_issue_list and isinstance(self.header.get("updated"), (int, float)):
+            return self.header["updated"]
+        return self.mtime_ns / 1e9
+
+    def load(self) -> "SyncedFile":
+        try:
+            with open(self.path, "rb") as f:
+                content = f.read()
+                self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        except FileNotFoundError:
+            return self
+        self.exists = True
+        self.hash = content_hash(content)
+        data = json.loads(content)
+        if self.is_issue_list:
+            items = data.pop("issues", None) or []
+            self.records = {str(item["issue_number"]): item for item in items}
+        else:
+            items = data.pop("entries", None) or []
+            self.records = {entry_id(item): item for item in items}
+        self.header = data
+        return self
+
+    def record_hash(self, record: dict) -> str:
+        if self.is_issue_list:
+            # issues are compared by description, as IssueService merges them
+            return content_hash(str(record.get("description")).encode())
+        return record_hash(record)
+
+    def record_hashes(self) -> dict[str, str]:
+        return {
+            record_id: self.record_hash(record)
+            for record_id, record in self.records.items()
+        }
+
+    def dump(self, records: list[dict]) -> bytes:
+        key = "issues" if self.is_issue_list else "entries"
+        return json.dumps({**self.header, key: records}).encode()
+
+
+class WorkingDirSyncService:
+    """Syncs the issue lists and day logs of two working directories
+
+    The peer is any directory both machines can reach: a shared folder, or the other machine's
+    working directory. Files are compared by content hash, with hashes cached against size and
+    mtime, so years of unchanged logs cost a directory scan. A file that changed on either side
+    is merged record by record, issues by issue number and entries by their key, against the
+    records both sides had after the last sync: additions and removals on either side are kept,
+    and when both sides changed a record the last writer wins, going by IssueList.updated for
+    issues and by the file's modification time for entries. Only sides whose records differ
+    from the merge are rewritten.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        peer_dir: Path,
+        working_dir: Path = WORKING_DIR,
+        state_dir: Path = SYNC_STATE_DIR,
+    ):
+        self.log = log_provider.get_logger("WorkingDirSyncService")
+        self.peer_dir = peer_dir
+        self.working_dir = working_dir
+        peer_id = content_hash(str(peer_dir.resolve()).encode())
+        self.state_file = state_dir / f"peer-{peer_id}.json"
+
+    def load_state(self) -> SyncState:
+        try:
+            with open(self.state_file, "r") as f:
+                return SyncState.from_json(f.read())
+        except FileNotFoundError:
+            return SyncState(str(self.peer_dir))
+        except ValueError as e:
+            self.log.warning("Ignoring unreadable sync state: %s", e)
+            return SyncState(str(self.peer_dir))
+
+    def save_state(self, state: SyncState) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.state_file, state.to_json().encode())
+
+    def scan(self, directory: Path) -> dict[str, os.stat_result]:
+        if not directory.exists():
+            return {}
+        with os.scandir(directory) as entries:
+            return {
+                entry.name: entry.stat()
+                for entry in entries
+                if entry.is_file() and is_synced_file(entry.name)
+            }
+
+    def cached_hash(
+        self,
+        path: Path,
+        stat: Optional[os.stat_result],
+        cache: dict[str, tuple[int, int, str]],
+    ) -> Optional[str]:
+        if stat is None:
+            cache.pop(path.name, None)
+            return None
+        cached = cache.get(path.name)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        with open(path, "rb") as f:
+            digest = content_hash(f.read())
+        cache[path.name] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    @METRICS.timed("sync.sync")
+    def sync(self, dry_run: bool = False) -> SyncResult:
+        """Brings the working directory and the peer to the same records
+
+        Args:
+            dry_run (bool, optional): Count what would change without writing. Defaults to False.
+
+        Returns:
+            SyncResult: The files looked at and the records exchanged
+        """
+        self.peer_dir.mkdir(parents=True, exist_ok=True)
+        state = self.load_state()
+        local_files, peer_files = self.scan(self.working_dir), self.scan(self.peer_dir)
+        result = SyncResult()
+        names = local_files.keys() | peer_files.keys()
+        for name in state.files.keys() - names:
+            # gone from both sides
+            del state.files[name]
+        for name in sorted(names):
+            result.files += 1
+            base = state.files.get(name)
+            local_hash = self.cached_hash(
+                self.working_dir / name, local_files.get(name), state.local_hashes
+            )
+            peer_hash = self.cached_hash(
+                self.peer_dir / name, peer_files.get(name), state.peer_hashes
+            )
+            if base and (local_hash, peer_hash) == (base.local_hash, base.peer_hash):
+                result.unchanged += 1
+                continue
+            try:
+                state.files[name] = self.sync_file(name, base, result, dry_run)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.log.error("Unable to sync %s: %s", name, e)
+                result.errors.append(f"{name}: {e}")
+        if not dry_run:
+            self.save_state(state)
+        self.log.info("Synced with %s: %s", self.peer_dir, result)
+        return result
+
+    def sync_file(
+        self,
+        name: str,
+        base: Optional[SyncFileState],
+        result: SyncResult,
+        dry_run: bool,
+    ) -> SyncFileState:
+        with ExitStack() as stack:
+            for path in (self.working_dir / name, self.peer_dir / name):
+                # the same locks IssueService and TimeEntryFileService take, so a running
+                # tracker can't save or log in between the read and the write
+                stack.enter_context(path_lock(path).write())
+                stack.enter_context(FileLock(path).acquire())
+            local = SyncedFile(self.working_dir / name).load()
+            peer = SyncedFile(self.peer_dir / name).load()
+            if local.hash == peer.hash:
+                result.unchanged += 1
+                return SyncFileState(local.hash, peer.hash, local.record_hashes())
+
+            records, conflicts = merge_records(
+                local, peer, base.records if base else {}
+            )
+            result.merged += 1
+            result.conflicts += conflicts
+            merged_hashes = {
+                record_id: local.record_hash(record)
+                for record_id, record in records.items()
+            }
+            hashes = []
+            for side, destination in ((local, "received"), (peer, "sent")):
+                side_hashes = side.record_hashes()
+                changed = sum(
+                    1
+                    for record_id, digest in merged_hashes.items()
+                    if side_hashes.get(record_id) != digest
+                )
+                removed = len(side_hashes.keys() - merged_hashes.keys())
+                setattr(result, destination, getattr(result, destination) + changed)
+                result.removed += removed
+                if (changed or removed) and not dry_run:
+                    hashes.append(self.write_side(side, local, peer, records))
+                else:
+                    hashes.append(side.hash)
+            return SyncFileState(hashes[0], hashes[1], merged_hashes)
+
+    def write_side(
+        self,
+        side: SyncedFile,
+        local: SyncedFile,
+        peer: SyncedFile,
+        records: dict[str, dict],
+    ) -> Optional[str]:
+        if not records and not (local.exists and peer.exists):
+            # every record was removed along with the file on the other side
+            side.path.unlink(missing_ok=True)
+            return None
+        if not side.header:
+            side.header = dict((local if local.exists else peer).header)
+        if side.is_issue_list:
+            side.header["filepath"] = str(side.path)
+            side.header["updated"] = max(local.updated, peer.updated)
+        ordered = list(records.values())
+        if not side.is_issue_list:
+            ordered.sort(key=lambda entry: (entry["from_time"], entry_id(entry)))
+        content = side.dump(ordered)
+        write_atomic(side.path, content)
+        return content_hash(content)
+
+
+def merge_records(
+    local: SyncedFile, peer: SyncedFile, base: dict[str, str]
+) -> tuple[dict[str, dict], int]:
+    """Three way merge of two sides' records against the record hashes of the last sync
+
+    A record added or changed on one side since the base is taken from that side, one removed
+    on one side and unchanged on the other is removed, and a removal loses to an edit. When both
+    sides changed a record, the side written last wins.
+
+    Returns:
+        tuple[dict[str, dict], int]: The merged records by id, local order first, and the
+            number of conflicts resolved by last writer
+    """
+    local_hashes, peer_hashes = local.record_hashes(), peer.record_hashes()
+    peer_wins = peer.updated > local.updated
+    merged: dict[str, dict] = {}
+    conflicts = 0
+    for record_id in iter_ids(local, peer):
+        mine, theirs = local_hashes.get(record_id), peer_hashes.get(record_id)
+        was = base.get(record_id)
+        if mine == theirs:
+            chosen = local.records[record_id]
+        elif theirs is None:
+            chosen = None if mine == was else local.records[record_id]
+        elif mine is None:
+            chosen = None if theirs == was else peer.records[record_id]
+        elif mine == was:
+            chosen = peer.records[record_id]
+        elif theirs == was:
+            chosen = local.records[record_id]
+        else:
+            conflicts += 1
+            chosen = (peer if peer_wins else local).records[record_id]
+        if chosen is not None:
+            merged[record_id] = chosen
+    return merged, conflicts
+
+
+def iter_ids(local: SyncedFile, peer: SyncedFile) -> Iterator[str]:
+    yield from local.records
+    for record_id in peer.records:
+        if record_id not in local.records:
+            yield record_id
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        f.write(content)
+    os.replace(temporary, path)
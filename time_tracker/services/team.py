@@ -0,0 +1,137 @@
+from getpass import getuser
+from logging import Logger
+from typing import Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.interfaces.time_entry import ITimeEntryService
+from time_tracker.models.settings import Settings
+from time_tracker.models.team import (
+    TEAM_ENTRIES_PATH,
+    TEAM_HEALTH_PATH,
+    TeamUpload,
+    TeamUploadResult,
+)
+from time_tracker.models.time_entry import (
+    TimeEntry,
+    TimeEntryResponse,
+    TimeEntryResponseDisposition,
+)
+from time_tracker.providers.metrics import METRICS
+
+
+class TeamTimeEntryService(ITimeEntryService):
+    """Uploads time entries to the team server in batches
+
+    Each batch of up to team_batch_size entries is one POST. The server ignores entries it
+    already has, so uploads are safe to repeat. Failed batches are retried a couple of times,
+    after which they're reported as unavailable for the circuit breaker in front of this service
+    to queue and upload once the server is back.
+    """
+
+    log: Logger
+
+    def __init__(
+        self, log_provider: ILoggingProvider, settings_provider: ISettingsProvider
+    ):
+        self.log = log_provider.get_logger("TeamTimeEntryService")
+        self.settings_provider = settings_provider
+        retry = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
+        self.session.mount("http://", HTTPAdapter(max_retries=retry))
+
+    @property
+    def settings(self) -> Settings:
+        return self.settings_provider.get_settings()
+
+    @property
+    def user(self) -> str:
+        return self.settings.team_user or getuser()
+
+    def is_available(self) -> bool:
+        """Checks whether the team server is answering requests, without retrying
+
+        Returns:
+            bool: True if the server's health check succeeded
+        """
+        settings = self.settings
+        try:
+            response = requests.get(
+                settings.team_url.rstrip("/") + TEAM_HEALTH_PATH,
+                timeout=settings.team_timeout_seconds,
+            )
+        except requests.RequestException as e:
+            self.log.debug("The team server is unavailable: %s", e)
+            return False
+        return response.status_code == 200
+
+    def log_work(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        return self.log_work_batch([time_entry])[0]
+
+    @METRICS.timed("team.log_work_batch")
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        time_entries = list(time_entries)
+        batch_size = max(1, self.settings.team_batch_size)
+        responses = []
+        for start in range(0, len(time_entries), batch_size):
+            batch = time_entries[start : start + batch_size]
+            responses.extend([self.upload(batch)] * len(batch))
+        return responses
+
+    def upload(self, time_entries: list[TimeEntry]) -> TimeEntryResponse:
+        settings = self.settings
+        headers = {"Content-Type": "application/json"}
+        if settings.team_token:
+            headers["Authorization"] = f"Bearer {settings.team_token}"
+        try:
+            response = self.session.post(
+                settings.team_url.rstrip("/") + TEAM_ENTRIES_PATH,
+                data=TeamUpload(self.user, time_entries).to_json(),
+                headers=headers,
+                timeout=settings.team_timeout_seconds,
+            )
+        except requests.RequestException as e:
+            self.log.warning("Unable to reach the team server: %s", e)
+            return TimeEntryResponse(
+                False,
+                f"Unable to reach the team server: {e}",
+                TimeEntryResponseDisposition.UNAVAILABLE,
+            )
+        if response.status_code != 200:
+            self.log.warning(
+                "Team server returned %s: %s", response.status_code, response.text
+            )
+            return TimeEntryResponse(
+                False,
+                f"Team server returned {response.status_code}",
+                (
+                    TimeEntryResponseDisposition.UNAVAILABLE
+                    if response.status_code >= 500
+                    else TimeEntryResponseDisposition.FAILURE
+                ),
+            )
+        result = TeamUploadResult.from_json(response.text)
+        METRICS.increment("team.entries", result.accepted)
+        return TimeEntryResponse(
+            result.rejected == 0,
+            f"Uploaded {result.accepted} entries to the team server, "
+            + f"{result.duplicates} already there, {result.rejected} rejected",
+            (
+                TimeEntryResponseDisposition.SUCCESS
+                if result.rejected == 0
+                else TimeEntryResponseDisposition.FAILURE
+            ),
+        )
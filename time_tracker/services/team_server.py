@@ -0,0 +1,138 @@
+"""HTTP server collecting the time entries of a team
+
+Clients post batches of entries to /api/v1/entries as {"user": ..., "entries": [...]}, with the
+entries encoded by TimeEntry.to_dict. GET /api/v1/report?group=user|issue&start=&end=&user=&issue=
+returns the time logged per user or per issue. When a token is set, every request must carry it
+as a bearer token.
+"""
+
+import hmac
+import json
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Logger
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.team import (
+    TEAM_ENTRIES_PATH,
+    TEAM_HEALTH_PATH,
+    TEAM_MAX_UPLOAD_BYTES,
+    TEAM_REPORT_PATH,
+    TeamReportGroup,
+)
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.team_store import TeamStore
+
+# days reported when a report doesn't give a start
+DEFAULT_REPORT_DAYS = 30
+
+
+def parse_report_time(value: Optional[str], default: datetime) -> datetime:
+    """Parses a report bound given as an ISO date or datetime"""
+    if not value:
+        return default
+    if len(value) == 10:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time())
+    return datetime.fromisoformat(value)
+
+
+class TeamRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # send headers and body in one segment, otherwise keep-alive clients stall on delayed acks
+    disable_nagle_algorithm = True
+    wbufsize = -1
+    server: "TeamServer"
+
+    def log_message(self, format, *args):
+        self.server.log.debug("%s - %s", self.address_string(), format % args)
+
+    def _reply(self, status: int, payload: str) -> None:
+        body = payload.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        METRICS.increment(
+            "team_server.requests", method=self.command, status=str(status)
+        )
+
+    def _error(self, status: int, message: str) -> None:
+        self._reply(status, json.dumps({"error": message}))
+
+    def _authorized(self) -> bool:
+        if not self.server.token:
+            return True
+        expected = f"Bearer {self.server.token}"
+        return hmac.compare_digest(self.headers.get("Authorization", ""), expected)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == TEAM_HEALTH_PATH:
+            return self._reply(200, json.dumps({"status": "ok"}))
+        if not self._authorized():
+            return self._error(401, "A valid token is required")
+        if url.path != TEAM_REPORT_PATH:
+            return self._error(404, "Not found")
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        today = datetime.combine(date.today(), datetime.min.time())
+        try:
+            group = TeamReportGroup(query.get("group", str(TeamReportGroup.USER)))
+            start = parse_report_time(
+                query.get("start"), today - timedelta(days=DEFAULT_REPORT_DAYS)
+            )
+            end = parse_report_time(query.get("end"), today + timedelta(days=1))
+        except ValueError as e:
+            return self._error(400, str(e))
+        report = self.server.store.report(
+            group, start, end, query.get("user"), query.get("issue")
+        )
+        self._reply(200, report.to_json())
+
+    def do_POST(self) -> None:
+        if not self._authorized():
+            return self._error(401, "A valid token is required")
+        if urlsplit(self.path).path != TEAM_ENTRIES_PATH:
+            return self._error(404, "Not found")
+        length = int(self.headers.get("Content-Length", 0))
+        if length > TEAM_MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            return self._error(413, "Upload is too large")
+        try:
+            upload = json.loads(self.rfile.read(length))
+            user, entries = upload["user"], upload["entries"]
+            if not isinstance(user, str) or not user or not isinstance(entries, list):
+                raise ValueError("user and entries are required")
+        except (KeyError, TypeError, ValueError) as e:
+            return self._error(400, f"Invalid upload: {e}")
+        result = self.server.store.add_entries(user, entries)
+        self._reply(200, result.to_json())
+
+
+class TeamServer(ThreadingHTTPServer):
+    """Accepts entry uploads and serves reports, one thread per connection"""
+
+    daemon_threads = True
+    # room for hundreds of clients connecting at once
+    request_queue_size = 1024
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        store: TeamStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token: Optional[str] = None,
+    ):
+        self.log = log_provider.get_logger("TeamServer")
+        self.store = store
+        self.token = token
+        super().__init__((host, port), TeamRequestHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
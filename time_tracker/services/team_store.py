@@ -0,0 +1,208 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from time import time
+from typing import Iterable, Iterator, Optional
+
+from time_tracker.models.team import (
+    TEAM_DATABASE_FILE,
+    TEAM_READERS,
+    TeamReport,
+    TeamReportGroup,
+    TeamReportRow,
+    TeamUploadResult,
+)
+from time_tracker.providers.metrics import METRICS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    user TEXT NOT NULL,
+    entry_key TEXT NOT NULL,
+    issue TEXT NOT NULL,
+    description TEXT,
+    from_time REAL NOT NULL,
+    to_time REAL NOT NULL,
+    seconds REAL NOT NULL,
+    comment TEXT,
+    received REAL NOT NULL,
+    PRIMARY KEY (user, entry_key)
+);
+CREATE INDEX IF NOT EXISTS entries_by_time ON entries (from_time);
+CREATE INDEX IF NOT EXISTS entries_by_user ON entries (user, from_time);
+CREATE INDEX IF NOT EXISTS entries_by_issue ON entries (issue, from_time);
+"""
+
+_GROUP_COLUMNS = {TeamReportGroup.USER: "user", TeamReportGroup.ISSUE: "issue"}
+
+# a row ready for insertion: entry key, issue, description, from, to, comment
+EntryRow = tuple[str, str, Optional[str], float, float, Optional[str]]
+
+
+def entry_row(entry: dict) -> EntryRow:
+    """Flattens one uploaded entry, as encoded by TimeEntry.to_dict, into a row
+
+    Decoding through TimeEntry would be several times slower, and the server only needs the
+    flat values.
+
+    Raises:
+        KeyError, TypeError, ValueError: The entry is malformed
+
+    Returns:
+        EntryRow: The values to store
+    """
+    issue = entry["issue"]
+    if isinstance(issue, dict):
+        issue_number, description = str(issue["issue_number"]), issue.get("description")
+    else:
+        issue_number, description = str(issue), None
+    from_time, to_time = float(entry["from_time"]), float(entry["to_time"])
+    if not issue_number or to_time < from_time:
+        raise ValueError(f"Invalid entry for {issue_number!r}")
+    # matches TimeEntry.key, so retried uploads of an entry are recognized
+    key = f"{issue_number}@{int(from_time)}-{int(to_time)}"
+    return key, issue_number, description, from_time, to_time, entry.get("comment")
+
+
+class TeamStore:
+    """SQLite store of the time entries uploaded by a team
+
+    Entries are keyed by user and entry key, so uploading an entry again is a no-op. Writes go
+    through one connection, one transaction per upload; the database runs in WAL mode so reports
+    read without waiting on writers. Reports borrow from a pool of at most readers connections,
+    opened as needed, so the open files don't grow with the number of client threads.
+    """
+
+    def __init__(self, path: Path = TEAM_DATABASE_FILE, readers: int = TEAM_READERS):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        self._readers = threading.BoundedSemaphore(max(1, readers))
+        self._idle: list[sqlite3.Connection] = []
+        self._idle_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        with self._readers:
+            with self._idle_lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+            try:
+                yield connection
+            finally:
+                with self._idle_lock:
+                    self._idle.append(connection)
+
+    @METRICS.timed("team_store.add_entries")
+    def add_entries(self, user: str, entries: Iterable[dict]) -> TeamUploadResult:
+        """Stores a user's uploaded entries, skipping ones already stored
+
+        Args:
+            user (str): The user the entries belong to
+            entries (Iterable[dict]): The entries as encoded by TimeEntry.to_dict
+
+        Returns:
+            TeamUploadResult: How many entries were stored, already present or malformed
+        """
+        result = TeamUploadResult()
+        received = time()
+        rows = []
+        for entry in entries:
+            try:
+                key, issue, description, from_time, to_time, comment = entry_row(entry)
+            except (KeyError, TypeError, ValueError):
+                result.rejected += 1
+                continue
+            rows.append(
+                (
+                    user,
+                    key,
+                    issue,
+                    description,
+                    from_time,
+                    to_time,
+                    to_time - from_time,
+                    comment,
+                    received,
+                )
+            )
+        with self._write_lock:
+            before = self._writer.total_changes
+            with self._writer:
+                self._writer.executemany(
+                    "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            result.accepted = self._writer.total_changes - before
+        result.duplicates = len(rows) - result.accepted
+        METRICS.increment("team_store.entries", result.accepted)
+        return result
+
+    @METRICS.timed("team_store.report")
+    def report(
+        self,
+        group: TeamReportGroup,
+        start: datetime,
+        end: datetime,
+        user: Optional[str] = None,
+        issue: Optional[str] = None,
+    ) -> TeamReport:
+        """Totals the time logged in a range per user or per issue
+
+        Args:
+            group (TeamReportGroup): Whether to total per user or per issue
+            start (datetime): The inclusive start of the range
+            end (datetime): The exclusive end of the range
+            user (Optional[str], optional): Only count this user's entries. Defaults to None.
+            issue (Optional[str], optional): Only count entries for this issue. Defaults to None.
+
+        Returns:
+            TeamReport: One row per user or issue, largest total first
+        """
+        column = _GROUP_COLUMNS[TeamReportGroup(str(group))]
+        clauses, parameters = ["from_time >= ?", "from_time < ?"], [
+            start.timestamp(),
+            end.timestamp(),
+        ]
+        if user:
+            clauses.append("user = ?")
+            parameters.append(user)
+        if issue:
+            clauses.append("issue = ?")
+            parameters.append(issue)
+        description = "MAX(description)" if column == "issue" else "NULL"
+        with self._reader() as reader:
+            rows = reader.execute(
+                f"SELECT {column}, SUM(seconds), COUNT(*), {description} FROM entries "
+                + f"WHERE {' AND '.join(clauses)} GROUP BY {column} "
+                + "ORDER BY SUM(seconds) DESC, 1",
+                parameters,
+            ).fetchall()
+        return TeamReport(
+            group,
+            start,
+            end,
+            [TeamReportRow(*row) for row in rows],
+        )
+
+    def count(self) -> int:
+        with self._reader() as reader:
+            return reader.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._write_lock:
+            self._writer.close()
+        with self._idle_lock:
+            for connection in self._idle:
+                connection.close()
+            self._idle.clear()
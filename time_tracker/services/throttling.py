@@ -0,0 +1,70 @@
+import threading
+from time import monotonic, sleep
+from typing import Callable
+
+
+class TokenBucket:
+    """Thread safe token bucket rate limiter
+
+    Tokens refill continuously at rate per second up to capacity; acquire blocks until enough
+    tokens are available. A rate of zero or less disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = monotonic,
+        sleeper: Callable[[float], None] = sleep,
+    ):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleeper = sleeper
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(self.clock())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Blocks until the tokens are available
+
+        Args:
+            tokens (float, optional): The number of tokens to take. Defaults to 1.0.
+
+        Returns:
+            float: The number of seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self.clock())
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            self.sleeper(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Empties the bucket so no tokens are handed out for the given time, e.g. after a 429"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill(self.clock())
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
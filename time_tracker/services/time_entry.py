@@ -1,11 +1,28 @@
-from datetime import datetime, timedelta
+import os
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from time_tracker.interfaces.time_entry import ITimeEntryService
+from time_tracker.interfaces.time_entry import (
+    IExtendableTimeEntryService,
+    ITimeEntryQueryService,
+    ITimeEntryService,
+)
 from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.issue import Issue
 from time_tracker.models.settings import Settings, WORKING_DIR
-from time_tracker.models.time_entry import TimeEntryLog, TimeEntry, TimeEntryResponse
+from time_tracker.models.time_entry import (
+    TimeEntryLog,
+    TimeEntry,
+    TimeEntryResponse,
+    TimeEntryResponseDisposition,
+    local_datetime,
+    parse_time_entry_log_name,
+    time_entry_log_name,
+)
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.locking import FileLock, path_lock
+from time_tracker.services.streaming import iter_json_array
 
 
 class MockTimeEntryService(ITimeEntryService):
@@ -15,27 +32,153 @@ class MockTimeEntryService(ITimeEntryService):
         return TimeEntryResponse(True)
 
 
-class TimeEntryFileService(ITimeEntryService):
+class TimeEntryFileService(IExtendableTimeEntryService, ITimeEntryQueryService):
     settings: Settings
 
-    def __init__(self, log_provider: ILoggingProvider, settings: Settings):
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        settings: Settings,
+        working_dir: Path = WORKING_DIR,
+    ):
         self.log = log_provider.get_logger("TimeEntryFileService")
         self.settings = settings
+        self.working_dir = working_dir
 
-    def log_work(self, time_entry: TimeEntry):
-        if self.time_entry_file_path.exists():
-            with open(self.time_entry_file_path, "r") as f:
-                entry_log = TimeEntryLog.from_json(f.read())
-        else:
-            entry_log = TimeEntryLog()
-        entry_log.entries.append(time_entry)
+    @METRICS.timed("time_entry_file.log_work")
+    def log_work(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        return self.append_entries(
+            local_datetime(time_entry.from_time).date(), [time_entry]
+        )
+
+    @METRICS.timed("time_entry_file.log_work_batch")
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        days = [
+            (local_datetime(time_entry.from_time).date(), time_entry)
+            for time_entry in time_entries
+        ]
+        entries_by_day: dict[date, list[TimeEntry]] = {}
+        for day, time_entry in days:
+            entries_by_day.setdefault(day, []).append(time_entry)
+        responses = {
+            day: self.append_entries(day, entries)
+            for day, entries in entries_by_day.items()
+        }
+        return [responses[day] for day, _ in days]
+
+    @METRICS.timed("time_entry_file.extend_work")
+    def extend_work(self, previous: TimeEntry, entry: TimeEntry) -> TimeEntryResponse:
+        file_path = self.time_entry_file_path_for(
+            local_datetime(previous.from_time).date()
+        )
+        try:
+            # the same locks a sync takes, so neither rewrites the file over the other
+            with path_lock(file_path).write(), FileLock(file_path).acquire():
+                if not file_path.exists():
+                    raise FileNotFoundError(file_path)
+                with open(file_path, "r") as f:
+                    entry_log = TimeEntryLog.from_json(f.read())
+                previous_key = previous.key
+                # the entry being extended is almost always the last one in the file
+                for index in range(len(entry_log.entries) - 1, -1, -1):
+                    if entry_log.entries[index].key == previous_key:
+                        entry_log.entries[index] = entry
+                        break
+                else:
+                    return TimeEntryResponse(
+                        False,
+                        f"{previous_key} was not found in {file_path}",
+                        TimeEntryResponseDisposition.FAILURE,
+                    )
+                with open(file_path, "w") as f:
+                    f.write(entry_log.to_json())
+        except Exception as e:
+            self.log.error(e)
+            METRICS.increment("time_entry_file.errors")
+            return TimeEntryResponse(
+                False, str(e), TimeEntryResponseDisposition.FAILURE
+            )
+        return TimeEntryResponse(True, None, TimeEntryResponseDisposition.SUCCESS)
+
+    def append_entries(
+        self, day: date, time_entries: list[TimeEntry]
+    ) -> TimeEntryResponse:
+        """Appends entries to a day file with a single read and write, holding its locks
+
+        Args:
+            day (date): The day of the log file
+            time_entries (list[TimeEntry]): The entries to append
+
+        Returns:
+            TimeEntryResponse: The result of the write
+        """
+        file_path = self.time_entry_file_path_for(day)
         try:
-            with open(self.time_entry_file_path, "w") as f:
-                f.write(entry_log.to_json())
+            with path_lock(file_path).write(), FileLock(file_path).acquire():
+                if file_path.exists():
+                    with open(file_path, "r") as f:
+                        entry_log = TimeEntryLog.from_json(f.read())
+                else:
+                    entry_log = TimeEntryLog(datetime.combine(day, datetime.min.time()))
+                entry_log.entries.extend(time_entries)
+                with open(file_path, "w") as f:
+                    f.write(entry_log.to_json())
+            METRICS.increment("time_entry_file.entries", len(time_entries))
         except Exception as e:
             self.log.error(e)
+            METRICS.increment("time_entry_file.errors")
+            return TimeEntryResponse(
+                False, str(e), TimeEntryResponseDisposition.FAILURE
+            )
+        return TimeEntryResponse(True, None, TimeEntryResponseDisposition.SUCCESS)
+
+    def iter_entries(
+        self,
+        start: datetime,
+        end: datetime,
+        issue: Optional[Issue | str] = None,
+    ) -> Iterator[TimeEntry]:
+        start, end = local_datetime(start), local_datetime(end)
+        if isinstance(issue, Issue):
+            issue = issue.issue_number
+        for _, path in self.iter_log_files(start.date(), end.date()):
+            with open(path, "r") as f:
+                for item in iter_json_array(f, "entries"):
+                    entry = TimeEntry.from_dict(item)
+                    if issue is not None and entry.issue.issue_number != issue:
+                        continue
+                    if start <= local_datetime(entry.from_time) < end:
+                        yield entry
+
+    def iter_log_files(
+        self, first_day: date, last_day: date
+    ) -> Iterator[tuple[date, Path]]:
+        """Yields the day files between two days in order, selecting them by name only
+
+        Args:
+            first_day (date): The first day to include
+            last_day (date): The last day to include
+
+        Yields:
+            tuple[date, Path]: The day and path of each log file
+        """
+        if not self.working_dir.exists():
+            return
+        with os.scandir(self.working_dir) as entries:
+            days = [
+                (day, entry.name)
+                for entry in entries
+                if (day := parse_time_entry_log_name(entry.name)) is not None
+                and first_day <= day <= last_day
+            ]
+        for day, name in sorted(days):
+            yield day, self.working_dir / name
+
+    def time_entry_file_path_for(self, day: date) -> Path:
+        return self.working_dir / time_entry_log_name(day)
 
     @property
     def time_entry_file_path(self) -> Path:
-        now = datetime.now()
-        return WORKING_DIR / f"TimeEntryLog-{now.month:02}-{now.day:02}-{now.year}"
+        return self.time_entry_file_path_for(datetime.now().date())
@@ -0,0 +1,279 @@
+import atexit
+import gzip
+import hashlib
+import os
+import threading
+from collections import deque
+from getpass import getuser
+from logging import Logger
+from pathlib import Path
+from time import monotonic
+from typing import Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.interfaces.time_entry import IMonitoredTimeEntryService
+from time_tracker.models.settings import Settings
+from time_tracker.models.time_entry import (
+    TimeEntry,
+    TimeEntryResponse,
+    TimeEntryResponseDisposition,
+)
+from time_tracker.models.webhook import (
+    WEBHOOK_BATCH_HEADER,
+    WEBHOOK_MAX_BUFFERED,
+    WEBHOOK_QUEUE_FILE,
+    WebhookBatch,
+)
+from time_tracker.providers.metrics import METRICS
+
+
+def batch_id(time_entries: Iterable[TimeEntry]) -> str:
+    """Derives a batch's id from its entries, so a resent batch keeps its id"""
+    digest = hashlib.blake2b(digest_size=16)
+    for time_entry in time_entries:
+        digest.update(time_entry.key.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class WebhookTimeEntryService(IMonitoredTimeEntryService):
+    """Posts time entries to an HTTP endpoint in batches
+
+    Entries are appended to a queue file, buffered and answered as queued right away. A
+    background thread posts them as JSON, gzipped unless webhook_gzip is off, once
+    webhook_batch_size entries are waiting or the oldest has waited webhook_flush_seconds.
+    Requests share one pooled connection and are retried with backoff on connection errors, 429
+    and 5xx responses. Batches that still fail stay queued and are tried again after another
+    webhook_flush_seconds, while batches the receiver rejects with another 4xx are dropped.
+    The queue file is rewritten after each flush and read back on start, so entries not yet
+    sent at exit or a crash are sent by the next run; batches keep their Idempotency-Key, so a
+    receiver can ignore the ones it already got. Past WEBHOOK_MAX_BUFFERED entries, new ones
+    are refused as unavailable rather than queued.
+    """
+
+    log: Logger
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        settings_provider: ISettingsProvider,
+        queue_file: Path = WEBHOOK_QUEUE_FILE,
+    ):
+        self.log = log_provider.get_logger("WebhookTimeEntryService")
+        self.settings_provider = settings_provider
+        self.queue_file = queue_file
+        settings = self.settings
+        retry = Retry(
+            total=settings.webhook_max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._buffer: deque[TimeEntry] = deque(self.read_queue())
+        # when the buffer last went from empty to not empty
+        self._oldest: Optional[float] = monotonic() if self._buffer else None
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._stopping = False
+        self._flusher: Optional[threading.Thread] = None
+        if self._buffer:
+            self.log.info("Sending %s entries queued earlier", len(self._buffer))
+            self.start()
+
+    @property
+    def settings(self) -> Settings:
+        return self.settings_provider.get_settings()
+
+    @property
+    def buffered(self) -> int:
+        with self._condition:
+            return len(self._buffer)
+
+    def status_text(self) -> Optional[str]:
+        buffered = self.buffered
+        return f"Webhook: {buffered} waiting to be sent" if buffered else None
+
+    def log_work(self, time_entry: TimeEntry) -> TimeEntryResponse:
+        return self.log_work_batch([time_entry])[0]
+
+    def log_work_batch(
+        self, time_entries: Iterable[TimeEntry]
+    ) -> list[TimeEntryResponse]:
+        time_entries = list(time_entries)
+        if not time_entries:
+            return []
+        self.start()
+        with self._condition:
+            accepted = time_entries[: max(0, WEBHOOK_MAX_BUFFERED - len(self._buffer))]
+            refusal = "The webhook queue is full"
+            try:
+                self.append_queue(accepted)
+            except OSError as e:
+                self.log.error("Unable to queue entries for the webhook: %s", e)
+                accepted, refusal = [], f"Unable to queue the entry: {e}"
+            if accepted and not self._buffer:
+                self._oldest = monotonic()
+            self._buffer.extend(accepted)
+            self._condition.notify()
+        refused = len(time_entries) - len(accepted)
+        if refused:
+            self.log.warning("Refused %s entries for the webhook: %s", refused, refusal)
+            METRICS.increment("webhook.refused", refused)
+        return [
+            TimeEntryResponse(
+                True, "Queued for the webhook", TimeEntryResponseDisposition.QUEUED
+            )
+        ] * len(accepted) + [
+            TimeEntryResponse(False, refusal, TimeEntryResponseDisposition.UNAVAILABLE)
+        ] * refused
+
+    def read_queue(self) -> list[TimeEntry]:
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                return [TimeEntry.from_json(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def append_queue(self, time_entries: list[TimeEntry]) -> None:
+        if not time_entries:
+            return
+        self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.queue_file, "a", encoding="utf-8") as f:
+            f.writelines(entry.to_json() + "\n" for entry in time_entries)
+
+    def save_queue(self) -> None:
+        """Rewrites the queue file with what's buffered, called holding the condition"""
+        temporary = self.queue_file.with_name(self.queue_file.name + ".tmp")
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                f.writelines(entry.to_json() + "\n" for entry in self._buffer)
+            os.replace(temporary, self.queue_file)
+        except OSError as e:
+            # the file keeps entries already sent, they'll be sent again with the same key
+            self.log.error("Unable to save the webhook queue: %s", e)
+
+    def start(self) -> None:
+        with self._condition:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="WebhookFlusher", daemon=True
+            )
+            self._flusher.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stops the background thread after sending what's buffered"""
+        with self._condition:
+            flusher, self._flusher = self._flusher, None
+            self._stopping = True
+            self._condition.notify()
+        if flusher is not None:
+            flusher.join(self.settings.webhook_timeout_seconds * 2)
+        self.session.close()
+
+    def _wait_seconds(self, settings: Settings) -> Optional[float]:
+        if not self._buffer:
+            return None
+        due = max(self._oldest + settings.webhook_flush_seconds, self._paused_until)
+        if len(self._buffer) >= settings.webhook_batch_size:
+            due = self._paused_until
+        return max(0.0, due - monotonic())
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    wait = self._wait_seconds(self.settings)
+                    if wait == 0:
+                        break
+                    self._condition.wait(wait)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    @METRICS.timed("webhook.flush")
+    def flush(self) -> bool:
+        """Sends the buffered entries, a batch at a time
+
+        Returns:
+            bool: True if the buffer was emptied, False if sending stopped at a failure
+        """
+        settings = self.settings
+        size = max(1, settings.webhook_batch_size)
+        with self._send_lock:
+            while True:
+                with self._condition:
+                    if not self._buffer:
+                        self._oldest = None
+                        self.save_queue()
+                        return True
+                    batch = [
+                        self._buffer.popleft()
+                        for _ in range(min(size, len(self._buffer)))
+                    ]
+                if not self.send(batch, settings):
+                    with self._condition:
+                        self._buffer.extendleft(reversed(batch))
+                        self._paused_until = (
+                            monotonic() + settings.webhook_flush_seconds
+                        )
+                        self.save_queue()
+                    return False
+
+    def send(self, batch: list[TimeEntry], settings: Settings) -> bool:
+        """Posts one batch
+
+        Returns:
+            bool: False if the batch should be sent again later
+        """
+        identifier = batch_id(batch)
+        body = WebhookBatch(getuser(), identifier, batch).to_json().encode()
+        headers = {"Content-Type": "application/json", WEBHOOK_BATCH_HEADER: identifier}
+        if settings.webhook_gzip:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        if settings.webhook_token:
+            headers["Authorization"] = f"Bearer {settings.webhook_token}"
+        try:
+            response = self.session.post(
+                settings.webhook_url,
+                data=body,
+                headers=headers,
+                timeout=settings.webhook_timeout_seconds,
+            )
+        except requests.RequestException as e:
+            self.log.warning("Unable to reach the webhook: %s", e)
+            METRICS.increment("webhook.failures", reason="unreachable")
+            return False
+        if 200 <= response.status_code < 300:
+            METRICS.increment("webhook.entries", len(batch))
+            METRICS.observe("webhook.batch_bytes", len(body))
+            return True
+        METRICS.increment("webhook.failures", reason=str(response.status_code))
+        if response.status_code in (408, 429) or response.status_code >= 500:
+            self.log.warning(
+                "Webhook returned %s, will retry: %s",
+                response.status_code,
+                response.text[:200],
+            )
+            return False
+        self.log.error(
+            "Webhook rejected a batch of %s entries with %s: %s",
+            len(batch),
+            response.status_code,
+            response.text[:200],
+        )
+        return True
@@ -1,15 +1,31 @@
+import asyncio
+from difflib import SequenceMatcher
+from typing import Optional
+
 import PySimpleGUI as sg
 from time_tracker.constants import EMPTY
-from time_tracker.interfaces.issue import IIssueService
+from time_tracker.interfaces.event_loop import IEventLoopProvider
+from time_tracker.interfaces.issue import (
+    IIssueMetadataCache,
+    IIssueService,
+    IIssueSyncService,
+)
+from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.interfaces.views import IView, IViewFactory
 from time_tracker.models.issue import (
+    ISSUE_PAGE_SIZE,
     Issue,
+    IssueChoice,
     IssueList,
     IssueManagementViewEvents,
+    IssueSyncResult,
     IssueManagementViewKeys,
     NewIssueViewEvents,
     NewIssueViewKeys,
 )
+from time_tracker.providers.metrics import METRICS
+from time_tracker.services.issue_index import IssueIndex
+from time_tracker.views.prompt import UserNamePasswordPrompt
 
 
 class NewIssueView(IView):
@@ -18,7 +34,9 @@ class NewIssueView(IView):
     def __init__(self, issue_service: IIssueService):
         self.issue_service = issue_service
         self.title = "Time Tracking - Add New Entry"
-        self.layout = [
+
+    def make_layout(self) -> list[list[sg.Element]]:
+        return [
             [sg.Text(f"Please provide the Issue information")],
             [
                 sg.Text(
@@ -43,83 +61,341 @@ class NewIssueView(IView):
         return f"Issue {issue} was successfully added"
 
     def run(self) -> IssueList:
+        with METRICS.timer("view.window_open", view=type(self).__name__):
+            window = sg.Window(self.title, self.make_layout())
         while True:
-            window = sg.Window(self.title, self.layout)
-            event, values = window.read(close=True)
-            issue = Issue(
-                values[NewIssueViewKeys.ISSUE],
-                values[NewIssueViewKeys.DESCRIPTION],
-            )
+            with METRICS.timer("view.window_read", view=type(self).__name__):
+                event, values = window.read()
             match event:
-                case [NewIssueViewEvents.ANOTHER]:
+                case NewIssueViewEvents.ANOTHER:
+                    issue = Issue(
+                        values[NewIssueViewKeys.ISSUE],
+                        values[NewIssueViewKeys.DESCRIPTION],
+                    )
                     self.issue_service.new_issue(issue)
-                    window[NewIssueViewKeys.RESULT].update(self.result_text(issue))
+                    window[NewIssueViewKeys.RESULT].update(
+                        self.result_text(issue.issue_number), visible=True
+                    )
                     window[NewIssueViewKeys.ISSUE].update(EMPTY)
                     window[NewIssueViewKeys.DESCRIPTION].update(EMPTY)
-                case [NewIssueViewEvents.SAVE]:
-                    return self.issue_service.new_issue(issue)
-                case [NewIssueViewEvents.CANCEL | sg.WIN_CLOSED]:
+                case NewIssueViewEvents.SAVE:
+                    window.close()
+                    return self.issue_service.new_issue(
+                        Issue(
+                            values[NewIssueViewKeys.ISSUE],
+                            values[NewIssueViewKeys.DESCRIPTION],
+                        )
+                    )
+                case (
+                    NewIssueViewEvents.CLOSE | NewIssueViewEvents.CANCEL | sg.WIN_CLOSED
+                ):
+                    window.close()
                     return self.issue_service.load_active_issues()
 
 
+class IssueListPane:
+    """A paged listbox over an issue list, with a filter box
+
+    The listbox is only ever given one page of the matching issues, and rendering rewrites just
+    the rows that differ from the ones on screen, so the cost of an update depends on the page
+    size rather than on the size of the list. Given a metadata cache, rows show the cached
+    summary, status and assignee of their issues.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        list_key: IssueManagementViewKeys,
+        page_key: IssueManagementViewKeys,
+        filter_event: IssueManagementViewEvents,
+        previous_event: IssueManagementViewEvents,
+        next_event: IssueManagementViewEvents,
+        page_size: int = ISSUE_PAGE_SIZE,
+        metadata: Optional[IIssueMetadataCache] = None,
+    ):
+        self.title = title
+        self.list_key = list_key
+        self.page_key = page_key
+        self.filter_event = filter_event
+        self.previous_event = previous_event
+        self.next_event = next_event
+        self.page_size = page_size
+        self.metadata = metadata
+        self.query = EMPTY
+        self.page = 0
+        self.issue_list = IssueList(None)
+        self.index = IssueIndex([])
+        self.matches: list[Issue] = []
+        self.rows: Optional[list[str]] = None
+
+    def load(self, issue_list: IssueList) -> None:
+        self.issue_list = issue_list
+        self.index = IssueIndex(issue_list.issues)
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.matches = self.index.search(self.query)
+        self.page = max(0, min(self.page, self.page_count - 1))
+
+    def set_query(self, query: str) -> None:
+        self.query = query.strip()
+        self.page = 0
+        self.refresh()
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.matches) // self.page_size))
+
+    def turn(self, pages: int) -> None:
+        self.page = max(0, min(self.page + pages, self.page_count - 1))
+
+    def page_issues(self) -> list[Issue]:
+        start = self.page * self.page_size
+        return self.matches[start : start + self.page_size]
+
+    def page_text(self) -> str:
+        if not self.matches:
+            return "No issues"
+        start = self.page * self.page_size
+        end = min(start + self.page_size, len(self.matches))
+        return f"{start + 1}-{end} of {len(self.matches)}"
+
+    def take(self, issues: list[Issue]) -> None:
+        for issue in issues:
+            self.issue_list.remove(issue)
+            self.index.remove(issue)
+        self.refresh()
+
+    def give(self, issues: list[Issue]) -> None:
+        for issue in issues:
+            self.issue_list.append(issue)
+            self.index.add(issue)
+        self.refresh()
+
+    def layout(self) -> list[list[sg.Element]]:
+        # a new window needs new elements, and shows nothing until rendered
+        self.rows = None
+        return [
+            [sg.Text(self.title, size=(30, 1))],
+            [
+                sg.Input(
+                    self.query,
+                    key=self.filter_event,
+                    size=(32, 1),
+                    enable_events=True,
+                    tooltip="Filter by issue number or description",
+                )
+            ],
+            [
+                sg.Listbox(
+                    [],
+                    key=self.list_key,
+                    size=(30, 36),
+                    select_mode=sg.LISTBOX_SELECT_MODE_EXTENDED,
+                )
+            ],
+            [
+                sg.Button(" < ", key=self.previous_event, size=(3, 1)),
+                sg.Text(EMPTY, key=self.page_key, size=(18, 1), justification="c"),
+                sg.Button(" > ", key=self.next_event, size=(3, 1)),
+            ],
+        ]
+
+    def choices(self, issues: list[Issue]) -> list[IssueChoice]:
+        if self.metadata is None:
+            return [IssueChoice(issue) for issue in issues]
+        metadata = self.metadata.get_many(issue.issue_number for issue in issues)
+        return [
+            IssueChoice(issue, metadata.get(issue.issue_number)) for issue in issues
+        ]
+
+    def render(self, window: sg.Window) -> None:
+        issues = self.page_issues()
+        rows = [str(choice) for choice in self.choices(issues)]
+        element = window[self.list_key]
+        if self.rows is None:
+            element.update(rows)
+            element.Values = issues
+        elif rows != self.rows:
+            listbox = element.TKListbox
+            matcher = SequenceMatcher(a=self.rows, b=rows, autojunk=False)
+            # applied back to front so the earlier indexes stay valid
+            for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+                if tag == "equal":
+                    continue
+                if i2 > i1:
+                    listbox.delete(i1, i2 - 1)
+                for offset, row in enumerate(rows[j1:j2]):
+                    listbox.insert(i1 + offset, row)
+            # the element maps selected rows back to these values
+            element.Values = issues
+        else:
+            element.Values = issues
+        self.rows = rows
+        window[self.page_key].update(self.page_text())
+        window[self.previous_event].update(disabled=self.page == 0)
+        window[self.next_event].update(disabled=self.page >= self.page_count - 1)
+
+
 class IssueManagementView(IView):
     issue_service: IIssueService
+    issue_sync_service: Optional[IIssueSyncService]
     view_factory: IViewFactory
 
-    def move_issue(self, issue: Issue, from_list: IssueList, to_list: IssueList):
-        from_list.remove(issue)
-        to_list.append(issue)
+    def move_issues(
+        self, issues: list[Issue], from_pane: IssueListPane, to_pane: IssueListPane
+    ) -> None:
+        from_pane.take(issues)
+        to_pane.give(issues)
+
+    def load_lists(self) -> None:
+        active_issues, deleted_issues = self.issue_service.load_lists()
+        self.active_pane.load(active_issues)
+        self.deleted_pane.load(deleted_issues)
+
+    def save_lists(self) -> None:
+        self.issue_service.save_all_lists(
+            self.active_pane.issue_list, self.deleted_pane.issue_list
+        )
+
+    def set_syncing(self, window: sg.Window, syncing: bool, message: str) -> None:
+        # saving mid sync would overwrite the merged list with the stale one, and moves made
+        # mid sync would be lost when the merged lists are loaded
+        for event in (
+            IssueManagementViewEvents.SYNC,
+            IssueManagementViewEvents.SAVE,
+            IssueManagementViewEvents.NEW,
+            IssueManagementViewEvents.DELETE,
+            IssueManagementViewEvents.RESTORE,
+        ):
+            window[event].update(disabled=syncing)
+        window[IssueManagementViewKeys.SYNC_RESULT].update(message)
+
+    def start_sync(self, window: sg.Window) -> None:
+        self.set_syncing(window, True, "Syncing with Jira...")
+        self.event_loop.submit_to_window(
+            window,
+            IssueManagementViewEvents.SYNC_DONE,
+            asyncio.to_thread(self.issue_sync_service.sync_issues),
+        )
+
+    def prompt_for_auth(self) -> bool:
+        user_name, password = UserNamePasswordPrompt(
+            "Please provide your Jira username and password", self.log_provider
+        ).run()
+        if user_name:
+            self.issue_sync_service.set_auth(user_name, password)
+        return bool(user_name)
 
     def run(self):
         event = None
         window = None
-        active_issues, deleted_issues = self.issue_service.load_lists()
+        self.load_lists()
+        panes = (self.active_pane, self.deleted_pane)
         while event not in [
             IssueManagementViewEvents.SAVE,
             IssueManagementViewEvents.CANCEL,
             sg.WIN_CLOSED,
         ]:
             if window is None:
-                window = sg.Window(self.title, self.layout, size=self.size)
-            window[IssueManagementViewKeys.ACTIVE_ISSUES].update(active_issues.issues)
-            window[IssueManagementViewKeys.DELETED_ISSUES].update(deleted_issues.issues)
-            event, values = window.read()
+                with METRICS.timer("view.window_open", view=type(self).__name__):
+                    window = sg.Window(
+                        self.title, self.make_layout(), size=self.size, finalize=True
+                    )
+            for pane in panes:
+                pane.render(window)
+            with METRICS.timer("view.window_read", view=type(self).__name__):
+                event, values = window.read()
+            for pane in panes:
+                match event:
+                    case pane.filter_event:
+                        pane.set_query(values[pane.filter_event])
+                    case pane.previous_event:
+                        pane.turn(-1)
+                    case pane.next_event:
+                        pane.turn(1)
             match event:
-                case [IssueManagementViewEvents.NEW]:
+                case IssueManagementViewEvents.NEW:
                     window = window.close()
-                    active_issues = self.view_factory.make_new_issue_view().run()
-                case [IssueManagementViewEvents.DELETE]:
-                    self.move_issue(
-                        issue=values[IssueManagementViewKeys.ACTIVE_ISSUES],
-                        from_list=active_issues,
-                        to_list=deleted_issues,
+                    self.active_pane.load(self.view_factory.make_new_issue_view().run())
+                case IssueManagementViewEvents.SYNC:
+                    # pending moves are saved first, the sync merges into the lists on disk
+                    self.save_lists()
+                    self.start_sync(window)
+                case IssueManagementViewEvents.SYNC_DONE:
+                    result = values[IssueManagementViewEvents.SYNC_DONE]
+                    if (
+                        isinstance(result, IssueSyncResult)
+                        and result.needs_auth
+                        and self.prompt_for_auth()
+                    ):
+                        self.start_sync(window)
+                        continue
+                    self.load_lists()
+                    message = (
+                        str(result)
+                        if isinstance(result, IssueSyncResult)
+                        else f"Issue sync failed: {result}"
                     )
-                case [IssueManagementViewEvents.RESTORE]:
-                    active_issues, deleted_issues = self.issue_service.load_lists()
-                case [IssueManagementViewEvents.SAVE]:
+                    self.set_syncing(window, False, message)
+                case IssueManagementViewEvents.DELETE:
+                    self.move_issues(
+                        values[IssueManagementViewKeys.ACTIVE_ISSUES],
+                        self.active_pane,
+                        self.deleted_pane,
+                    )
+                case IssueManagementViewEvents.RESTORE:
+                    self.move_issues(
+                        values[IssueManagementViewKeys.DELETED_ISSUES],
+                        self.deleted_pane,
+                        self.active_pane,
+                    )
+                case IssueManagementViewEvents.SAVE:
                     window = window.close()
-                    self.issue_service.save_all_lists(active_issues, deleted_issues)
+                    self.save_lists()
                     return event
-                case [IssueManagementViewEvents.CANCEL | sg.WIN_CLOSED]:
+                case IssueManagementViewEvents.CANCEL | sg.WIN_CLOSED:
                     return IssueManagementViewEvents.CANCEL
 
-    def __init__(self, issue_service: IIssueService, view_factory: IViewFactory):
+    def __init__(
+        self,
+        issue_service: IIssueService,
+        view_factory: IViewFactory,
+        log_provider: ILoggingProvider,
+        event_loop: IEventLoopProvider,
+        issue_sync_service: Optional[IIssueSyncService] = None,
+        issue_metadata: Optional[IIssueMetadataCache] = None,
+    ):
+        self.event_loop = event_loop
         self.issue_service = issue_service
+        self.issue_sync_service = issue_sync_service
+        self.log_provider = log_provider
         self.view_factory = view_factory
         self.title = "Time Tracking - Manage Issues"
-        self.size = (550, 775)
-        self.layout = [
-            [
-                sg.Text("Active Issues", size=(30, 1)),
-                sg.Text(EMPTY, size=(5, 1)),
-                sg.Text("Deleted Issues", size=(30, 1)),
-            ],
+        self.size = (600, 800)
+        self.active_pane = IssueListPane(
+            "Active Issues",
+            IssueManagementViewKeys.ACTIVE_ISSUES,
+            IssueManagementViewKeys.ACTIVE_PAGE,
+            IssueManagementViewEvents.ACTIVE_FILTER,
+            IssueManagementViewEvents.ACTIVE_PREVIOUS,
+            IssueManagementViewEvents.ACTIVE_NEXT,
+            metadata=issue_metadata,
+        )
+        self.deleted_pane = IssueListPane(
+            "Deleted Issues",
+            IssueManagementViewKeys.DELETED_ISSUES,
+            IssueManagementViewKeys.DELETED_PAGE,
+            IssueManagementViewEvents.DELETED_FILTER,
+            IssueManagementViewEvents.DELETED_PREVIOUS,
+            IssueManagementViewEvents.DELETED_NEXT,
+            metadata=issue_metadata,
+        )
+
+    def make_layout(self) -> list[list[sg.Element]]:
+        return [
             [
-                sg.Listbox(
-                    issue_service.load_active_issues(),
-                    key=IssueManagementViewKeys.ACTIVE_ISSUES,
-                    size=(30, 40),
-                ),
+                sg.Column(self.active_pane.layout()),
                 sg.Frame(
                     EMPTY,
                     [
@@ -147,14 +423,20 @@ class IssueManagementView(IView):
                                 tooltip="Delete Selected Issues",
                             )
                         ],
+                        [
+                            sg.Button(
+                                "Sync",
+                                key=IssueManagementViewEvents.SYNC,
+                                size=(5, 1),
+                                tooltip="Save and pull your issues from Jira",
+                                visible=self.issue_sync_service is not None,
+                            )
+                        ],
                     ],
                 ),
-                sg.Listbox(
-                    issue_service.load_deleted_issues(),
-                    key=IssueManagementViewKeys.DELETED_ISSUES,
-                    size=(30, 40),
-                ),
+                sg.Column(self.deleted_pane.layout()),
             ],
+            [sg.Text(EMPTY, key=IssueManagementViewKeys.SYNC_RESULT, size=(60, 1))],
             [
                 sg.Button("Save and Close", key=IssueManagementViewEvents.SAVE),
                 sg.Cancel(key=IssueManagementViewEvents.CANCEL),
@@ -2,12 +2,21 @@ from datetime import datetime
 
 import PySimpleGUI as sg
 
+from time_tracker.interfaces.calendar import IWorkCalendarProvider
 from time_tracker.interfaces.logging import ILoggingProvider
-from time_tracker.models.menu import MenuViewEvents
-from time_tracker.models.settings import Settings, SettingsViewEvents
-from time_tracker.interfaces.time_entry import ITimeEntryService
-from time_tracker.models.time_entry import TimeEntryEvents
+from time_tracker.interfaces.settings import ISettingsProvider
+from time_tracker.models.menu import MenuViewEvents, MenuViewKeys
+from time_tracker.models.settings import Settings
+from time_tracker.interfaces.event_loop import IEventLoopProvider
+from time_tracker.interfaces.time_entry import (
+    IAsyncTimeEntryService,
+    IMonitoredTimeEntryService,
+    ITimeEntryService,
+)
+from time_tracker.models.time_entry import TimeEntry, TimeEntryEvents
+from time_tracker.services.asynchronous import log_work_everywhere
 from time_tracker.interfaces.views import IView, IViewFactory
+from time_tracker.providers.metrics import METRICS
 
 BUTTON_SIZE: tuple[int, int] = (35, 1)
 
@@ -16,45 +25,79 @@ class MenuView(IView):
     last_time_entry: datetime
 
     @property
-    def next_time_entry(self) -> datetime:
-        return self.last_time_entry + self.settings.time_interval
+    def settings(self) -> Settings:
+        return self.settings_provider.get_settings()
 
     def __init__(
         self,
         log_provider: ILoggingProvider,
         time_entry_services: list[ITimeEntryService],
-        settings: Settings,
+        async_time_entry_services: list[IAsyncTimeEntryService],
+        settings_provider: ISettingsProvider,
+        calendar_provider: IWorkCalendarProvider,
         view_factory: IViewFactory,
+        event_loop: IEventLoopProvider,
     ):
-        self.settings = settings
+        self.async_time_entry_services = async_time_entry_services
+        self.event_loop = event_loop
+        self.settings_provider = settings_provider
+        self.calendar_provider = calendar_provider
         self.log_provider = log_provider
         self.time_entry_services = time_entry_services
-        self.last_time_entry = settings.start_time
+        now = datetime.now()
+        current_interval = calendar_provider.get_calendar().interval_at(now)
+        self.last_time_entry = current_interval.start if current_interval else now
         self.log = log_provider.get_logger(type(self).__name__)
         self.view_factory = view_factory
         self.title = "Time Tracker"
-        self.layout = [
+
+    @property
+    def status_text(self) -> str:
+        statuses = (
+            service.status_text()
+            for service in self.time_entry_services
+            if isinstance(service, IMonitoredTimeEntryService)
+        )
+        return "\n".join(status for status in statuses if status)
+
+    def make_layout(self) -> list[list[sg.Element]]:
+        # a fresh layout per window, so the status line is current each time it reopens
+        return [
             [sg.Button("Record Time Now", key=MenuViewEvents.RECORD, size=BUTTON_SIZE)],
             [sg.Button("Manage Issues", key=MenuViewEvents.MANAGE, size=BUTTON_SIZE)],
             [sg.Button("Settings", key=MenuViewEvents.SETTINGS, size=BUTTON_SIZE)],
             [sg.Button("Close", key=MenuViewEvents.CLOSE, size=BUTTON_SIZE)],
+            [sg.Text(self.status_text, key=MenuViewKeys.STATUS, size=(35, None))],
         ]
 
+    def log_work(self, entries: list[TimeEntry]) -> None:
+        """Logs the entries to every service on the event loop, so slow sinks don't block the menu"""
+
+        async def log_everywhere() -> None:
+            for responses in await log_work_everywhere(
+                self.async_time_entry_services, entries
+            ):
+                for response in responses:
+                    if not response.success:
+                        self.log.warning("Unable to log work: %s", response.message)
+
+        self.event_loop.submit(log_everywhere())
+
     def run(self) -> MenuViewEvents:
         event = None
         while True:
-            window = sg.Window(self.title, self.layout)
-            event, _ = window.read(close=True, timeout=30000)
+            with METRICS.timer("view.window_open", view=type(self).__name__):
+                window = sg.Window(self.title, self.make_layout())
+            with METRICS.timer("view.window_read", view=type(self).__name__):
+                event, _ = window.read(close=True, timeout=30000)
             self.log.info("Event %s received", event)
             if event in (sg.WIN_CLOSED, MenuViewEvents.CLOSE):
                 break
             elif event == MenuViewEvents.MANAGE:
                 event, _ = self.view_factory.make_issue_management_view().run()
             elif event == MenuViewEvents.SETTINGS:
-                settings_event, settings = self.view_factory.make_settings_view().run()
-                if settings_event == SettingsViewEvents.SAVE:
-                    self.settings = settings
-                    sg.theme(settings.theme)
+                # saved settings reach the theme, logging and Jira through the settings provider
+                self.view_factory.make_settings_view().run()
                 break
             if event == MenuViewEvents.RECORD:
                 time_entry_event, entry = self.view_factory.make_time_entry_view().run(
@@ -62,16 +105,23 @@ class MenuView(IView):
                 )
                 if time_entry_event == TimeEntryEvents.SUBMIT:
                     self.last_time_entry = datetime.now()
-                    for time_entry_service in self.time_entry_services:
-                        time_entry_service.log_work(entry)
+                    self.log_work([entry])
 
-            if datetime.now() >= self.next_time_entry:
-                while self.next_time_entry <= datetime.now():
-                    event, entry = self.view_factory.make_time_entry_view().run(
-                        self.last_time_entry, self.next_time_entry
-                    )
-                    self.last_time_entry = self.next_time_entry
-                    if event == TimeEntryEvents.SUBMIT:
-                        for time_entry_service in self.time_entry_services:
-                            time_entry_service.log_work(entry)
+            now = datetime.now()
+            calendar = self.calendar_provider.get_calendar(now.date())
+            slots = calendar.slots_ending_between(self.last_time_entry, now)
+            if len(slots) > 1:
+                # several prompts were missed, e.g. after the machine woke from sleep
+                event, entries = self.view_factory.make_catch_up_view().run(slots)
+                self.last_time_entry = slots[-1].end
+                if event == TimeEntryEvents.SUBMIT and entries:
+                    self.log_work(entries)
+            elif slots:
+                slot = slots[0]
+                event, entry = self.view_factory.make_time_entry_view().run(
+                    slot.start, slot.end
+                )
+                self.last_time_entry = slot.end
+                if event == TimeEntryEvents.SUBMIT:
+                    self.log_work([entry])
         return event
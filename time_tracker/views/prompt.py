@@ -6,6 +6,7 @@ from time_tracker.constants import EMPTY
 from time_tracker.interfaces.logging import ILoggingProvider
 from time_tracker.models.prompts import PromptEvents, PromptKeys
 from time_tracker.interfaces.views import IPromptView, IUserCredentialView
+from time_tracker.providers.metrics import METRICS
 
 
 class PromptView(IPromptView):
@@ -13,8 +14,10 @@ class PromptView(IPromptView):
     title: str
 
     def run(self) -> PromptEvents:
-        window = sg.Window(title=self.title, layout=self.layout, size=self.size)
-        event, _ = window.read(close=True)
+        with METRICS.timer("view.window_open", view=type(self).__name__):
+            window = sg.Window(title=self.title, layout=self.layout, size=self.size)
+        with METRICS.timer("view.window_read", view=type(self).__name__):
+            event, _ = window.read(close=True)
         self.log.info("Event %s received", event)
         if event == sg.WIN_CLOSED:
             event = PromptEvents.CLOSE
@@ -94,9 +97,11 @@ class UserNamePasswordPrompt(IUserCredentialView):
         ]
 
     def run(self) -> tuple[str, str]:
-        window = sg.Window(self.title, self.layout)
+        with METRICS.timer("view.window_open", view=type(self).__name__):
+            window = sg.Window(self.title, self.layout)
         while True:
-            event, values = window.read(close=True)
+            with METRICS.timer("view.window_read", view=type(self).__name__):
+                event, values = window.read(close=True)
             self.log.info("Event %s received", event)
             self.log.debug(
                 "EVENT %s USERNAME: %s",
@@ -3,27 +3,67 @@ from logging import Logger
 from typing import Optional
 
 import PySimpleGUI as sg
-from time_tracker.interfaces.issue import IIssueService
+from time_tracker.interfaces.issue import IIssueMetadataCache, IIssueService
 
 from time_tracker.services.issue import IssueService
-from time_tracker.views.issue import IssueManagementView
 from time_tracker.interfaces.logging import ILoggingProvider
+from time_tracker.models.calendar import WorkInterval
+from time_tracker.models.issue import Issue, IssueChoice
 from time_tracker.models.time_entry import (
+    CatchUpEvents,
+    CatchUpKeys,
     TimeEntry,
     TimeEntryKeys,
     TimeEntryEvents,
 )
-from time_tracker.interfaces.views import ITimeEntryView
+from time_tracker.interfaces.views import ICatchUpView, ITimeEntryView, IViewFactory
+from time_tracker.providers.metrics import METRICS
+
+
+def issue_choices(
+    issues: list[Issue], issue_metadata: Optional[IIssueMetadataCache]
+) -> list[IssueChoice]:
+    """Pairs issues with their cached metadata, read without waiting on the network"""
+    metadata = (
+        issue_metadata.get_many(issue.issue_number for issue in issues)
+        if issue_metadata is not None
+        else {}
+    )
+    return [IssueChoice(issue, metadata.get(issue.issue_number)) for issue in issues]
+
+
+def chosen_issue(value, issues: list[Issue]) -> Issue:
+    """The issue picked in a combo, or the active issue numbered as the text typed into it
+
+    Text that isn't an active issue's number becomes a new issue with no description.
+    """
+    if isinstance(value, IssueChoice):
+        return value.issue
+    if isinstance(value, Issue):
+        return value
+    text = str(value).strip()
+    return next(
+        (issue for issue in issues if issue.issue_number == text),
+        Issue(text, ""),
+    )
 
 
 class TimeEntryView(ITimeEntryView):
     log: Logger
     issue_service: IssueService
 
-    def __init__(self, log_provider: ILoggingProvider, issue_service: IIssueService):
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        issue_service: IIssueService,
+        view_factory: IViewFactory,
+        issue_metadata: Optional[IIssueMetadataCache] = None,
+    ):
         self.log_provider = log_provider
         self.log = log_provider.get_logger("TimeEntryPrompt")
         self.issue_service = issue_service
+        self.view_factory = view_factory
+        self.issue_metadata = issue_metadata
         self.title = "Time Tracking Entry"
         self.layout = [
             [
@@ -56,9 +96,12 @@ class TimeEntryView(ITimeEntryView):
                 f"What have you been working on for "
                 + f"{from_time.hour:02}:{from_time.minute:02} - {to_time.hour:02}:{to_time.minute:02}?"
             )
-            window = sg.Window(self.title, self.layout)
+            with METRICS.timer("view.window_open", view=type(self).__name__):
+                window = sg.Window(self.title, self.layout)
             window[TimeEntryKeys.TEXT].update(text)
-            window[TimeEntryKeys.ENTRY].update(issue_list.issues)
+            window[TimeEntryKeys.ENTRY].update(
+                values=issue_choices(issue_list.issues, self.issue_metadata)
+            )
             return window
 
         time_entry = None
@@ -69,17 +112,126 @@ class TimeEntryView(ITimeEntryView):
             TimeEntryEvents.SUBMIT,
         ]:
             window = _make_window(from_time, to_time)
-            event, values = window.read(close=True)
+            with METRICS.timer("view.window_read", view=type(self).__name__):
+                event, values = window.read(close=True)
             match event:
                 case TimeEntryEvents.SUBMIT:
                     time_entry = TimeEntry(
-                        values[TimeEntryKeys.ENTRY],
+                        chosen_issue(values[TimeEntryKeys.ENTRY], issue_list.issues),
                         from_time,
                         to_time,
                         values[TimeEntryKeys.COMMENT],
                     )
                 case TimeEntryEvents.MANAGE_ISSUES:
-                    IssueManagementView(self.issue_service).run()
+                    self.view_factory.make_issue_management_view().run()
+                    issue_list = self.issue_service.load_active_issues()
                 case [sg.WIN_CLOSED, TimeEntryEvents.SKIP]:
                     event = TimeEntryEvents.SKIP
         return event, time_entry
+
+
+class CatchUpTimeEntryView(ICatchUpView):
+    log: Logger
+    issue_service: IIssueService
+
+    def __init__(
+        self,
+        log_provider: ILoggingProvider,
+        issue_service: IIssueService,
+        issue_metadata: Optional[IIssueMetadataCache] = None,
+    ):
+        self.log = log_provider.get_logger("CatchUpTimeEntryView")
+        self.issue_service = issue_service
+        self.issue_metadata = issue_metadata
+        self.title = "Time Tracking - Catch Up"
+
+    @staticmethod
+    def slot_label(slot: WorkInterval) -> str:
+        return f"{slot.start:%a %m/%d %H:%M} - {slot.end:%H:%M}"
+
+    def make_layout(self, slots: list[WorkInterval], issues: list) -> list:
+        labels = [self.slot_label(slot) for slot in slots]
+        rows = [
+            [
+                sg.Text(label, size=(24, 1)),
+                sg.Combo(issues, key=(CatchUpKeys.ISSUE, index), size=(40, 1)),
+                sg.Input(key=(CatchUpKeys.COMMENT, index), size=(30, 1)),
+            ]
+            for index, label in enumerate(labels)
+        ]
+        return [
+            [
+                sg.Text(
+                    f"{len(slots)} time entries are due, assign issues to them below"
+                )
+            ],
+            [
+                sg.Text("From"),
+                sg.Combo(
+                    labels,
+                    default_value=labels[0],
+                    key=CatchUpKeys.RANGE_FROM,
+                    readonly=True,
+                ),
+                sg.Text("To"),
+                sg.Combo(
+                    labels,
+                    default_value=labels[-1],
+                    key=CatchUpKeys.RANGE_TO,
+                    readonly=True,
+                ),
+                sg.Combo(issues, key=CatchUpKeys.RANGE_ISSUE, size=(30, 1)),
+                sg.Input(key=CatchUpKeys.RANGE_COMMENT, size=(20, 1)),
+                sg.Button("Apply to Range", key=CatchUpEvents.APPLY_RANGE),
+            ],
+            [
+                sg.Column(
+                    rows,
+                    scrollable=len(rows) > 12,
+                    vertical_scroll_only=True,
+                    size=(None, 30 * min(len(rows), 12)),
+                )
+            ],
+            [
+                sg.Submit(key=TimeEntryEvents.SUBMIT),
+                sg.Button("Skip All", key=TimeEntryEvents.SKIP),
+            ],
+        ]
+
+    def run(self, slots: list[WorkInterval]) -> tuple[TimeEntryEvents, list[TimeEntry]]:
+        if not slots:
+            return TimeEntryEvents.SKIP, []
+        active_issues = self.issue_service.load_active_issues().issues
+        issues = issue_choices(active_issues, self.issue_metadata)
+        labels = [self.slot_label(slot) for slot in slots]
+        with METRICS.timer("view.window_open", view=type(self).__name__):
+            window = sg.Window(self.title, self.make_layout(slots, issues))
+        while True:
+            with METRICS.timer("view.window_read", view=type(self).__name__):
+                event, values = window.read()
+            self.log.info("Event %s received", event)
+            if event == CatchUpEvents.APPLY_RANGE:
+                first = labels.index(values[CatchUpKeys.RANGE_FROM])
+                last = labels.index(values[CatchUpKeys.RANGE_TO])
+                for index in range(min(first, last), max(first, last) + 1):
+                    window[(CatchUpKeys.ISSUE, index)].update(
+                        value=values[CatchUpKeys.RANGE_ISSUE]
+                    )
+                    window[(CatchUpKeys.COMMENT, index)].update(
+                        value=values[CatchUpKeys.RANGE_COMMENT]
+                    )
+            elif event == TimeEntryEvents.SUBMIT:
+                window.close()
+                return TimeEntryEvents.SUBMIT, [
+                    TimeEntry(
+                        chosen_issue(values[(CatchUpKeys.ISSUE, index)], active_issues),
+                        slot.start,
+                        slot.end,
+                        values[(CatchUpKeys.COMMENT, index)] or None,
+                    )
+                    for index, slot in enumerate(slots)
+                    if str(values[(CatchUpKeys.ISSUE, index)]).strip()
+                ]
+            else:
+                window.close()
+                return TimeEntryEvents.SKIP, []